@@ -3,6 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Protocol
 
+from scraparse.core.deadline import Deadline
+
 
 @dataclass
 class Message:
@@ -11,5 +13,11 @@ class Message:
 
 
 class LLMClient(Protocol):
-    def complete(self, messages: list[Message], model: str, temperature: float) -> str:
+    def complete(
+        self,
+        messages: list[Message],
+        model: str = ...,
+        temperature: float = 0,
+        deadline: Deadline | None = None,
+    ) -> str:
         ...
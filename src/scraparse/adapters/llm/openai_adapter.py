@@ -4,43 +4,76 @@ import os
 import time
 from typing import Iterable
 
-from openai import OpenAI
-from openai import APIConnectionError, APIError, RateLimitError
-
 from scraparse.adapters.llm.base import LLMClient, Message
+from scraparse.core.deadline import Deadline
 from scraparse.core.errors import AIError, ConfigError
+from scraparse.core.timing import note_llm_attempt
 
 
 DEFAULT_MODEL = "gpt-4o-mini"
+DEFAULT_TIMEOUT_S = 120.0
 
 
 class OpenAIClient(LLMClient):
-    def __init__(self, api_key: str | None = None, retries: int = 2) -> None:
+    def __init__(
+        self,
+        api_key: str | None = None,
+        retries: int = 2,
+        timeout_s: float = DEFAULT_TIMEOUT_S,
+    ) -> None:
         resolved_key = api_key or os.environ.get("OPENAI_API_KEY")
         if not resolved_key:
             raise ConfigError(
                 "OPENAI_API_KEY is not set. Set it in your shell, e.g. 'export OPENAI_API_KEY=...'."
             )
-        self.client = OpenAI(api_key=resolved_key)
+        # The SDK takes a few hundred milliseconds to import; only clients pay for it.
+        from openai import OpenAI
+
+        # Retries are handled below so they can respect the run deadline.
+        self.client = OpenAI(api_key=resolved_key, max_retries=0)
         self.retries = retries
+        self.timeout_s = timeout_s
+
+    def complete(
+        self,
+        messages: list[Message],
+        model: str = DEFAULT_MODEL,
+        temperature: float = 0,
+        deadline: Deadline | None = None,
+    ) -> str:
+        from openai import APIConnectionError, APIError, RateLimitError
 
-    def complete(self, messages: list[Message], model: str = DEFAULT_MODEL, temperature: float = 0) -> str:
+        deadline = deadline or Deadline()
         last_error: Exception | None = None
         for attempt in range(self.retries + 1):
+            deadline.check()
+            attempt_started = time.monotonic()
             try:
                 response = self.client.chat.completions.create(
                     model=model,
                     messages=[{"role": m.role, "content": m.content} for m in messages],
                     temperature=temperature,
+                    timeout=deadline.timeout(self.timeout_s),
+                )
+                usage = response.usage
+                note_llm_attempt(
+                    prompt_tokens=usage.prompt_tokens if usage else None,
+                    completion_tokens=usage.completion_tokens if usage else None,
                 )
                 content = response.choices[0].message.content
                 return content or ""
             except (RateLimitError, APIConnectionError, APIError) as exc:
                 last_error = exc
+                note_llm_attempt(error=f"{type(exc).__name__}: {exc}")
                 if attempt >= self.retries:
                     break
-                time.sleep(0.5 * (2**attempt))
+                backoff = 0.5 * (2**attempt)
+                if not deadline.can_fit(backoff + time.monotonic() - attempt_started):
+                    deadline.check()
+                    break
+                deadline.sleep(backoff)
             except Exception as exc:  # defensive for unexpected SDK errors
                 last_error = exc
+                note_llm_attempt(error=f"{type(exc).__name__}: {exc}")
                 break
         raise AIError(f"OpenAI request failed: {last_error}")
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import csv
+import importlib.util
+import io
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from scraparse.core.extraction_plan import load_plan, validate_plan
+from scraparse.core.models import FieldSchema, FieldSpec
+from scraparse.core.parser_runner import call_parser_main
+from scraparse.core.plan_engine import CompiledPlan
+from scraparse.core.script_validation import check_script
+
+SCHEMA = FieldSchema(
+    fields=[
+        FieldSpec(name="name", type="string", required=True),
+        FieldSpec(name="price", type="money", required=True),
+        FieldSpec(name="url", type="url", required=False),
+    ]
+)
+PLAN = json.dumps(
+    {
+        "version": 1,
+        "row_selector": "div.card",
+        "fields": [
+            {"name": "name", "selector": "h2", "normalizer": "text"},
+            {"name": "price", "selector": ".price", "normalizer": "money"},
+            {"name": "url", "selector": "a", "attribute": "href", "normalizer": "url"},
+        ],
+    }
+)
+# The parser.py a well-behaved generation would produce for the same plan.
+PARSER = '''
+import csv
+import sys
+from bs4 import BeautifulSoup
+
+
+def main():
+    writer = csv.DictWriter(sys.stdout, fieldnames=["name", "price", "url"])
+    writer.writeheader()
+    for path in sys.argv[1:]:
+        with open(path, encoding="utf-8") as handle:
+            soup = BeautifulSoup(handle.read(), "html.parser")
+        for card in soup.select("div.card"):
+            name = card.select_one("h2")
+            price = card.select_one(".price")
+            link = card.select_one("a")
+            writer.writerow({
+                "name": " ".join(name.get_text(" ").split()) if name else "",
+                "price": price.get_text(strip=True).lstrip("$").replace(",", "") if price else "",
+                "url": link.get("href", "") if link else "",
+            })
+
+
+if __name__ == "__main__":
+    main()
+'''
+
+
+def synthetic_page(index: int, rows: int) -> str:
+    cards = "".join(
+        f'<div class="card"><h2>Item {index}-{row}</h2>'
+        f'<span class="price">${row},{index % 1000:03d}.99</span>'
+        f'<a href="/p/{index}/{row}">details</a></div>'
+        for row in range(rows)
+    )
+    # Listing pages carry far more chrome than rows: scripts, navigation, footer links.
+    chrome = "".join(f'<li><a href="/c/{idx}">Category {idx}</a></li>' for idx in range(60))
+    script = "<script>window.__STATE__ = {" + "\"k\": 1, " * 200 + "};</script>"
+    return (
+        f"<html><head><title>Page {index}</title>{script}</head><body>"
+        f"<header><ul>{chrome}</ul></header><main>{cards}</main>"
+        f"<footer><ul>{chrome}</ul></footer></body></html>"
+    )
+
+
+def _elapsed_us(start: float, count: int = 1) -> float:
+    return round((time.perf_counter() - start) * 1_000_000 / count, 2)
+
+
+def measure_extraction(workdir: Path, pages: int = 50, rows_per_page: int = 40) -> dict[str, float]:
+    """Validate and run the same extraction as a plan and as a parser script."""
+    workdir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for index in range(pages):
+        path = workdir / f"{index:04d}.html"
+        path.write_text(synthetic_page(index, rows_per_page), encoding="utf-8")
+        paths.append(path)
+    script_path = workdir / "parser.py"
+    script_path.write_text(PARSER, encoding="utf-8")
+    results: dict[str, float] = {"pages": pages, "rows_per_page": rows_per_page}
+
+    start = time.perf_counter()
+    validate_plan(load_plan(PLAN), SCHEMA)
+    results["plan_validate_us"] = _elapsed_us(start)
+    start = time.perf_counter()
+    check_script(PARSER)
+    results["script_validate_us"] = _elapsed_us(start)
+
+    compiled = CompiledPlan(load_plan(PLAN))
+    compiled.extract(paths[0].read_bytes())  # warm-up
+    start = time.perf_counter()
+    plan_rows = 0
+    for path in paths:
+        plan_rows += len(compiled.extract(path.read_bytes(), base_url="https://bench.example/"))
+    plan_s = time.perf_counter() - start
+
+    # Import once, as ``scraparse extract`` does, so only the per-page cost is compared.
+    spec = importlib.util.spec_from_file_location("scraparse_bench_parser", script_path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    call_parser_main(module.main, str(script_path), str(paths[0]))  # warm-up
+    start = time.perf_counter()
+    script_rows = 0
+    for path in paths:
+        text = call_parser_main(module.main, str(script_path), str(path))
+        script_rows += len(list(csv.DictReader(io.StringIO(text))))
+    script_s = time.perf_counter() - start
+
+    results["plan_rows"] = plan_rows
+    results["script_rows"] = script_rows
+    results["plan_rows_per_s"] = round(plan_rows / max(plan_s, 1e-9), 1)
+    results["script_rows_per_s"] = round(script_rows / max(script_s, 1e-9), 1)
+    results["plan_features"] = compiled.features  # type: ignore[assignment]
+    return results
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        print(json.dumps(measure_extraction(Path(tmp)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
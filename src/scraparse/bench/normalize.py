@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterator
+import argparse
+import json
+import random
+import tempfile
+import time
+
+from scraparse.core.columnar import (
+    ColumnNormalizer,
+    ColumnWriter,
+    JsonColumnWriter,
+    ParquetColumnWriter,
+    parquet_available,
+)
+from scraparse.core.models import FieldSchema, FieldSpec
+from scraparse.core.normalizers import (
+    normalize_boolean,
+    normalize_date,
+    normalize_number,
+    normalize_text,
+    normalize_url,
+    parse_money,
+)
+
+SCHEMA = FieldSchema(
+    fields=[
+        FieldSpec(name="title", type="string", required=True),
+        FieldSpec(name="price", type="money", required=True),
+        FieldSpec(name="rating", type="number", required=False),
+        FieldSpec(name="published", type="date", required=False),
+        FieldSpec(name="link", type="url", required=False),
+        FieldSpec(name="in_stock", type="boolean", required=False),
+    ]
+)
+BATCH_ROWS = 65_536
+# The per-row baseline is slow; it runs on at most this many rows.
+BASELINE_ROWS = 100_000
+
+
+def synthetic_rows(count: int, seed: int = 7) -> Iterator[list[dict[str, str]]]:
+    """Messy scraped values in batches, repeating the way real listings do."""
+    rng = random.Random(seed)
+    prices = [f"${rng.randint(1, 999)},{rng.randint(0, 999):03d}.{rng.randint(0, 99):02d}"
+              for _ in range(500)]
+    prices += [f"{rng.randint(1, 999)},{rng.randint(0, 99):02d} EUR" for _ in range(500)]
+    dates = [f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/20{rng.randint(10, 24)}"
+             for _ in range(2_000)]
+    titles = [f"  Product   {idx}\n" for idx in range(5_000)]
+    stock = ["In stock", "Sold out", "yes", "no", ""]
+    batch: list[dict[str, str]] = []
+    for idx in range(count):
+        batch.append(
+            {
+                "_source": f"https://shop.example/list?page={idx // 40}",
+                "title": titles[idx % len(titles)],
+                "price": rng.choice(prices),
+                "rating": f"{rng.randint(1, 5)}.{rng.randint(0, 9)} / 5",
+                "published": rng.choice(dates),
+                "link": f"/p/{idx % 20_000}",
+                "in_stock": rng.choice(stock),
+            }
+        )
+        if len(batch) == BATCH_ROWS:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def per_row_baseline(rows: list[dict[str, str]]) -> None:
+    """What generated parsers do today: every value parsed on its own, every format tried."""
+    for row in rows:
+        base = row["_source"]
+        normalize_text(row["title"])
+        amount, _ = parse_money(row["price"])
+        float(amount) if amount else None
+        number = normalize_number(row["rating"])
+        float(number) if number else None
+        normalize_date(row["published"])
+        normalize_url(row["link"], base)
+        normalize_boolean(row["in_stock"])
+
+
+def measure_normalize(workdir: Path, rows: int = 1_000_000) -> dict[str, object]:
+    results: dict[str, object] = {"rows": rows}
+
+    baseline_rows = min(rows, BASELINE_ROWS)
+    baseline_s = 0.0
+    for batch in synthetic_rows(baseline_rows):
+        start = time.perf_counter()
+        per_row_baseline(batch)
+        baseline_s += time.perf_counter() - start
+    per_row_rate = round(baseline_rows / max(baseline_s, 1e-9), 1)
+    results["per_row_rows_per_s"] = per_row_rate
+
+    normalizer = ColumnNormalizer(SCHEMA, source_key="_source")
+    json_path = workdir / "rows.columns.jsonl"
+    writers: list[ColumnWriter] = [JsonColumnWriter(json_path, normalizer.types)]
+    if parquet_available():
+        writers.append(ParquetColumnWriter(workdir / "rows.parquet", normalizer.types))
+    normalize_s = 0.0
+    write_s = {type(writer).__name__: 0.0 for writer in writers}
+    invalid = 0
+    for batch in synthetic_rows(rows):
+        start = time.perf_counter()
+        typed = normalizer.normalize(batch)
+        normalize_s += time.perf_counter() - start
+        invalid += sum(typed.invalid.values())
+        for writer in writers:
+            start = time.perf_counter()
+            writer.write(typed)
+            write_s[type(writer).__name__] += time.perf_counter() - start
+    for writer in writers:
+        writer.close()
+
+    columnar_rate = round(rows / max(normalize_s, 1e-9), 1)
+    results["columnar_rows_per_s"] = columnar_rate
+    results["speedup"] = round(columnar_rate / max(per_row_rate, 1e-9), 2)
+    results["write_s"] = {name: round(seconds, 3) for name, seconds in write_s.items()}
+    results["columns_json_bytes"] = json_path.stat().st_size
+    results["invalid_values"] = invalid
+    results["date_formats"] = normalizer.date_formats
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark typed column normalization")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        print(json.dumps(measure_normalize(Path(tmp), rows=args.rows), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+import json
+import math
+import multiprocessing
+import platform
+import statistics
+
+from scraparse.bench.sites import SITE_KINDS, SiteConfig
+from scraparse.bench.throughput import Scenario, run_scenario
+from scraparse.core.util import now_utc_iso
+
+GATE_VERSION = 1
+# Two-sided 95% Student t critical values by degrees of freedom (1..30).
+T_95 = (
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+)
+THROUGHPUT = "pages_per_s"
+MEMORY = "peak_rss_kb"
+
+
+@dataclass(frozen=True)
+class Thresholds:
+    # Fractional drop in mean throughput that fails the gate (0.10 = 10% slower).
+    max_throughput_drop: float = 0.10
+    # Fractional growth in peak RSS that fails the gate.
+    max_memory_growth: float = 0.20
+    # Peak RSS growth below this is noise whatever the percentage.
+    min_memory_growth_kb: int = 4_096
+
+
+@dataclass
+class Stats:
+    samples: list[float]
+    mean: float
+    stdev: float
+    ci_low: float
+    ci_high: float
+
+    @classmethod
+    def of(cls, samples: list[float]) -> Stats:
+        mean = statistics.fmean(samples)
+        if len(samples) < 2:
+            return cls(samples, mean, 0.0, mean, mean)
+        stdev = statistics.stdev(samples)
+        half = t_critical(len(samples) - 1) * stdev / math.sqrt(len(samples))
+        return cls(samples, mean, stdev, mean - half, mean + half)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, object]) -> Stats:
+        return cls(**data)  # type: ignore[arg-type]
+
+    def to_dict(self) -> dict[str, object]:
+        return {key: _round(value) for key, value in asdict(self).items()}
+
+
+@dataclass
+class Comparison:
+    benchmark: str
+    metric: str
+    baseline: float | None
+    current: float | None
+    change: float | None
+    # ok, improved, noisy, regressed, new or missing
+    status: str
+
+    @property
+    def failed(self) -> bool:
+        return self.status == "regressed"
+
+    def to_dict(self) -> dict[str, object]:
+        return asdict(self)
+
+
+def t_critical(df: int) -> float:
+    return T_95[df - 1] if df <= len(T_95) else 1.96
+
+
+def _round(value: object) -> object:
+    if isinstance(value, float):
+        return round(value, 3)
+    if isinstance(value, list):
+        return [_round(item) for item in value]
+    return value
+
+
+def gate_scenarios(pages: int = 100, page_bytes: int = 20_000) -> list[Scenario]:
+    """The microbenchmarks the gate compares: one per discovery strategy, plus fetch,
+    link extraction and the whole orchestrator."""
+
+    def site(kind: str) -> SiteConfig:
+        return SiteConfig(kind=kind, pages=pages, page_bytes=page_bytes)
+
+    scenarios = [Scenario(f"discovery/{kind}", site(kind)) for kind in SITE_KINDS]
+    scenarios.append(Scenario("fetch/listing", site("listing"), mode="fetch"))
+    scenarios.append(Scenario("links/crawl", site("crawl"), mode="links"))
+    scenarios.append(Scenario("orchestrator/listing", site("listing"), mode="orchestrator"))
+    return scenarios
+
+
+def measure_benchmark(scenario: Scenario, warmup: int, repetitions: int) -> dict[str, object]:
+    """Throughput of each repetition after ``warmup`` discarded runs, and the peak RSS."""
+    for _ in range(warmup):
+        run_scenario(scenario)
+    throughput: list[float] = []
+    peak_rss_kb = 0
+    for _ in range(repetitions):
+        measurement = run_scenario(scenario)
+        throughput.append(measurement.pages / max(measurement.wall_s, 1e-9))
+        peak_rss_kb = max(peak_rss_kb, measurement.peak_rss_kb)
+    return {THROUGHPUT: Stats.of(throughput).to_dict(), MEMORY: peak_rss_kb}
+
+
+def run_benchmarks(
+    scenarios: list[Scenario], warmup: int = 1, repetitions: int = 5, isolate: bool = True
+) -> dict[str, object]:
+    if repetitions < 1:
+        raise ValueError("repetitions must be at least 1")
+    benchmarks: dict[str, object] = {}
+    if isolate:
+        # Each benchmark gets a fresh interpreter so peak RSS is its own.
+        ctx = multiprocessing.get_context("spawn")
+        for scenario in scenarios:
+            with ctx.Pool(1) as pool:
+                benchmarks[scenario.name] = pool.apply(
+                    measure_benchmark, (scenario, warmup, repetitions)
+                )
+    else:
+        for scenario in scenarios:
+            benchmarks[scenario.name] = measure_benchmark(scenario, warmup, repetitions)
+    first = scenarios[0].site if scenarios else SiteConfig(kind="listing")
+    return {
+        "suite": "regression",
+        "version": GATE_VERSION,
+        "created_at": now_utc_iso(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "isolated": isolate,
+        "config": {
+            "pages": first.pages,
+            "page_bytes": first.page_bytes,
+            "warmup": warmup,
+            "repetitions": repetitions,
+        },
+        "benchmarks": benchmarks,
+    }
+
+
+def load_baseline(path: Path) -> dict[str, object]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(data, dict) or data.get("suite") != "regression":
+        raise ValueError(f"{path} is not a scraparse bench result")
+    for section in ("config", "benchmarks"):
+        if not isinstance(data.get(section), dict):
+            raise ValueError(f"{path} has no {section!r} mapping")
+    return {str(key): value for key, value in data.items()}
+
+
+def result_config(result: dict[str, object]) -> dict[str, int]:
+    """The integer sizing knobs (pages, page_bytes, ...) a result was measured with."""
+    config = result.get("config")
+    if not isinstance(config, dict):
+        return {}
+    return {str(key): value for key, value in config.items() if isinstance(value, int)}
+
+
+def compare(
+    baseline: dict[str, object], current: dict[str, object], thresholds: Thresholds
+) -> list[Comparison]:
+    """Compare every benchmark's throughput and peak RSS against the baseline.
+
+    Throughput regresses only when the mean dropped past the threshold *and*
+    the 95% confidence intervals do not overlap; a drop inside the noise is
+    reported as ``noisy`` instead of failing the gate.
+    """
+    before: dict[str, dict[str, object]] = baseline["benchmarks"]  # type: ignore[assignment]
+    after: dict[str, dict[str, object]] = current["benchmarks"]  # type: ignore[assignment]
+    rows: list[Comparison] = []
+    for name in list(after) + [name for name in before if name not in after]:
+        if name not in before or name not in after:
+            status = "new" if name not in before else "missing"
+            source = after.get(name) or before[name]
+            value = Stats.from_dict(source[THROUGHPUT]).mean  # type: ignore[arg-type]
+            old, new = (None, value) if status == "new" else (value, None)
+            rows.append(Comparison(name, THROUGHPUT, old, new, None, status))
+            continue
+        rows.append(_compare_throughput(name, before[name], after[name], thresholds))
+        rows.append(_compare_memory(name, before[name], after[name], thresholds))
+    return rows
+
+
+def _compare_throughput(
+    name: str, before: dict[str, object], after: dict[str, object], thresholds: Thresholds
+) -> Comparison:
+    old = Stats.from_dict(before[THROUGHPUT])  # type: ignore[arg-type]
+    new = Stats.from_dict(after[THROUGHPUT])  # type: ignore[arg-type]
+    change = (new.mean - old.mean) / old.mean if old.mean else 0.0
+    separated = new.ci_high < old.ci_low or new.ci_low > old.ci_high
+    status = "ok"
+    if abs(change) > thresholds.max_throughput_drop:
+        if not separated:
+            status = "noisy"
+        else:
+            status = "regressed" if change < 0 else "improved"
+    return Comparison(name, THROUGHPUT, old.mean, new.mean, round(change, 4), status)
+
+
+def _compare_memory(
+    name: str, before: dict[str, object], after: dict[str, object], thresholds: Thresholds
+) -> Comparison:
+    old, new = int(before[MEMORY]), int(after[MEMORY])  # type: ignore[call-overload]
+    change = (new - old) / old if old else 0.0
+    status = "ok"
+    if new - old > thresholds.min_memory_growth_kb and change > thresholds.max_memory_growth:
+        status = "regressed"
+    elif old - new > thresholds.min_memory_growth_kb and -change > thresholds.max_memory_growth:
+        status = "improved"
+    return Comparison(name, MEMORY, old, new, round(change, 4), status)
+
+
+def render_table(rows: list[Comparison]) -> str:
+    lines = [
+        "| benchmark | metric | baseline | current | change | status |",
+        "| --- | --- | ---: | ---: | ---: | --- |",
+    ]
+    for row in rows:
+        change = "" if row.change is None else f"{row.change:+.1%}"
+        lines.append(
+            f"| {row.benchmark} | {row.metric} | {_cell(row.baseline)} | {_cell(row.current)} "
+            f"| {change} | {row.status} |"
+        )
+    return "\n".join(lines)
+
+
+def _cell(value: float | None) -> str:
+    return "" if value is None else f"{value:,.1f}"
+
+
+def summary_rows(current: dict[str, object]) -> list[Comparison]:
+    """Rows for a run without a baseline, so the table has the same shape."""
+    rows: list[Comparison] = []
+    for name, result in current["benchmarks"].items():  # type: ignore[attr-defined]
+        throughput = Stats.from_dict(result[THROUGHPUT])
+        rows.append(Comparison(name, THROUGHPUT, None, throughput.mean, None, "new"))
+        rows.append(Comparison(name, MEMORY, None, float(result[MEMORY]), None, "new"))
+    return rows
+
+
+def save_report(
+    directory: Path,
+    current: dict[str, object],
+    rows: list[Comparison],
+    baseline_path: Path | None = None,
+    thresholds: Thresholds | None = None,
+) -> Path:
+    """Write results.json, comparison.json and comparison.md into a timestamped folder."""
+    stamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    target = directory / stamp
+    suffix = 2
+    while target.exists():
+        target = directory / f"{stamp}_{suffix}"
+        suffix += 1
+    target.mkdir(parents=True)
+    (target / "results.json").write_text(json.dumps(current, indent=2) + "\n", encoding="utf-8")
+    comparison = {
+        "baseline": str(baseline_path) if baseline_path else None,
+        "thresholds": asdict(thresholds) if thresholds else None,
+        "failed": any(row.failed for row in rows),
+        "rows": [row.to_dict() for row in rows],
+    }
+    (target / "comparison.json").write_text(
+        json.dumps(comparison, indent=2) + "\n", encoding="utf-8"
+    )
+    (target / "comparison.md").write_text(render_table(rows) + "\n", encoding="utf-8")
+    return target
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+import random
+import time
+
+import httpx
+
+SITE_KINDS = ("pagination", "listing", "crawl")
+_WORDS = (
+    "alpha beta gamma delta widget gadget sprocket module fixture bracket "
+    "copper steel walnut linen ceramic compact deluxe classic modern premium"
+).split()
+
+
+@dataclass(frozen=True)
+class SiteConfig:
+    kind: str
+    pages: int = 200
+    # Children per node of the crawl graph.
+    fan_out: int = 4
+    page_bytes: int = 20_000
+    latency_s: float = 0.0
+    seed: int = 0
+    host: str = "bench.scraparse.test"
+
+    def to_dict(self) -> dict[str, object]:
+        return asdict(self)
+
+
+class SyntheticSite:
+    """A deterministic in-memory site served through ``httpx.MockTransport``.
+
+    - ``pagination``: a chain ``/page/1 .. /page/N`` linked by ``rel=next``.
+    - ``listing``: ``/catalog`` linking to ``N - 1`` detail pages under it.
+    - ``crawl``: a tree of ``N`` nodes with ``fan_out`` children each, plus
+      links back to the parent and the root so visited-set checks get work.
+
+    Every page is rendered up front and padded to ``page_bytes``, so
+    serving a request is a dict lookup and the measured cost stays with
+    scraparse. The same config always yields byte-identical pages.
+    """
+
+    def __init__(self, config: SiteConfig) -> None:
+        if config.kind not in SITE_KINDS:
+            raise ValueError(f"Unknown site kind: {config.kind}")
+        self.config = config
+        self.pages: dict[str, bytes] = {}
+        getattr(self, f"_build_{config.kind}")()
+
+    @property
+    def start_url(self) -> str:
+        first = {"pagination": "/page/1", "listing": "/catalog", "crawl": "/node/0"}
+        return f"https://{self.config.host}{first[self.config.kind]}"
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(len(body) for body in self.pages.values())
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        if self.config.latency_s:
+            time.sleep(self.config.latency_s)
+        body = self.pages.get(request.url.path)
+        if body is None:
+            return httpx.Response(404, headers={"content-type": "text/html"}, content=b"")
+        return httpx.Response(200, headers={"content-type": "text/html"}, content=body)
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handler)
+
+    def _build_pagination(self) -> None:
+        count = self.config.pages
+        for index in range(1, count + 1):
+            nav = f'<a rel="next" href="/page/{index + 1}">Next</a>' if index < count else ""
+            self._add(f"/page/{index}", index, self._cards(index, 20) + nav)
+
+    def _build_listing(self) -> None:
+        details = max(0, self.config.pages - 1)
+        links = "".join(
+            f'<li><a class="item-link" href="/catalog/item-{idx}">Item {idx}</a></li>'
+            for idx in range(details)
+        )
+        self._add("/catalog", 0, f"<ul>{links}</ul>")
+        for idx in range(details):
+            self._add(f"/catalog/item-{idx}", idx + 1, self._cards(idx + 1, 1))
+
+    def _build_crawl(self) -> None:
+        count, fan_out = self.config.pages, max(1, self.config.fan_out)
+        for node in range(count):
+            children = range(node * fan_out + 1, min(count, node * fan_out + fan_out + 1))
+            links = "".join(f'<a href="/node/{child}">Node {child}</a>' for child in children)
+            if node:
+                links += f'<a href="/node/{(node - 1) // fan_out}">Up</a><a href="/node/0">Home</a>'
+            self._add(f"/node/{node}", node, self._cards(node, 5) + links)
+
+    def _cards(self, index: int, count: int) -> str:
+        rng = random.Random(self.config.seed * 1_000_003 + index)
+        return "".join(
+            f'<div class="card"><h2>{" ".join(rng.choices(_WORDS, k=3)).title()}</h2>'
+            f'<span class="price">${rng.randint(1, 999)}.{rng.randint(0, 99):02d}</span></div>'
+            for _ in range(count)
+        )
+
+    def _add(self, path: str, index: int, body: str) -> None:
+        rng = random.Random(self.config.seed * 7_919 + index)
+        head = f"<html><head><title>Page {index}</title></head><body>{body}"
+        tail = "</body></html>"
+        filler: list[str] = []
+        size = len(head) + len(tail)
+        while size < self.config.page_bytes:
+            paragraph = f"<p>{' '.join(rng.choices(_WORDS, k=40))}</p>"
+            filler.append(paragraph)
+            size += len(paragraph)
+        self.pages[path] = (head + "".join(filler) + tail).encode("utf-8")
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+import scraparse
+from scraparse.core.paths import templates_dir
+from scraparse.plugins.ai.prompt_renderer import PromptPack, PromptRenderer, clear_template_caches
+
+SYSTEM_TEMPLATE = "script_generator_system_prompt.jinja"
+USER_TEMPLATE = "script_generator_user_prompt.jinja"
+USER_CONTEXT: dict[str, object] = {
+    "schema_json": '{"fields": []}',
+    "html_samples": ["<html><body><p>sample</p></body></html>"] * 3,
+    "validation_errors": [],
+}
+
+# Packages no command below should load: they cost tens to hundreds of
+# milliseconds and only matter once a run actually fetches, renders or calls the LLM.
+HEAVY_MODULES = ("openai", "httpx", "httpcore", "jinja2", "bs4", "soupsieve", "lxml", "pyarrow")
+# argv and the budget for scraparse's own imports (beyond the bare interpreter's), in ms.
+STARTUP_BUDGETS: dict[str, tuple[list[str], float]] = {
+    "help": (["--help"], 75.0),
+    "wipe": (["wipe"], 75.0),
+    "runs": (["runs", "query"], 75.0),
+    "extract": (["extract", "missing-parser.py"], 150.0),
+    "bench": (["bench", "--help"], 75.0),
+    # A run without OPENAI_API_KEY should fail before loading the pipeline.
+    "run-without-key": (["--url", "https://example.com"], 75.0),
+}
+
+
+def _elapsed_us(start: float, count: int = 1) -> float:
+    return round((time.perf_counter() - start) * 1_000_000 / count, 2)
+
+
+def measure_prompt_renderer(bytecode_cache_dir: Path, renders: int = 200) -> dict[str, float]:
+    pack = PromptPack("default")
+    results: dict[str, float] = {}
+
+    clear_template_caches()
+    start = time.perf_counter()
+    renderer = PromptRenderer(templates_dir(), pack, bytecode_cache_dir=bytecode_cache_dir)
+    renderer.render_static(SYSTEM_TEMPLATE)
+    renderer.render(USER_TEMPLATE, USER_CONTEXT)
+    results["cold_compile_us"] = _elapsed_us(start)
+
+    clear_template_caches()
+    start = time.perf_counter()
+    renderer = PromptRenderer(templates_dir(), pack, bytecode_cache_dir=bytecode_cache_dir)
+    renderer.render_static(SYSTEM_TEMPLATE)
+    renderer.render(USER_TEMPLATE, USER_CONTEXT)
+    results["cold_bytecode_us"] = _elapsed_us(start)
+
+    start = time.perf_counter()
+    for _ in range(renders):
+        renderer.render_static(SYSTEM_TEMPLATE)
+    results["static_render_us"] = _elapsed_us(start, renders)
+
+    start = time.perf_counter()
+    for _ in range(renders):
+        renderer.render(USER_TEMPLATE, USER_CONTEXT)
+    results["user_render_us"] = _elapsed_us(start, renders)
+
+    # Previous behaviour: a fresh environment and template lookup per render.
+    pack_dir = templates_dir() / "promptpacks" / pack.name
+    start = time.perf_counter()
+    for _ in range(renders):
+        env = Environment(loader=FileSystemLoader(str(pack_dir)), autoescape=select_autoescape())
+        env.get_template(SYSTEM_TEMPLATE).render()
+    results["uncached_render_us"] = _elapsed_us(start, renders)
+    return results
+
+
+def _import_times(args: list[str], cwd: Path) -> tuple[dict[str, int], float]:
+    """Self time in microseconds per imported module, and the process wall time in ms."""
+    env = {key: value for key, value in os.environ.items() if key != "OPENAI_API_KEY"}
+    source_root = str(Path(scraparse.__file__).resolve().parent.parent)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [source_root, env.get("PYTHONPATH")]))
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=cwd,
+        env=env,
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    modules: dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, _, name = line[len("import time:") :].split("|")
+        modules[name.strip()] = modules.get(name.strip(), 0) + int(self_us)
+    return modules, wall_ms
+
+
+def measure_cli_startup(workdir: Path, repeats: int = 3) -> dict[str, dict[str, object]]:
+    """Import cost of each CLI command measured with ``python -X importtime``.
+
+    ``import_ms`` counts only modules the bare interpreter does not import,
+    so it is what scraparse itself adds; the best of ``repeats`` runs is kept.
+    """
+    bare = min(
+        (_import_times(["-c", "pass"], workdir) for _ in range(repeats)),
+        key=lambda measured: measured[1],
+    )[0]
+    results: dict[str, dict[str, object]] = {}
+    for command, (argv, budget_ms) in STARTUP_BUDGETS.items():
+        best: dict[str, object] | None = None
+        for _ in range(repeats):
+            modules, wall_ms = _import_times(["-m", "scraparse.cli.main", *argv], workdir)
+            added = {name: us for name, us in modules.items() if name not in bare}
+            import_ms = round(sum(added.values()) / 1000, 2)
+            if best is None or import_ms < float(best["import_ms"]):  # type: ignore[arg-type]
+                heavy = sorted({name.split(".")[0] for name in added} & set(HEAVY_MODULES))
+                best = {
+                    "import_ms": import_ms,
+                    "wall_ms": round(wall_ms, 2),
+                    "modules": len(added),
+                    "heavy": heavy,
+                    "budget_ms": budget_ms,
+                }
+        assert best is not None
+        results[command] = best
+    return results
+
+
+def budget_problems(results: dict[str, dict[str, object]]) -> list[str]:
+    problems: list[str] = []
+    for command, result in results.items():
+        heavy: list[str] = result["heavy"]  # type: ignore[assignment]
+        if heavy:
+            problems.append(f"{command}: imports {', '.join(heavy)}")
+        if float(result["import_ms"]) > float(result["budget_ms"]):  # type: ignore[arg-type]
+            problems.append(
+                f"{command}: imports take {result['import_ms']} ms "
+                f"(budget {result['budget_ms']} ms)"
+            )
+    return problems
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        report: dict[str, object] = {
+            "prompt_renderer": measure_prompt_renderer(Path(tmp) / "jinja"),
+            "cli": measure_cli_startup(Path(tmp)),
+        }
+    report["budget_problems"] = budget_problems(report["cli"])  # type: ignore[arg-type]
+    print(json.dumps(report, indent=2))
+    if report["budget_problems"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+import argparse
+import json
+import multiprocessing
+import platform
+import sys
+import tempfile
+import time
+
+try:  # POSIX only; peak RSS is reported as 0 elsewhere
+    import resource
+except ImportError:  # pragma: no cover - exercised on Windows only
+    resource = None  # type: ignore[assignment]
+
+import httpx
+from bs4 import BeautifulSoup
+
+from scraparse.adapters.llm.base import LLMClient, Message
+from scraparse.bench.sites import SITE_KINDS, SiteConfig, SyntheticSite
+from scraparse.core.deadline import Deadline
+from scraparse.core.limits import Limits, LimitTracker
+from scraparse.core.models import FetchResult
+from scraparse.core.page_store import PageStore
+from scraparse.plugins.discovery.base import DiscoveryPlugin
+from scraparse.plugins.discovery.crawl import CrawlDiscovery
+from scraparse.plugins.discovery.listing import ListingDiscovery
+from scraparse.plugins.discovery.pagination import PaginationDiscovery
+from scraparse.plugins.fetchers.base import Fetcher
+from scraparse.plugins.fetchers.httpx_fetcher import HttpxFetcher
+from scraparse.plugins.fetchers.storing import StoringFetcher
+
+SUITE_VERSION = 1
+DISCOVERY: dict[str, Callable[[], DiscoveryPlugin]] = {
+    "pagination": PaginationDiscovery,
+    "listing": ListingDiscovery,
+    "crawl": CrawlDiscovery,
+}
+# RAM kept by the page_store fetcher before spilling; small so the spill path is measured.
+PAGE_STORE_RAM_BYTES = 1_000_000
+FETCHERS = ("httpx", "httpx+page_store")
+# discovery: the strategy walks the site; fetch: every page is fetched by URL;
+# links: link extraction over pages already in memory; orchestrator: the whole pipeline.
+MODES = ("discovery", "fetch", "links", "orchestrator")
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    site: SiteConfig
+    fetcher: str = "httpx"
+    mode: str = "discovery"
+
+
+@dataclass
+class Measurement:
+    scenario: str
+    strategy: str
+    fetcher: str
+    pages: int = 0
+    bytes: int = 0
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    peak_rss_kb: int = 0
+    start_rss_kb: int = 0
+    extra: dict[str, object] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, object]:
+        wall = max(self.wall_s, 1e-9)
+        return {
+            "scenario": self.scenario,
+            "strategy": self.strategy,
+            "fetcher": self.fetcher,
+            "pages": self.pages,
+            "bytes": self.bytes,
+            "wall_s": round(self.wall_s, 4),
+            "cpu_s": round(self.cpu_s, 4),
+            "pages_per_s": round(self.pages / wall, 2),
+            "bytes_per_s": round(self.bytes / wall, 1),
+            "peak_rss_kb": self.peak_rss_kb,
+            "rss_growth_kb": max(0, self.peak_rss_kb - self.start_rss_kb),
+            **self.extra,
+        }
+
+
+def bench_limits(site: SiteConfig) -> Limits:
+    # Politeness delays and retries would measure sleep, not scraparse.
+    return Limits(
+        max_pages=site.pages,
+        max_depth=64,
+        rate_limit_rps=0,
+        retries=0,
+        jitter_s=0,
+        max_total_bytes=site.pages * site.page_bytes * 2 + 1_000_000,
+        max_runtime_s=3_600,
+    )
+
+
+def default_scenarios(
+    pages: int = 200, page_bytes: int = 20_000, latency_s: float = 0.0, fan_out: int = 4
+) -> list[Scenario]:
+    scenarios: list[Scenario] = []
+    for kind in SITE_KINDS:
+        site = SiteConfig(
+            kind=kind, pages=pages, page_bytes=page_bytes, latency_s=latency_s, fan_out=fan_out
+        )
+        for fetcher in FETCHERS:
+            scenarios.append(Scenario(f"discovery/{kind}/{fetcher}", site, fetcher))
+        scenarios.append(Scenario(f"orchestrator/{kind}", site, mode="orchestrator"))
+    return scenarios
+
+
+class _CountingFetcher:
+    def __init__(self, inner: Fetcher) -> None:
+        self.inner = inner
+        self.pages = 0
+        self.bytes = 0
+
+    def fetch(self, url: str, tracker: LimitTracker) -> FetchResult:
+        result = self.inner.fetch(url, tracker)
+        self.pages += 1
+        self.bytes += result.size
+        return result
+
+
+class BenchLLM(LLMClient):
+    """Answers instantly with a one-field schema and a parser that reads every card title."""
+
+    SCHEMA = json.dumps(
+        {"fields": [{"name": "title", "type": "string", "required": True}]}
+    )
+    PARSER = '''
+import csv
+import sys
+from bs4 import BeautifulSoup
+
+
+def main():
+    writer = csv.DictWriter(sys.stdout, fieldnames=["title"])
+    writer.writeheader()
+    for path in sys.argv[1:]:
+        with open(path, encoding="utf-8") as handle:
+            soup = BeautifulSoup(handle.read(), "html.parser")
+        for title in soup.select("div.card h2"):
+            writer.writerow({"title": title.get_text(strip=True)})
+
+
+if __name__ == "__main__":
+    main()
+'''
+
+    def complete(
+        self,
+        messages: list[Message],
+        model: str = "bench-model",
+        temperature: float = 0,
+        deadline: Deadline | None = None,
+    ) -> str:
+        return self.PARSER if "FieldSchema JSON" in messages[-1].content else self.SCHEMA
+
+
+def _rss_kb() -> int:
+    if resource is None:
+        return 0
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _fetcher(
+    kind: str, limits: Limits, transport: httpx.BaseTransport, stack: ExitStack
+) -> Fetcher:
+    fetcher: Fetcher = stack.enter_context(HttpxFetcher(limits, transport=transport))
+    if kind == "httpx+page_store":
+        store = stack.enter_context(PageStore(PAGE_STORE_RAM_BYTES))
+        fetcher = StoringFetcher(fetcher, store)
+    elif kind != "httpx":
+        raise ValueError(f"Unknown fetcher: {kind}")
+    return fetcher
+
+
+def run_scenario(scenario: Scenario) -> Measurement:
+    if scenario.mode not in MODES:
+        raise ValueError(f"Unknown scenario mode: {scenario.mode}")
+    site = SyntheticSite(scenario.site)
+    limits = bench_limits(scenario.site)
+    measurement = Measurement(
+        scenario=scenario.name,
+        strategy=scenario.site.kind,
+        fetcher=scenario.fetcher,
+        start_rss_kb=_rss_kb(),
+    )
+    with ExitStack() as stack:
+        counting = _CountingFetcher(_fetcher(scenario.fetcher, limits, site.transport(), stack))
+        wall, cpu = time.perf_counter(), time.process_time()
+        if scenario.mode == "links":
+            _extract_links(site, counting, measurement)
+        elif scenario.mode == "fetch":
+            tracker = LimitTracker(limits)
+            for path in site.pages:
+                counting.fetch(f"https://{scenario.site.host}{path}", tracker)
+        elif scenario.mode == "orchestrator":
+            _run_orchestrator(scenario, site, limits, counting, stack, measurement)
+        else:
+            DISCOVERY[scenario.site.kind]().discover(
+                site.start_url, counting, LimitTracker(limits), limits
+            )
+        measurement.wall_s = time.perf_counter() - wall
+        measurement.cpu_s = time.process_time() - cpu
+    measurement.pages = counting.pages
+    measurement.bytes = counting.bytes
+    measurement.peak_rss_kb = _rss_kb()
+    return measurement
+
+
+def _extract_links(
+    site: SyntheticSite, counting: _CountingFetcher, measurement: Measurement
+) -> None:
+    # Pages come straight from memory so only parsing and URL handling are timed.
+    crawl = CrawlDiscovery()
+    links = 0
+    for path, body in site.pages.items():
+        soup = BeautifulSoup(body.decode("utf-8"), "html.parser")
+        links += len(crawl.extract_links(soup, f"https://{site.config.host}{path}"))
+        counting.pages += 1
+        counting.bytes += len(body)
+    measurement.extra["links"] = links
+
+
+def _run_orchestrator(
+    scenario: Scenario,
+    site: SyntheticSite,
+    limits: Limits,
+    fetcher: Fetcher,
+    stack: ExitStack,
+    measurement: Measurement,
+) -> None:
+    # Imported here so discovery-only runs do not pay for the pipeline's imports.
+    from scraparse.cli.schema_editor import AutoApproveSchemaEditor
+    from scraparse.core.models import RunSpec
+    from scraparse.core.paths import templates_dir
+    from scraparse.core.workspace import WorkspaceManager
+    from scraparse.engine.orchestrator import Orchestrator, OrchestratorDeps
+    from scraparse.plugins.ai.prompt_renderer import PromptPack, PromptRenderer
+    from scraparse.plugins.ai.schema_generator import SchemaGenerator
+    from scraparse.plugins.ai.script_generator import ScriptGenerator
+
+    workdir = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+    renderer = PromptRenderer(templates_dir(), PromptPack("default"))
+    llm = BenchLLM()
+    deps = OrchestratorDeps(
+        schema_generator=SchemaGenerator(llm, renderer),
+        script_generator=ScriptGenerator(llm, renderer),
+        fetcher=fetcher,
+        workspace=WorkspaceManager(workdir),
+        schema_editor=AutoApproveSchemaEditor(),
+    )
+    spec = RunSpec(
+        url=site.start_url,
+        discover=True,
+        discover_strategy=scenario.site.kind,
+        prompt="Extract every product title",
+        context="",
+        promptpack="default",
+        save_artifacts=False,
+        mode="hybrid",
+        limits=limits,
+    )
+    outcome = Orchestrator(deps).run(spec)
+    measurement.extra["errors"] = len(outcome.errors)
+
+
+def _run_in_child(scenario: Scenario) -> dict[str, object]:
+    return run_scenario(scenario).to_dict()
+
+
+def run_suite(scenarios: list[Scenario], isolate: bool = True) -> dict[str, object]:
+    """Run every scenario (each in a fresh process when ``isolate``) and describe the host."""
+    results: list[dict[str, object]] = []
+    if isolate:
+        # A fresh interpreter per scenario keeps peak RSS and import caches independent.
+        ctx = multiprocessing.get_context("spawn")
+        for scenario in scenarios:
+            with ctx.Pool(1) as pool:
+                results.append(pool.apply(_run_in_child, (scenario,)))
+    else:
+        results = [run_scenario(scenario).to_dict() for scenario in scenarios]
+    return {
+        "suite": "throughput",
+        "version": SUITE_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "isolated": isolate,
+        "sites": {scenario.name: scenario.site.to_dict() for scenario in scenarios},
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Discovery and fetch throughput benchmarks")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--page-bytes", type=int, default=20_000)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--fan-out", type=int, default=4)
+    parser.add_argument("--only", help="Run scenarios whose name contains this text")
+    parser.add_argument("--no-isolate", action="store_true", help="Run in this process")
+    parser.add_argument("--output", help="Write the JSON results here instead of stdout")
+    args = parser.parse_args()
+    scenarios = default_scenarios(
+        pages=args.pages,
+        page_bytes=args.page_bytes,
+        latency_s=args.latency_ms / 1000,
+        fan_out=args.fan_out,
+    )
+    if args.only:
+        scenarios = [scenario for scenario in scenarios if args.only in scenario.name]
+    report = json.dumps(run_suite(scenarios, isolate=not args.no_isolate), indent=2)
+    if args.output:
+        Path(args.output).write_text(report + "\n", encoding="utf-8")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
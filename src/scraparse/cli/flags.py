@@ -1,11 +1,59 @@
 from __future__ import annotations
 
 import argparse
+import os
 from dataclasses import dataclass
 
 from scraparse.core.util import parse_bool
 
 
+@dataclass
+class BatchArgs:
+    manifest: str
+    output: str | None
+    workers: int
+    max_concurrent_fetches: int
+    max_concurrent_llm: int
+    max_total_bytes: int
+
+
+@dataclass
+class RunsQueryArgs:
+    action: str
+    url: str | None
+    domain: str | None
+    since: str | None
+    limit: int
+    stats: bool
+    as_json: bool
+
+
+@dataclass
+class ExtractArgs:
+    parser: str
+    inputs: list[str]
+    output: str | None
+    output_format: str | None
+    workers: int
+    chunk_size: int
+    ordered: bool
+    state: str | None = None
+    full: bool = False
+    schema: str | None = None
+
+
+@dataclass
+class BenchArgs:
+    compare: str | None
+    pages: int | None
+    page_bytes: int | None
+    warmup: int
+    repetitions: int
+    only: str | None
+    max_throughput_drop: float
+    max_memory_growth: float
+
+
 @dataclass
 class CliArgs:
     command: str | None
@@ -19,6 +67,14 @@ class CliArgs:
     detail_selector: str | None
     save_artifacts: bool | None
     limits_overrides: dict[str, object]
+    batch: BatchArgs | None = None
+    runs: RunsQueryArgs | None = None
+    extract: ExtractArgs | None = None
+    bench: BenchArgs | None = None
+    profile: bool = False
+    trace: bool = False
+    force_regenerate: bool = False
+    output_mode: str = "script"
 
 
 def _bool_arg(value: str) -> bool:
@@ -29,6 +85,84 @@ def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="scraparse")
     subparsers = parser.add_subparsers(dest="command")
     subparsers.add_parser("wipe", help="Delete all generated runs")
+    batch = subparsers.add_parser("batch", help="Run many RunSpecs from a JSONL manifest")
+    batch.add_argument("manifest", help="JSONL file with one RunSpec per line")
+    batch.add_argument("--output", help="JSONL file for per-run results")
+    batch.add_argument("--workers", type=int, default=4, help="Runs executed in parallel")
+    batch.add_argument("--max-concurrent-fetches", type=int, default=8)
+    batch.add_argument("--max-concurrent-llm", type=int, default=4)
+    batch.add_argument("--batch-max-total-bytes", type=int, default=500_000_000)
+    runs = subparsers.add_parser("runs", help="Query the run index")
+    runs_actions = runs.add_subparsers(dest="runs_action", required=True)
+    query = runs_actions.add_parser("query", help="Look up runs by URL, domain or time")
+    query.add_argument("--url", dest="query_url", help="Runs that fetched this exact URL")
+    query.add_argument("--domain", help="Only runs/pages for this host")
+    query.add_argument("--since", help="Only runs started at or after this ISO timestamp")
+    query.add_argument("--limit", type=int, default=20)
+    query.add_argument("--stats", action="store_true", help="Per-domain page and byte totals")
+    query.add_argument("--json", dest="as_json", action="store_true", help="Print JSON rows")
+    runs_actions.add_parser("import", help="Index existing run reports")
+    extract = subparsers.add_parser(
+        "extract", help="Run a generated parser over many HTML files in parallel"
+    )
+    extract.add_argument("parser", help="parser.py, or a run folder containing one")
+    extract.add_argument(
+        "inputs",
+        nargs="*",
+        help="HTML files, directories, globs or artifact manifest.json files "
+        "(defaults to the run folder's saved pages)",
+    )
+    extract.add_argument("--output", help="CSV or JSONL file for the extracted rows")
+    extract.add_argument(
+        "--format",
+        dest="output_format",
+        choices=["csv", "jsonl", "parquet", "columns"],
+        help="Defaults from --output; parquet and columns write typed columns",
+    )
+    extract.add_argument(
+        "--schema",
+        help="FieldSchema JSON for typed columns (defaults to the parser's run folder)",
+    )
+    extract.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    extract.add_argument("--chunk-size", type=int, default=16, help="Files per worker task")
+    extract.add_argument(
+        "--unordered",
+        action="store_true",
+        help="Write rows as files finish instead of in input order",
+    )
+    extract.add_argument(
+        "--state",
+        help="Incremental state file; unchanged pages reuse their stored rows "
+        "(defaults to <output>.state.sqlite)",
+    )
+    extract.add_argument(
+        "--full", action="store_true", help="Re-parse every page even if it is unchanged"
+    )
+    bench = subparsers.add_parser(
+        "bench", help="Run the microbenchmarks and compare them against a baseline"
+    )
+    bench.add_argument(
+        "--compare", metavar="BASELINE", help="results.json from an earlier bench run"
+    )
+    bench.add_argument(
+        "--pages", type=int, help="Pages per synthetic site (defaults to the baseline's, or 100)"
+    )
+    bench.add_argument("--page-bytes", type=int, help="Bytes per page (default 20000)")
+    bench.add_argument("--warmup", type=int, default=1, help="Discarded runs per benchmark")
+    bench.add_argument("--repetitions", type=int, default=5, help="Measured runs per benchmark")
+    bench.add_argument("--only", help="Run benchmarks whose name contains this text")
+    bench.add_argument(
+        "--max-throughput-drop",
+        type=float,
+        default=0.10,
+        help="Fail when mean pages/s drops by more than this fraction",
+    )
+    bench.add_argument(
+        "--max-memory-growth",
+        type=float,
+        default=0.20,
+        help="Fail when peak RSS grows by more than this fraction",
+    )
 
     parser.add_argument("--url")
     parser.add_argument("--discover", action="store_true", help="Enable discovery mode")
@@ -43,6 +177,27 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--next-selector", help="CSS selector for next-page link")
     parser.add_argument("--detail-selector", help="CSS selector for detail links")
     parser.add_argument("--save-artifacts", type=_bool_arg, help="true/false")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile each run stage (cProfile + tracemalloc) into the run folder",
+    )
+    parser.add_argument(
+        "--force-regenerate",
+        action="store_true",
+        help="Ignore the cached schema/parser for these inputs and ask the LLM again",
+    )
+    parser.add_argument(
+        "--output-mode",
+        choices=["script", "plan"],
+        default="script",
+        help="Generate a parser.py script or a declarative plan.json extraction plan",
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Write a Chrome trace-event timeline (trace.json) into the run folder",
+    )
 
     # Limits overrides
     parser.add_argument("--max-pages", type=int)
@@ -60,7 +215,22 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--max-response-bytes", type=int)
     parser.add_argument("--max-total-bytes", type=int)
     parser.add_argument("--max-runtime-s", type=int)
+    parser.add_argument("--max-pages-per-host", type=int)
+    parser.add_argument("--max-bytes-per-host", type=int)
+    parser.add_argument("--fetch-concurrency", type=int, help="Parallel fetches within one run")
+    parser.add_argument(
+        "--budget-stop",
+        type=_bool_arg,
+        help="true/false: keep pages fetched before a page/byte budget ran out (default true)",
+    )
+    parser.add_argument(
+        "--page-store-ram-bytes",
+        type=int,
+        help="Fetched bytes kept in memory per run before bodies spill to a temp file",
+    )
     parser.add_argument("--max-html-chars-for-llm", type=int)
+    parser.add_argument("--max-prompt-tokens-for-llm", type=int)
+    parser.add_argument("--reserve-output-tokens-for-llm", type=int)
 
     return parser
 
@@ -84,9 +254,64 @@ def parse_args(argv: list[str] | None = None) -> CliArgs:
         "max_response_bytes": args.max_response_bytes,
         "max_total_bytes": args.max_total_bytes,
         "max_runtime_s": args.max_runtime_s,
+        "max_pages_per_host": args.max_pages_per_host,
+        "max_bytes_per_host": args.max_bytes_per_host,
+        "max_concurrent_fetches": args.fetch_concurrency,
+        "budget_stop": args.budget_stop,
+        "page_store_ram_bytes": args.page_store_ram_bytes,
         "max_html_chars_for_llm": args.max_html_chars_for_llm,
+        "max_prompt_tokens_for_llm": args.max_prompt_tokens_for_llm,
+        "reserve_output_tokens_for_llm": args.reserve_output_tokens_for_llm,
     }
     discover = args.discover or args.discover_mode is not None
+    batch = None
+    if args.command == "batch":
+        batch = BatchArgs(
+            manifest=args.manifest,
+            output=args.output,
+            workers=args.workers,
+            max_concurrent_fetches=args.max_concurrent_fetches,
+            max_concurrent_llm=args.max_concurrent_llm,
+            max_total_bytes=args.batch_max_total_bytes,
+        )
+    runs = None
+    if args.command == "runs":
+        is_query = args.runs_action == "query"
+        runs = RunsQueryArgs(
+            action=args.runs_action,
+            url=args.query_url if is_query else None,
+            domain=args.domain if is_query else None,
+            since=args.since if is_query else None,
+            limit=args.limit if is_query else 0,
+            stats=args.stats if is_query else False,
+            as_json=args.as_json if is_query else False,
+        )
+    extract = None
+    if args.command == "extract":
+        extract = ExtractArgs(
+            parser=args.parser,
+            inputs=args.inputs,
+            output=args.output,
+            output_format=args.output_format,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            ordered=not args.unordered,
+            state=args.state,
+            full=args.full,
+            schema=args.schema,
+        )
+    bench = None
+    if args.command == "bench":
+        bench = BenchArgs(
+            compare=args.compare,
+            pages=args.pages,
+            page_bytes=args.page_bytes,
+            warmup=args.warmup,
+            repetitions=args.repetitions,
+            only=args.only,
+            max_throughput_drop=args.max_throughput_drop,
+            max_memory_growth=args.max_memory_growth,
+        )
     return CliArgs(
         command=args.command,
         url=args.url,
@@ -99,4 +324,12 @@ def parse_args(argv: list[str] | None = None) -> CliArgs:
         detail_selector=args.detail_selector,
         save_artifacts=args.save_artifacts,
         limits_overrides=overrides,
+        batch=batch,
+        runs=runs,
+        extract=extract,
+        bench=bench,
+        profile=args.profile,
+        trace=args.trace,
+        force_regenerate=args.force_regenerate,
+        output_mode=args.output_mode,
     )
@@ -1,27 +1,48 @@
 from __future__ import annotations
 
+import json
 import os
 import shutil
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from scraparse.adapters.llm.openai_adapter import OpenAIClient
-from scraparse.cli.flags import parse_args
-from scraparse.cli.schema_editor import SchemaEditor
-from scraparse.cli.wizard import collect_run_spec
-from scraparse.core.errors import ConfigError
+from scraparse.cli.flags import (
+    BatchArgs,
+    BenchArgs,
+    CliArgs,
+    ExtractArgs,
+    RunsQueryArgs,
+    parse_args,
+)
+from scraparse.core.errors import ConfigError, ScraparseError
 from scraparse.core.logging import setup_logging
 from scraparse.core.limits import Limits
-from scraparse.core.paths import templates_dir
-from scraparse.core.workspace import WorkspaceManager
-from scraparse.engine.orchestrator import Orchestrator, OrchestratorDeps
-from scraparse.plugins.ai.prompt_renderer import PromptPack, PromptRenderer
-from scraparse.plugins.ai.schema_generator import SchemaGenerator
-from scraparse.plugins.ai.script_generator import ScriptGenerator
-from scraparse.plugins.fetchers.httpx_fetcher import HttpxFetcher
+from scraparse.core.paths import (
+    bench_dir,
+    blobs_dir,
+    cache_dir,
+    memo_dir,
+    registry_path,
+    run_store_path,
+    templates_dir,
+)
 
+if TYPE_CHECKING:
+    from scraparse.core.workspace import WorkspaceManager
+    from scraparse.plugins.ai.prompt_renderer import PromptRenderer
+
+# Commands import their dependencies (openai, httpx, jinja2, bs4, the engine)
+# inside their handlers, so `wipe`, `runs`, `--help` and friends start fast.
+# bench/startup.py holds each command to an import budget.
 
 GENERATED_DIR = Path(".scraparse") / "generated"
+MAX_PRINTED_FAILURES = 10
+STATIC_PROMPTS = [
+    "schema_generator_system_prompt.jinja",
+    "script_generator_system_prompt.jinja",
+    "plan_generator_system_prompt.jinja",
+]
 
 
 def main() -> None:
@@ -32,11 +53,45 @@ def main() -> None:
         _wipe_generated()
         return
 
+    if args.command == "runs" and args.runs is not None:
+        _run_runs(args.runs)
+        return
+
+    if args.command == "extract" and args.extract is not None:
+        _run_extract(args.extract)
+        return
+
+    if args.command == "bench" and args.bench is not None:
+        _run_bench(args.bench)
+        return
+
     if not os.environ.get("OPENAI_API_KEY"):
         print("OPENAI_API_KEY is not set. Please run:")
         print("  export OPENAI_API_KEY=...\n")
         sys.exit(1)
 
+    if args.command == "batch" and args.batch is not None:
+        _run_batch(args.batch, Limits().with_overrides(args.limits_overrides))
+        return
+
+    _run_single(args)
+
+
+def _run_single(args: CliArgs) -> None:
+    from scraparse.adapters.llm.openai_adapter import DEFAULT_MODEL, OpenAIClient
+    from scraparse.cli.schema_editor import SchemaEditor
+    from scraparse.cli.wizard import collect_run_spec
+    from scraparse.core.parser_registry import ParserRegistry
+    from scraparse.core.run_memo import RunMemo
+    from scraparse.core.sandbox import SandboxPool
+    from scraparse.engine.orchestrator import Orchestrator, OrchestratorDeps
+    from scraparse.plugins.ai.plan_generator import PlanGenerator
+    from scraparse.plugins.ai.prompt_renderer import PromptPack, PromptRenderer
+    from scraparse.plugins.ai.schema_generator import SchemaGenerator
+    from scraparse.plugins.ai.script_generator import ScriptGenerator
+    from scraparse.plugins.ai.token_budget import TokenEstimator
+    from scraparse.plugins.fetchers.httpx_fetcher import HttpxFetcher
+
     promptpacks = _available_promptpacks()
     limits = Limits()
     try:
@@ -45,32 +100,285 @@ def main() -> None:
         print(str(exc))
         sys.exit(1)
 
-    renderer = PromptRenderer(templates_dir(), PromptPack(spec.promptpack))
+    renderer = PromptRenderer(
+        templates_dir(),
+        PromptPack(spec.promptpack),
+        bytecode_cache_dir=cache_dir() / "jinja",
+    )
+    renderer.prerender(STATIC_PROMPTS)
     llm = OpenAIClient()
     schema_generator = SchemaGenerator(llm, renderer) # ai to understand and generate the schema
     script_generator = ScriptGenerator(llm, renderer) # ai to generate the parsing script
 
-    with HttpxFetcher(spec.limits) as fetcher:
+    # Sandbox workers start now so they are warm by the time a parser needs testing.
+    with HttpxFetcher(spec.limits) as fetcher, SandboxPool() as sandbox:
         orchestrator = Orchestrator(
             OrchestratorDeps(
                 schema_generator=schema_generator,
                 script_generator=script_generator,
                 fetcher=fetcher,
-                workspace=WorkspaceManager(GENERATED_DIR),
+                workspace=_workspace(),
                 schema_editor=SchemaEditor(),
+                token_estimator=TokenEstimator.for_model(DEFAULT_MODEL),
+                memo=RunMemo(memo_dir()),
+                registry=ParserRegistry(registry_path()),
+                sandbox=sandbox,
+                plan_generator=PlanGenerator(llm, renderer),
             )
         )
         outcome = orchestrator.run(spec)
 
+    if outcome.profile_summary:
+        print("Profile hot spots (own time):")
+        for line in outcome.profile_summary:
+            print(f"  {line}")
+
     if outcome.errors:
         for error in outcome.errors:
             print(f"Error: {error}")
         sys.exit(1)
 
-    print(f"Parser script saved to: {outcome.parser_path}")
+    if spec.output_mode == "plan":
+        print(f"Extraction plan saved to: {outcome.parser_path}")
+    else:
+        print(f"Parser script saved to: {outcome.parser_path}")
     print(f"Run report saved to: {outcome.report_path}")
 
 
+def _run_batch(batch: BatchArgs, limits: Limits) -> None:
+    from scraparse.adapters.llm.openai_adapter import DEFAULT_MODEL, OpenAIClient
+    from scraparse.core.parser_registry import ParserRegistry
+    from scraparse.core.run_memo import RunMemo
+    from scraparse.core.sandbox import SandboxPool
+    from scraparse.engine.batch import BatchConfig, BatchRunner, load_manifest
+    from scraparse.plugins.ai.prompt_renderer import PromptPack, PromptRenderer
+    from scraparse.plugins.ai.token_budget import TokenEstimator
+    from scraparse.plugins.fetchers.httpx_fetcher import HttpxFetcher
+
+    manifest_path = Path(batch.manifest)
+    try:
+        items = load_manifest(manifest_path, limits)
+    except (ConfigError, OSError) as exc:
+        print(str(exc))
+        sys.exit(1)
+    output_path = (
+        Path(batch.output) if batch.output else manifest_path.with_suffix(".results.jsonl")
+    )
+
+    def make_renderer(promptpack: str) -> PromptRenderer:
+        renderer = PromptRenderer(
+            templates_dir(), PromptPack(promptpack), bytecode_cache_dir=cache_dir() / "jinja"
+        )
+        renderer.prerender(STATIC_PROMPTS)
+        return renderer
+
+    # Parsers are tested right after generation, so one worker per LLM slot keeps up.
+    with SandboxPool(workers=batch.max_concurrent_llm) as sandbox:
+        runner = BatchRunner(
+            BatchConfig(
+                workers=batch.workers,
+                max_concurrent_fetches=batch.max_concurrent_fetches,
+                max_concurrent_llm=batch.max_concurrent_llm,
+                max_total_bytes=batch.max_total_bytes,
+            ),
+            llm=OpenAIClient(),
+            workspace=_workspace(),
+            renderer_factory=make_renderer,
+            fetcher_factory=HttpxFetcher,
+            token_estimator=TokenEstimator.for_model(DEFAULT_MODEL),
+            memo=RunMemo(memo_dir()),
+            registry=ParserRegistry(registry_path()),
+            sandbox=sandbox,
+        )
+        summary = runner.run(
+            items,
+            output_path,
+            on_result=lambda result: print(
+                f"[{'ok' if result.ok else 'failed'}] line {result.line_no}: {result.url}"
+            ),
+        )
+    print(f"Results saved to: {output_path}")
+    for line in summary.lines():
+        print(line)
+    if summary.failed:
+        sys.exit(1)
+
+
+def _workspace() -> WorkspaceManager:
+    from scraparse.core.blob_store import BlobStore
+    from scraparse.core.run_store import RunStore
+    from scraparse.core.workspace import WorkspaceManager
+
+    return WorkspaceManager(
+        GENERATED_DIR,
+        blob_store=BlobStore(blobs_dir()),
+        run_store=RunStore(run_store_path()),
+    )
+
+
+def _run_runs(runs: RunsQueryArgs) -> None:
+    from scraparse.core.run_store import RunStore
+
+    with RunStore(run_store_path()) as store:
+        if runs.action == "import":
+            count = store.import_reports(GENERATED_DIR)
+            print(f"Indexed {count} run reports into {store.path}")
+            return
+        if runs.stats:
+            rows = store.domain_stats(domain=runs.domain, since=runs.since)
+            columns = ["domain", "runs", "pages", "avg_bytes_per_page", "total_bytes"]
+        elif runs.url:
+            rows = store.runs_for_url(runs.url, limit=runs.limit)
+            columns = ["run_id", "started_at", "ok", "fetched_count", "bytes_total", "url"]
+        else:
+            rows = store.recent_runs(domain=runs.domain, since=runs.since, limit=runs.limit)
+            columns = ["run_id", "started_at", "ok", "fetched_count", "bytes_total", "url"]
+    if runs.as_json:
+        for row in rows:
+            print(json.dumps(row))
+        return
+    if not rows:
+        print("No matching runs")
+        return
+    print("\t".join(columns))
+    for row in rows:
+        print("\t".join(str(row.get(column, "")) for column in columns))
+
+
+def _run_extract(extract: ExtractArgs) -> None:
+    from scraparse.core.extract_state import ExtractState
+    from scraparse.engine.extract import (
+        ExtractConfig,
+        ExtractRunner,
+        FileOutcome,
+        collect_inputs,
+        failure_record,
+        output_format_for,
+        resolve_parser,
+        resolve_schema,
+    )
+
+    target = Path(extract.parser)
+    try:
+        script_path = resolve_parser(target)
+        sources = extract.inputs or ([str(target)] if target.is_dir() else [])
+        inputs = collect_inputs(sources)
+        schema = resolve_schema(script_path, Path(extract.schema) if extract.schema else None)
+    except ConfigError as exc:
+        print(str(exc))
+        sys.exit(1)
+    if not inputs:
+        print("No input files to extract")
+        sys.exit(1)
+    output_path = (
+        Path(extract.output) if extract.output else script_path.parent / "extracted.csv"
+    )
+    output_format = extract.output_format or output_format_for(output_path)
+    failures_path = output_path.with_name(output_path.name + ".failures.jsonl")
+    state_path = (
+        Path(extract.state)
+        if extract.state
+        else output_path.with_name(output_path.name + ".state.sqlite")
+    )
+    shown = 0
+
+    state = ExtractState(state_path)
+    with failures_path.open("w", encoding="utf-8") as failures:
+
+        def on_failure(outcome: FileOutcome) -> None:
+            nonlocal shown
+            failures.write(json.dumps(failure_record(outcome)) + "\n")
+            if shown < MAX_PRINTED_FAILURES:
+                shown += 1
+                print(f"[failed] {outcome.source}: {outcome.error}")
+
+        runner = ExtractRunner(
+            ExtractConfig(
+                workers=extract.workers,
+                chunk_size=extract.chunk_size,
+                ordered=extract.ordered,
+                output_format=output_format,
+                reparse_all=extract.full,
+            )
+        )
+        try:
+            summary = runner.run(
+                script_path,
+                inputs,
+                output_path,
+                on_failure=on_failure,
+                state=state,
+                schema=schema,
+            )
+        except ScraparseError as exc:
+            print(f"Error: {exc}")
+            sys.exit(1)
+        finally:
+            state.close()
+
+    print(f"Rows saved to: {output_path}")
+    if summary.failed:
+        print(f"Failures saved to: {failures_path}")
+    else:
+        failures_path.unlink(missing_ok=True)
+    for line in summary.lines():
+        print(line)
+    if summary.failed:
+        sys.exit(1)
+
+
+def _run_bench(bench: BenchArgs) -> None:
+    from scraparse.bench.regression import (
+        Thresholds,
+        compare,
+        gate_scenarios,
+        load_baseline,
+        render_table,
+        result_config,
+        run_benchmarks,
+        save_report,
+        summary_rows,
+    )
+
+    baseline = None
+    config: dict[str, int] = {}
+    if bench.compare:
+        try:
+            baseline = load_baseline(Path(bench.compare))
+        except (OSError, ValueError) as exc:
+            print(f"Could not read baseline: {exc}")
+            sys.exit(1)
+        # Sizes come from the baseline so both sides measure the same sites.
+        config = result_config(baseline)
+    scenarios = gate_scenarios(
+        pages=bench.pages or config.get("pages", 100),
+        page_bytes=bench.page_bytes or config.get("page_bytes", 20_000),
+    )
+    if bench.only:
+        scenarios = [scenario for scenario in scenarios if bench.only in scenario.name]
+    if not scenarios:
+        print("No benchmarks match --only")
+        sys.exit(1)
+    current = run_benchmarks(scenarios, warmup=bench.warmup, repetitions=bench.repetitions)
+    thresholds = Thresholds(
+        max_throughput_drop=bench.max_throughput_drop,
+        max_memory_growth=bench.max_memory_growth,
+    )
+    if baseline is None:
+        rows = summary_rows(current)
+    else:
+        rows = compare(baseline, current, thresholds)
+    baseline_path = Path(bench.compare) if bench.compare else None
+    report_dir = save_report(bench_dir(), current, rows, baseline_path, thresholds)
+    print(render_table(rows))
+    print(f"Results saved to: {report_dir / 'results.json'}")
+    print(f"Comparison saved to: {report_dir / 'comparison.md'}")
+    regressed = [row for row in rows if row.failed]
+    if regressed:
+        print(f"{len(regressed)} metric(s) regressed past the thresholds")
+        sys.exit(1)
+
+
 def _available_promptpacks() -> list[str]:
     pack_root = templates_dir() / "promptpacks"
     if not pack_root.exists():
@@ -88,6 +396,12 @@ def _wipe_generated() -> None:
             return
         shutil.rmtree(GENERATED_DIR)
         print(f"Deleted {GENERATED_DIR}")
+        # Blobs are only referenced from run manifests, so they go too.
+        if blobs_dir().exists():
+            shutil.rmtree(blobs_dir())
+            print(f"Deleted {blobs_dir()}")
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{run_store_path()}{suffix}").unlink(missing_ok=True)
     else:
         print("No generated runs found")
 
@@ -117,3 +117,8 @@ class SchemaEditor:
         new_fields = list(schema.fields)
         new_fields[index] = updated
         return FieldSchema(fields=new_fields)
+
+
+class AutoApproveSchemaEditor(SchemaEditor):
+    def confirm(self, schema: FieldSchema) -> FieldSchema:
+        return schema
@@ -102,6 +102,10 @@ def collect_run_spec(args: CliArgs, limits: Limits, promptpacks: list[str]) -> R
         limits=limits,
         next_selector=next_selector,
         detail_selector=detail_selector,
+        profile=args.profile,
+        trace=args.trace,
+        force_regenerate=args.force_regenerate,
+        output_mode=args.output_mode,
     )
     _confirm_run_spec(spec)
     return spec
@@ -150,6 +154,7 @@ def _confirm_run_spec(spec: RunSpec) -> None:
     print(f"- Discovery: {spec.discover}")
     print(f"- Discovery strategy: {spec.discover_strategy}")
     print(f"- Prompt pack: {spec.promptpack}")
+    print(f"- Output: {spec.output_mode}")
     print(f"- Save artifacts: {spec.save_artifacts}")
     print(f"- Max pages: {spec.limits.max_pages}")
     print(f"- Max depth: {spec.limits.max_depth}")
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from contextvars import copy_context
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+import os
+import queue
+import threading
+
+from scraparse.core.blob_store import BlobRef, BlobStore, StagedBlob
+from scraparse.core.errors import ArtifactWriteError
+from scraparse.core.tracing import span
+
+
+@dataclass
+class _Job:
+    content: bytes
+    path: Path | None = None
+    blob_key: str | None = None
+    digest: str | None = None
+
+
+@dataclass
+class _Pending:
+    handle: BinaryIO | None
+    directory: Path
+    staged: StagedBlob | None = None
+
+
+class ArtifactWriter:
+    """Writes artifact files on a background thread while the run continues.
+
+    ``submit`` blocks once ``max_pending`` writes are queued, so a slow disk
+    slows fetching instead of buffering every page in memory. Files are
+    fsynced in batches of up to ``fsync_batch`` (or whenever the queue runs
+    dry). The first write error is raised from the next ``submit`` or from
+    ``close``; later items are drained without being written.
+
+    With a ``blob_store``, ``submit_blob`` stores bodies by content hash;
+    ``blobs`` maps each key to its ``BlobRef`` once ``close`` returns.
+    """
+
+    def __init__(
+        self,
+        max_pending: int = 32,
+        fsync_batch: int = 16,
+        fsync: bool = True,
+        blob_store: BlobStore | None = None,
+    ) -> None:
+        self.fsync_batch = max(1, fsync_batch)
+        self.fsync = fsync
+        self.blob_store = blob_store
+        self.blobs: dict[str, BlobRef] = {}
+        self.files_written = 0
+        self.bytes_written = 0
+        self.closed = False
+        self._queue: queue.Queue[_Job | None] = queue.Queue(maxsize=max_pending)
+        self._error: BaseException | None = None
+        # Run in a copy of the caller's context so write spans land in its trace.
+        self._thread = threading.Thread(
+            target=copy_context().run,
+            args=(self._work,),
+            name="scraparse-artifacts",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def submit(self, path: Path, content: bytes) -> None:
+        self._put(_Job(content=content, path=path))
+
+    def submit_blob(self, key: str, content: bytes, digest: str | None = None) -> None:
+        if self.blob_store is None:
+            raise ArtifactWriteError("Artifact writer has no blob store")
+        self._put(_Job(content=content, blob_key=key, digest=digest))
+
+    def _put(self, job: _Job) -> None:
+        if self.closed:
+            raise ArtifactWriteError("Artifact writer is closed")
+        self._raise_pending_error()
+        self._queue.put(job)
+
+    def close(self) -> None:
+        """Wait for queued writes to reach disk and raise the first write error."""
+        if not self.closed:
+            self.closed = True
+            self._queue.put(None)
+            self._thread.join()
+        self._raise_pending_error()
+
+    def __enter__(self) -> "ArtifactWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:  # type: ignore[no-untyped-def]
+        if exc_type is None:
+            self.close()
+            return
+        # Keep the original exception; still flush what was queued.
+        try:
+            self.close()
+        except ArtifactWriteError:
+            pass
+
+    def _raise_pending_error(self) -> None:
+        error = self._error
+        if error is not None:
+            raise ArtifactWriteError(f"Failed to write artifact: {error}") from error
+
+    def _work(self) -> None:
+        pending: list[_Pending] = []
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            if self._error is not None:
+                continue
+            try:
+                pending.append(self._write(job))
+                self.files_written += 1
+                self.bytes_written += len(job.content)
+                if len(pending) >= self.fsync_batch or self._queue.empty():
+                    self._sync(pending)
+            except BaseException as exc:  # noqa: BLE001 - surfaced via close()
+                self._error = exc
+                self._abandon(pending)
+        try:
+            self._sync(pending)
+        except BaseException as exc:  # noqa: BLE001 - surfaced via close()
+            if self._error is None:
+                self._error = exc
+
+    def _write(self, job: _Job) -> _Pending:
+        if job.blob_key is not None and self.blob_store is not None:
+            with span("workspace.write", kind="blob", bytes=len(job.content)) as attrs:
+                staged = self.blob_store.stage(job.content, digest=job.digest)
+                attrs["digest"] = staged.ref.digest
+                attrs["stored_bytes"] = staged.ref.stored_size
+            self.blobs[job.blob_key] = staged.ref
+            return _Pending(staged.handle, staged.path.parent, staged)
+        assert job.path is not None
+        with span("workspace.write", kind="html", path=str(job.path), bytes=len(job.content)):
+            handle = open(job.path, "wb")
+            try:
+                handle.write(job.content)
+            except BaseException:
+                handle.close()
+                raise
+        return _Pending(handle, job.path.parent)
+
+    def _sync(self, pending: list[_Pending]) -> None:
+        if not pending:
+            return
+        try:
+            with span("workspace.fsync", files=len(pending)):
+                for item in pending:
+                    if item.handle is None:
+                        continue
+                    item.handle.flush()
+                    if self.fsync:
+                        os.fsync(item.handle.fileno())
+                    item.handle.close()
+                    if item.staged is not None:
+                        item.staged.commit()
+                if self.fsync and hasattr(os, "O_DIRECTORY"):
+                    # New directory entries are only durable once the directory is synced.
+                    for directory in {item.directory for item in pending}:
+                        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+                        try:
+                            os.fsync(fd)
+                        finally:
+                            os.close(fd)
+        finally:
+            self._abandon(pending)
+
+    @staticmethod
+    def _abandon(pending: list[_Pending]) -> None:
+        # Close anything still open; staged blobs that never committed are removed.
+        for item in pending:
+            if item.handle is not None:
+                try:
+                    item.handle.close()
+                except OSError:
+                    pass
+            if item.staged is not None:
+                item.staged.discard()
+        pending.clear()
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import BinaryIO, Iterator
+import gzip
+import hashlib
+import importlib
+import os
+import tempfile
+
+zstandard: ModuleType | None
+try:
+    zstandard = importlib.import_module("zstandard")
+except ImportError:  # optional dependency
+    zstandard = None
+
+CODEC_SUFFIXES = {"zstd": ".zst", "gzip": ".gz"}
+READ_CHUNK_BYTES = 1 << 16
+
+
+def default_codec() -> str:
+    return "zstd" if zstandard is not None else "gzip"
+
+
+@dataclass(frozen=True)
+class BlobRef:
+    digest: str
+    size: int
+    stored_size: int
+    codec: str
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "digest": self.digest,
+            "size": self.size,
+            "stored_size": self.stored_size,
+            "codec": self.codec,
+        }
+
+
+@dataclass
+class StagedBlob:
+    """A compressed blob written to a temp file but not yet moved into place."""
+
+    ref: BlobRef
+    path: Path
+    handle: BinaryIO | None = None
+    tmp_path: Path | None = None
+
+    def commit(self) -> None:
+        if self.tmp_path is not None:
+            os.replace(self.tmp_path, self.path)
+            self.tmp_path = None
+
+    def discard(self) -> None:
+        if self.tmp_path is not None:
+            self.tmp_path.unlink(missing_ok=True)
+            self.tmp_path = None
+
+
+class BlobStore:
+    """Content-addressed store for page bodies, shared across runs.
+
+    Blobs live at ``<root>/<digest[:2]>/<digest><suffix>``, keyed by the
+    sha256 of the uncompressed body. Identical pages are stored once.
+    """
+
+    def __init__(self, root: Path, codec: str | None = None, level: int | None = None) -> None:
+        codec = codec or default_codec()
+        if codec not in CODEC_SUFFIXES:
+            raise ValueError(f"Unknown blob codec: {codec}")
+        if codec == "zstd" and zstandard is None:
+            raise ValueError("zstd codec requires the 'zstandard' package")
+        self.root = root
+        self.codec = codec
+        self.level = level if level is not None else (10 if codec == "zstd" else 6)
+
+    @staticmethod
+    def digest(content: bytes) -> str:
+        return hashlib.sha256(content).hexdigest()
+
+    def path_for(self, digest: str, codec: str | None = None) -> Path:
+        suffix = CODEC_SUFFIXES[codec or self.codec]
+        return self.root / digest[:2] / f"{digest}{suffix}"
+
+    def find(self, digest: str) -> Path | None:
+        # Blobs written with another codec stay readable.
+        for codec in (self.codec, *CODEC_SUFFIXES):
+            path = self.path_for(digest, codec)
+            if path.exists():
+                return path
+        return None
+
+    def exists(self, digest: str) -> bool:
+        return self.find(digest) is not None
+
+    def stage(self, content: bytes, digest: str | None = None) -> StagedBlob:
+        """Compress ``content`` into a temp file; ``commit`` moves it into place.
+
+        The caller flushes/fsyncs ``handle`` before committing, which lets
+        several blobs share one sync pass.
+        """
+        digest = digest or self.digest(content)
+        existing = self.find(digest)
+        if existing is not None:
+            ref = BlobRef(digest, len(content), existing.stat().st_size, _codec_of(existing))
+            return StagedBlob(ref=ref, path=existing)
+        path = self.path_for(digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        compressed = self._compress(content)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=path.suffix)
+        handle = os.fdopen(fd, "wb")
+        try:
+            handle.write(compressed)
+        except BaseException:
+            handle.close()
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        ref = BlobRef(digest, len(content), len(compressed), self.codec)
+        return StagedBlob(ref=ref, path=path, handle=handle, tmp_path=Path(tmp_name))
+
+    def put(self, content: bytes, fsync: bool = True) -> BlobRef:
+        staged = self.stage(content)
+        if staged.handle is not None:
+            try:
+                staged.handle.flush()
+                if fsync:
+                    os.fsync(staged.handle.fileno())
+                staged.handle.close()
+                staged.commit()
+            except BaseException:
+                staged.handle.close()
+                staged.discard()
+                raise
+        return staged.ref
+
+    def open(self, digest: str) -> BinaryIO:
+        """Return a streaming reader over the decompressed body."""
+        path = self.find(digest)
+        if path is None:
+            raise FileNotFoundError(f"No blob {digest} in {self.root}")
+        if _codec_of(path) == "zstd":
+            if zstandard is None:
+                raise ValueError("Reading zstd blobs requires the 'zstandard' package")
+            reader: BinaryIO = zstandard.ZstdDecompressor().stream_reader(
+                path.open("rb"), closefd=True
+            )
+            return reader
+        return gzip.open(path, "rb")  # type: ignore[return-value]
+
+    def iter_chunks(self, digest: str, chunk_size: int = READ_CHUNK_BYTES) -> Iterator[bytes]:
+        with self.open(digest) as reader:
+            while True:
+                chunk = reader.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    def read_bytes(self, digest: str) -> bytes:
+        return b"".join(self.iter_chunks(digest))
+
+    def _compress(self, content: bytes) -> bytes:
+        if self.codec == "zstd":
+            assert zstandard is not None  # checked in __init__
+            compressed: bytes = zstandard.ZstdCompressor(level=self.level).compress(content)
+            return compressed
+        return gzip.compress(content, compresslevel=self.level, mtime=0)
+
+
+def _codec_of(path: Path) -> str:
+    for codec, suffix in CODEC_SUFFIXES.items():
+        if path.name.endswith(suffix):
+            return codec
+    raise ValueError(f"Unknown blob file: {path}")
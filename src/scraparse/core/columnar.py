@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from functools import lru_cache
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Protocol
+from urllib.parse import urljoin, urlparse
+import importlib
+import json
+import re
+
+from scraparse.core.models import FieldSchema
+from scraparse.core.normalizers import (
+    DATE_FORMATS,
+    normalize_boolean,
+    normalize_number,
+    normalize_text,
+    parse_money,
+)
+
+COLUMNS_FORMAT = "scraparse-columns"
+COLUMNS_VERSION = 1
+CURRENCY_SUFFIX = "_currency"
+# Distinct values remembered per column before the cache is reset.
+MAX_CACHED_VALUES = 100_000
+# Distinct non-empty values used to pick a column's date format.
+DATE_SAMPLE = 64
+_PLAIN_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+_WHITESPACE = re.compile(r"\s")
+
+# Output column types, shared by both writers.
+LOGICAL_TYPES = {
+    "string": "string",
+    "number": "float64",
+    "money": "float64",
+    "date": "date",
+    "url": "string",
+    "boolean": "bool",
+}
+
+
+@dataclass
+class TypedColumns:
+    types: dict[str, str]
+    columns: dict[str, list[Any]]
+    length: int = 0
+    # Non-empty raw values that could not be converted, per column.
+    invalid: dict[str, int] = field(default_factory=dict)
+
+
+def infer_date_format(values: list[str]) -> str | None:
+    """The format that parses the most sample values (ties go to the earlier format)."""
+    best: str | None = None
+    best_hits = 0
+    for fmt in DATE_FORMATS:
+        hits = 0
+        for value in values:
+            try:
+                datetime.strptime(_date_candidate(value), fmt)
+                hits += 1
+            except ValueError:
+                continue
+        if hits > best_hits:
+            best, best_hits = fmt, hits
+    return best
+
+
+def _date_candidate(value: str) -> str:
+    text = normalize_text(value)
+    # Timestamps keep their date and time; zones and fractions are not parsed.
+    return text[:19] if len(text) > 19 and text[4:5] == "-" and text[10:11] == "T" else text
+
+
+def _to_float(text: str) -> float | None:
+    if _PLAIN_NUMBER.fullmatch(text):
+        return float(text)
+    cleaned = normalize_number(text)
+    try:
+        return float(cleaned) if cleaned else None
+    except ValueError:
+        return None
+
+
+def _to_bool(text: str) -> bool | None:
+    normalized = normalize_boolean(text)
+    return None if not normalized else normalized == "true"
+
+
+class _Column:
+    """Converts one schema field, caching the result for every distinct raw value."""
+
+    def __init__(self, name: str, field_type: str) -> None:
+        self.name = name
+        self.field_type = field_type
+        self.date_format: str | None = None
+        self._cache: dict[Any, Any] = {}
+        self._convert: Callable[[str], Any] = {
+            "string": lambda text: normalize_text(text) or None,
+            "number": _to_float,
+            "money": _money,
+            "date": self._to_date,
+            "boolean": _to_bool,
+        }.get(field_type, lambda text: normalize_text(text) or None)
+
+    def prepare(self, raw: list[str]) -> None:
+        if self.field_type == "date" and self.date_format is None:
+            sample = list(dict.fromkeys(value for value in raw if value))[:DATE_SAMPLE]
+            if sample:
+                self.date_format = infer_date_format(sample)
+
+    def convert(self, raw: list[str], bases: list[str]) -> tuple[list[Any], int]:
+        if len(self._cache) > MAX_CACHED_VALUES:
+            self._cache.clear()
+        cache = self._cache
+        out: list[Any] = []
+        invalid = 0
+        is_url = self.field_type == "url"
+        for index, value in enumerate(raw):
+            if not value:
+                out.append(None)
+                continue
+            key = _url_key(value, bases[index]) if is_url else value
+            try:
+                result = cache[key]
+            except KeyError:
+                result = _to_url(value, bases[index]) if is_url else self._convert(value)
+                cache[key] = result
+            if result is None or (self.field_type == "money" and result[0] is None):
+                invalid += 1
+            out.append(result)
+        return out, invalid
+
+    def _to_date(self, text: str) -> date | None:
+        candidate = _date_candidate(text)
+        formats = (self.date_format,) if self.date_format else ()
+        for fmt in (*formats, *DATE_FORMATS):
+            try:
+                return datetime.strptime(candidate, fmt).date()
+            except ValueError:
+                continue
+        return None
+
+
+def _money(text: str) -> tuple[float | None, str | None]:
+    amount, currency = parse_money(text)
+    value = _to_float(amount) if amount else None
+    return value, currency or None
+
+
+def _url_key(value: str, base: str) -> object:
+    # Absolute links do not depend on the page and root-relative ones only on
+    # its origin, so most rows share a cache entry with earlier pages.
+    if "://" in value:
+        return value
+    if value.startswith("/") and not value.startswith("//"):
+        return (value, _origin(base))
+    return (value, base)
+
+
+@lru_cache(maxsize=4096)
+def _origin(base: str) -> str:
+    parsed = urlparse(base)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+def _to_url(text: str, base: str) -> str | None:
+    stripped = text.strip()
+    if base.startswith(("http://", "https://")):
+        stripped = urljoin(base, stripped)
+    parsed = urlparse(stripped)
+    if _WHITESPACE.search(stripped):
+        return None
+    if parsed.scheme and parsed.scheme not in {"http", "https"}:
+        return None
+    return stripped
+
+
+class ColumnNormalizer:
+    """Turns extracted string rows into typed columns driven by a ``FieldSchema``.
+
+    Work happens column by column over a batch: each distinct raw value is
+    converted once (scraped columns repeat heavily), date columns pick one
+    format from a sample instead of trying every format per value, and
+    money splits into an amount and an ISO currency column. ``source_key``
+    names the column holding each row's page URL, used to resolve relative
+    links.
+    """
+
+    def __init__(self, schema: FieldSchema, source_key: str | None = None) -> None:
+        self.source_key = source_key
+        self._columns = [_Column(spec.name, spec.type) for spec in schema.fields]
+        self.types: dict[str, str] = {}
+        if source_key:
+            self.types[source_key] = "string"
+        for column in self._columns:
+            self.types[column.name] = LOGICAL_TYPES[column.field_type]
+            if column.field_type == "money":
+                self.types[column.name + CURRENCY_SUFFIX] = "string"
+
+    @property
+    def date_formats(self) -> dict[str, str | None]:
+        return {
+            column.name: column.date_format
+            for column in self._columns
+            if column.field_type == "date"
+        }
+
+    def normalize(self, rows: list[dict[str, str]]) -> TypedColumns:
+        bases = [row.get(self.source_key, "") for row in rows] if self.source_key else []
+        result = TypedColumns(types=self.types, columns={}, length=len(rows))
+        if self.source_key:
+            result.columns[self.source_key] = bases
+        if not bases:
+            bases = [""] * len(rows)
+        for column in self._columns:
+            raw = [row.get(column.name) or "" for row in rows]
+            column.prepare(raw)
+            values, invalid = column.convert(raw, bases)
+            if column.field_type == "money":
+                result.columns[column.name] = [pair[0] if pair else None for pair in values]
+                result.columns[column.name + CURRENCY_SUFFIX] = [
+                    pair[1] if pair else None for pair in values
+                ]
+            else:
+                result.columns[column.name] = values
+            if invalid:
+                result.invalid[column.name] = invalid
+        return result
+
+
+class ColumnWriter(Protocol):
+    def write(self, batch: TypedColumns) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class JsonColumnWriter:
+    """Column-oriented JSON Lines: a header with the types, then one object per batch."""
+
+    def __init__(self, path: Path, types: dict[str, str]) -> None:
+        self._handle = path.open("w", encoding="utf-8")
+        header = {"format": COLUMNS_FORMAT, "version": COLUMNS_VERSION, "types": types}
+        self._handle.write(json.dumps(header) + "\n")
+        self._dates = [name for name, kind in types.items() if kind == "date"]
+
+    def write(self, batch: TypedColumns) -> None:
+        columns = dict(batch.columns)
+        for name in self._dates:
+            columns[name] = [value.isoformat() if value else None for value in columns[name]]
+        record = {"length": batch.length, "columns": columns}
+        self._handle.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+@lru_cache(maxsize=1)
+def _pyarrow() -> ModuleType | None:
+    # Optional and slow to import, so it loads only when Parquet is written.
+    try:
+        pyarrow = importlib.import_module("pyarrow")
+        importlib.import_module("pyarrow.parquet")
+    except ImportError:
+        return None
+    return pyarrow
+
+
+def parquet_available() -> bool:
+    return _pyarrow() is not None
+
+
+class ParquetColumnWriter:
+    """One Parquet row group per batch; needs pyarrow."""
+
+    ARROW_TYPES = {"string": "string", "float64": "float64", "date": "date32", "bool": "bool_"}
+
+    def __init__(self, path: Path, types: dict[str, str]) -> None:
+        pyarrow = _pyarrow()
+        if pyarrow is None:
+            raise ImportError("Parquet output needs pyarrow (pip install pyarrow)")
+        self._pyarrow = pyarrow
+        self._schema = pyarrow.schema(
+            [(name, getattr(pyarrow, self.ARROW_TYPES[kind])()) for name, kind in types.items()]
+        )
+        self._writer = pyarrow.parquet.ParquetWriter(str(path), self._schema)
+
+    def write(self, batch: TypedColumns) -> None:
+        table = self._pyarrow.Table.from_pydict(batch.columns, schema=self._schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def read_json_columns(path: Path) -> tuple[dict[str, str], dict[str, list[Any]]]:
+    """Load a column JSON file back into whole columns (dates stay ISO strings)."""
+    with path.open(encoding="utf-8") as handle:
+        header = json.loads(handle.readline())
+        if header.get("format") != COLUMNS_FORMAT:
+            raise ValueError(f"{path} is not a {COLUMNS_FORMAT} file")
+        types: dict[str, str] = header["types"]
+        columns: dict[str, list[Any]] = {name: [] for name in types}
+        for line in handle:
+            batch = json.loads(line)
+            for name in types:
+                columns[name].extend(batch["columns"][name])
+    return types, columns
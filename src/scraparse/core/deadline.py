@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+
+from scraparse.core.errors import CancelledError, LimitExceededError
+
+
+class Deadline:
+    """Monotonic run deadline with cooperative cancellation.
+
+    A child deadline is cancelled whenever its parent is, so one cancel on a
+    batch-level deadline stops every run sharing it.
+    """
+
+    def __init__(self, budget_s: float | None = None, parent: "Deadline | None" = None) -> None:
+        self.budget_s = budget_s
+        self.parent = parent
+        self.started_at = time.monotonic()
+        self.expires_at = math.inf if budget_s is None else self.started_at + budget_s
+        self._cancelled = threading.Event()
+        self._reason = ""
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def remaining(self) -> float:
+        remaining = max(self.expires_at - time.monotonic(), 0.0)
+        if self.parent is not None:
+            remaining = min(remaining, self.parent.remaining())
+        return remaining
+
+    @property
+    def cancelled(self) -> bool:
+        if self._cancelled.is_set():
+            return True
+        return self.parent is not None and self.parent.cancelled
+
+    @property
+    def reason(self) -> str:
+        if self._cancelled.is_set():
+            return self._reason
+        return self.parent.reason if self.parent is not None else ""
+
+    def expired(self) -> bool:
+        return self.cancelled or self.remaining() <= 0
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        self._reason = reason
+        self._cancelled.set()
+
+    def check(self) -> None:
+        if self.cancelled:
+            raise CancelledError(f"Run cancelled: {self.reason}")
+        if self.remaining() <= 0:
+            raise LimitExceededError(
+                "max_runtime_s",
+                "Max runtime exceeded",
+                {"elapsed_s": round(self.elapsed(), 2)},
+                self.budget_s if self.budget_s is not None else math.inf,
+            )
+
+    def timeout(self, cap_s: float) -> float:
+        """Per-call timeout: the configured cap shrunk to the remaining budget."""
+        return max(min(cap_s, self.remaining()), 0.001)
+
+    def can_fit(self, seconds: float) -> bool:
+        return not self.cancelled and self.remaining() > seconds
+
+    def sleep(self, seconds: float) -> None:
+        end = time.monotonic() + min(seconds, self.remaining())
+        while True:
+            left = end - time.monotonic()
+            if left <= 0 or self.cancelled:
+                break
+            # Wake up periodically so a parent cancel is noticed too.
+            self._cancelled.wait(min(left, 0.1))
+        self.check()
@@ -24,3 +24,11 @@ class AIError(ScraparseError):
 
 class ValidationError(ScraparseError):
     pass
+
+
+class CancelledError(ScraparseError):
+    pass
+
+
+class ArtifactWriteError(ScraparseError):
+    pass
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+import json
+import threading
+import time
+
+EVENTS_FILENAME = "events.jsonl"
+
+_CURRENT_LOG: ContextVar["EventLog | None"] = ContextVar("scraparse_event_log", default=None)
+
+
+class EventLog:
+    """Append-only JSONL event stream for one run.
+
+    Each event is flushed as soon as it is written, so ``tail -f`` shows a
+    run while it is still going.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.origin = time.perf_counter()
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._handle = path.open("a", encoding="utf-8")
+
+    def emit(self, event_type: str, **fields: object) -> None:
+        with self._lock:
+            if self._handle.closed:
+                return
+            self._seq += 1
+            record = {
+                "seq": self._seq,
+                "t": round(time.perf_counter() - self.origin, 6),
+                "type": event_type,
+                **fields,
+            }
+            self._handle.write(json.dumps(record, default=str) + "\n")
+            self._handle.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._handle.close()
+
+
+def read_events(path: Path) -> Iterator[dict[str, object]]:
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # A crash can leave a half-written last line.
+                continue
+
+
+@dataclass
+class EventSummary:
+    """Constant-size aggregates folded from a run's event stream."""
+
+    pages_fetched: int = 0
+    page_bytes: int = 0
+    largest_page_bytes: int = 0
+    fetch_retries: int = 0
+    llm_calls: int = 0
+    llm_seconds: float = 0.0
+    validation_attempts: int = 0
+    validation_failures: int = 0
+    last_checkpoint: dict[str, object] | None = None
+    budget_stop: dict[str, object] | None = None
+
+    def add(self, event: dict[str, object]) -> None:
+        event_type = event.get("type")
+        if event_type == "page_fetched":
+            raw_size = event.get("bytes")
+            size = raw_size if isinstance(raw_size, int) else 0
+            self.pages_fetched += 1
+            self.page_bytes += size
+            self.largest_page_bytes = max(self.largest_page_bytes, size)
+        elif event_type == "fetch_retry":
+            self.fetch_retries += 1
+        elif event_type == "llm_call":
+            self.llm_calls += 1
+            self.llm_seconds += float(event.get("duration_s") or 0.0)  # type: ignore[arg-type]
+        elif event_type == "validation":
+            self.validation_attempts += 1
+            if event.get("errors"):
+                self.validation_failures += 1
+        elif event_type == "limit_checkpoint":
+            self.last_checkpoint = {
+                key: value for key, value in event.items() if key not in {"seq", "t", "type"}
+            }
+        elif event_type == "budget_stop":
+            self.budget_stop = {
+                key: value for key, value in event.items() if key not in {"seq", "t", "type"}
+            }
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "pages_fetched": self.pages_fetched,
+            "page_bytes": self.page_bytes,
+            "largest_page_bytes": self.largest_page_bytes,
+            "fetch_retries": self.fetch_retries,
+            "llm_calls": self.llm_calls,
+            "llm_seconds": round(self.llm_seconds, 6),
+            "validation_attempts": self.validation_attempts,
+            "validation_failures": self.validation_failures,
+            "last_checkpoint": self.last_checkpoint,
+            "budget_stop": self.budget_stop,
+        }
+
+
+def summarize_events(path: Path) -> EventSummary:
+    summary = EventSummary()
+    if path.exists():
+        for event in read_events(path):
+            summary.add(event)
+    return summary
+
+
+def current_log() -> EventLog | None:
+    return _CURRENT_LOG.get()
+
+
+@contextmanager
+def activate(log: EventLog | None) -> Iterator[EventLog | None]:
+    token = _CURRENT_LOG.set(log)
+    try:
+        yield log
+    finally:
+        _CURRENT_LOG.reset(token)
+
+
+def emit(event_type: str, **fields: object) -> None:
+    log = _CURRENT_LOG.get()
+    if log is not None:
+        log.emit(event_type, **fields)
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+import hashlib
+import json
+import sqlite3
+import threading
+
+from scraparse.core.util import now_utc_iso
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    source TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    parser_sha TEXT NOT NULL,
+    fieldnames TEXT NOT NULL,
+    rows TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+# Sources per IN (...) lookup; well under SQLite's bound-parameter limit.
+LOOKUP_BATCH = 500
+
+
+def parser_version(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class StoredRows:
+    fieldnames: list[str]
+    rows: list[dict[str, str]]
+
+
+class ExtractState:
+    """Rows last extracted from each input, keyed by content hash and parser version.
+
+    One state file belongs to one extraction job (by default it sits next
+    to the output). A page is parsed again only when its content hash or
+    the parser changed; otherwise its stored rows are reused.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def hashes(self, sources: list[str], parser_sha: str) -> dict[str, str]:
+        """Content hash of every source last parsed by this parser version."""
+        found: dict[str, str] = {}
+        with self._lock:
+            for start in range(0, len(sources), LOOKUP_BATCH):
+                batch = sources[start : start + LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                cursor = self._conn.execute(
+                    f"SELECT source, content_hash FROM pages WHERE parser_sha = ? "
+                    f"AND source IN ({placeholders})",
+                    (parser_sha, *batch),
+                )
+                found.update(cursor.fetchall())
+        return found
+
+    def rows(self, source: str) -> StoredRows | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fieldnames, rows FROM pages WHERE source = ?", (source,)
+            ).fetchone()
+        if row is None:
+            return None
+        return StoredRows(fieldnames=json.loads(row[0]), rows=json.loads(row[1]))
+
+    def store(
+        self,
+        entries: Iterable[tuple[str, str, list[str], list[dict[str, str]]]],
+        parser_sha: str,
+    ) -> None:
+        """Upsert ``(source, content_hash, fieldnames, rows)`` entries in one transaction."""
+        updated_at = now_utc_iso()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO pages (source, content_hash, parser_sha, fieldnames, rows, "
+                "updated_at) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (source) DO UPDATE SET content_hash = excluded.content_hash, "
+                "parser_sha = excluded.parser_sha, fieldnames = excluded.fieldnames, "
+                "rows = excluded.rows, updated_at = excluded.updated_at",
+                [
+                    (
+                        source,
+                        content_hash,
+                        parser_sha,
+                        json.dumps(fieldnames),
+                        json.dumps(rows),
+                        updated_at,
+                    )
+                    for source, content_hash, fieldnames, rows in entries
+                ],
+            )
+
+    def retain(self, sources: Iterable[str]) -> int:
+        """Drop entries for inputs that are gone; returns how many were removed."""
+        with self._lock, self._conn:
+            self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS seen (source TEXT PRIMARY KEY)")
+            self._conn.execute("DELETE FROM seen")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO seen (source) VALUES (?)",
+                ((source,) for source in sources),
+            )
+            cursor = self._conn.execute(
+                "DELETE FROM pages WHERE source NOT IN (SELECT source FROM seen)"
+            )
+            return cursor.rowcount
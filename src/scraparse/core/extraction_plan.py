@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import json
+
+from scraparse.core.models import FieldSchema
+from scraparse.core.normalizers import COMPATIBLE_NORMALIZERS, DEFAULT_NORMALIZER, NORMALIZERS
+
+PLAN_VERSION = 1
+# Pseudo-attributes: the element's text or its outer HTML instead of an attribute value.
+TEXT_ATTRIBUTE = "text"
+HTML_ATTRIBUTE = "html"
+
+
+@dataclass
+class FieldRule:
+    name: str
+    # CSS selector relative to the row; None means the row element itself.
+    selector: str | None
+    attribute: str = TEXT_ATTRIBUTE
+    normalizer: str = ""
+    # Join every match instead of taking the first one.
+    multiple: bool = False
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "name": self.name,
+            "selector": self.selector,
+            "attribute": self.attribute,
+            "normalizer": self.normalizer,
+            "multiple": self.multiple,
+        }
+
+
+@dataclass
+class ExtractionPlan:
+    """Declarative alternative to a generated parser.py.
+
+    ``row_selector`` picks one element per output row (None: one row per
+    document); each field rule selects inside that row.
+    """
+
+    row_selector: str | None
+    fields: list[FieldRule] = field(default_factory=list)
+    version: int = PLAN_VERSION
+
+    @property
+    def fieldnames(self) -> list[str]:
+        return [rule.name for rule in self.fields]
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "version": self.version,
+            "row_selector": self.row_selector,
+            "fields": [rule.to_dict() for rule in self.fields],
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    @staticmethod
+    def from_dict(data: object) -> "ExtractionPlan":
+        if not isinstance(data, dict):
+            raise ValueError("Plan must be a JSON object")
+        raw_fields = data.get("fields")
+        if not isinstance(raw_fields, list):
+            raise ValueError("Plan must include a 'fields' list")
+        rules: list[FieldRule] = []
+        for raw in raw_fields:
+            if not isinstance(raw, dict):
+                raise ValueError("Each plan field must be an object")
+            rules.append(
+                FieldRule(
+                    name=str(raw.get("name", "")).strip(),
+                    selector=_optional_selector(raw.get("selector")),
+                    attribute=str(raw.get("attribute") or TEXT_ATTRIBUTE).strip(),
+                    normalizer=str(raw.get("normalizer") or "").strip(),
+                    multiple=bool(raw.get("multiple", False)),
+                )
+            )
+        return ExtractionPlan(
+            row_selector=_optional_selector(data.get("row_selector")),
+            fields=rules,
+            version=int(data.get("version") or PLAN_VERSION),
+        )
+
+
+def _optional_selector(value: object) -> str | None:
+    if value is None:
+        return None
+    return str(value).strip() or None
+
+
+def load_plan(text: str) -> ExtractionPlan:
+    """Parse plan JSON, tolerating a Markdown code fence around it."""
+    stripped = text.strip()
+    if stripped.startswith("```"):
+        stripped = stripped.strip("`")
+        stripped = stripped.split("\n", 1)[1] if "\n" in stripped else ""
+    try:
+        data = json.loads(stripped)
+    except ValueError as exc:
+        raise ValueError(f"Plan is not valid JSON: {exc}") from exc
+    return ExtractionPlan.from_dict(data)
+
+
+def validate_plan(plan: ExtractionPlan, schema: FieldSchema) -> list[str]:
+    """Exact checks: every schema field covered once, selectors compile, types match."""
+    errors: list[str] = []
+    if plan.version != PLAN_VERSION:
+        errors.append(f"Unsupported plan version: {plan.version}")
+    if plan.row_selector is not None:
+        errors.extend(_selector_errors("row_selector", plan.row_selector))
+    types = {spec.name: spec.type for spec in schema.fields}
+    seen: set[str] = set()
+    for rule in plan.fields:
+        if rule.name in seen:
+            errors.append(f"Field '{rule.name}' appears more than once")
+            continue
+        seen.add(rule.name)
+        if rule.name not in types:
+            errors.append(f"Field '{rule.name}' is not in the schema")
+            continue
+        if rule.selector is not None:
+            errors.extend(_selector_errors(f"Field '{rule.name}'", rule.selector))
+        if not rule.attribute:
+            errors.append(f"Field '{rule.name}': attribute must not be empty")
+        normalizer = rule.normalizer or DEFAULT_NORMALIZER[types[rule.name]]
+        if normalizer not in NORMALIZERS:
+            errors.append(f"Field '{rule.name}': unknown normalizer '{normalizer}'")
+        elif normalizer not in COMPATIBLE_NORMALIZERS[types[rule.name]]:
+            allowed = ", ".join(sorted(COMPATIBLE_NORMALIZERS[types[rule.name]]))
+            errors.append(
+                f"Field '{rule.name}' ({types[rule.name]}): normalizer '{normalizer}' "
+                f"does not fit; use one of {allowed}"
+            )
+    for name in types:
+        if name not in seen:
+            errors.append(f"Schema field '{name}' has no rule in the plan")
+    return errors
+
+
+def _selector_errors(label: str, selector: str) -> list[str]:
+    import soupsieve
+
+    try:
+        soupsieve.compile(selector)
+    except (soupsieve.SelectorSyntaxError, ValueError, TypeError) as exc:
+        message = str(exc).splitlines()[0]
+        return [f"{label}: invalid selector '{selector}': {message}"]
+    return []
+
+
+def apply_defaults(plan: ExtractionPlan, schema: FieldSchema) -> ExtractionPlan:
+    """Fill in each rule's type-default normalizer so a saved plan stands alone."""
+    types = {spec.name: spec.type for spec in schema.fields}
+    for rule in plan.fields:
+        if not rule.normalizer and rule.name in types:
+            rule.normalizer = DEFAULT_NORMALIZER[types[rule.name]]
+    return plan
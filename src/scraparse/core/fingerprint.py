@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from urllib.parse import parse_qsl, urlparse
+import hashlib
+import re
+
+SIMHASH_BITS = 64
+# Eight 8-bit LSH bands: shapes within 7 differing bits always share a band.
+LSH_BANDS = 8
+LSH_BAND_BITS = 8
+MAX_DEPTH = 14
+# The page skeleton shows up early; very long tails add no new paths.
+MAX_SHAPE_CHARS = 400_000
+PATH_WINDOW = 3
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+_NUMERIC = re.compile(r"^\d+$")
+_HEXISH = re.compile(r"^[0-9a-f]{8,}$|^[0-9a-f-]{32,36}$", re.IGNORECASE)
+_SLUG_WITH_ID = re.compile(r"^[a-z0-9]+(?:[-_][a-z0-9]+)*[-_]\d+(?:\.[a-z]+)?$", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class PageFingerprint:
+    host: str
+    url_template: str
+    shape: int  # 64-bit simhash of the DOM path shape
+
+    def distance(self, other_shape: int) -> int:
+        return hamming(self.shape, other_shape)
+
+
+def url_template(url: str) -> str:
+    """Collapse ids in a URL path so pages of one template share a key."""
+    parts = urlparse(url)
+    segments: list[str] = []
+    for segment in parts.path.split("/"):
+        if not segment:
+            continue
+        if _NUMERIC.match(segment):
+            segments.append("{n}")
+        elif _HEXISH.match(segment):
+            segments.append("{id}")
+        elif _SLUG_WITH_ID.match(segment):
+            segments.append("{slug}")
+        else:
+            segments.append(segment.lower())
+    template = "/" + "/".join(segments)
+    keys = sorted({key for key, _ in parse_qsl(parts.query, keep_blank_values=True)})
+    if keys:
+        template += "?" + "&".join(f"{key}=" for key in keys)
+    return template
+
+
+class _ShapeCollector(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=False)
+        self.stack: list[str] = []
+        self.features: set[str] = set()
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        label = tag
+        for name, value in attrs:
+            if name == "class" and value:
+                label = f"{tag}.{value.split()[0]}"
+                break
+        if len(self.stack) < MAX_DEPTH:
+            self.features.add(">".join([*self.stack[-(PATH_WINDOW - 1):], label]))
+        if tag not in VOID_TAGS:
+            self.stack.append(label)
+
+    def handle_endtag(self, tag: str) -> None:
+        # Pop back to the matching open tag; stray end tags are ignored.
+        for idx in range(len(self.stack) - 1, -1, -1):
+            if self.stack[idx].split(".", 1)[0] == tag:
+                del self.stack[idx:]
+                return
+
+
+def dom_shape(html: str) -> int:
+    collector = _ShapeCollector()
+    collector.feed(html)
+    collector.close()
+    return simhash(collector.features)
+
+
+def simhash(features: set[str]) -> int:
+    weights = [0] * SIMHASH_BITS
+    for feature in features:
+        raw = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        digest = int.from_bytes(raw, "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if digest >> bit & 1 else -1
+    value = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            value |= 1 << bit
+    return value
+
+
+def lsh_bands(shape: int) -> list[int]:
+    mask = (1 << LSH_BAND_BITS) - 1
+    return [shape >> (band * LSH_BAND_BITS) & mask for band in range(LSH_BANDS)]
+
+
+def hamming(left: int, right: int) -> int:
+    return bin(left ^ right).count("1")
+
+
+def fingerprint(url: str, html: str) -> PageFingerprint:
+    return PageFingerprint(
+        host=urlparse(url).netloc.lower(),
+        url_template=url_template(url),
+        shape=dom_shape(html),
+    )
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from contextvars import ContextVar
+from dataclasses import dataclass
+from urllib.parse import urlparse
+import threading
 import time
 
+from scraparse.core.deadline import Deadline
 from scraparse.core.errors import LimitExceededError
+from scraparse.core.events import emit
 
 
 @dataclass(frozen=True)
@@ -28,9 +33,20 @@ class Limits:
     max_response_bytes: int = 2_000_000
     max_total_bytes: int = 15_000_000
     max_runtime_s: int = 180
+    # Per-host budgets (0 disables the check)
+    max_pages_per_host: int = 0
+    max_bytes_per_host: int = 0
+    max_concurrent_fetches: int = 1
+    # Stop discovery and keep fetched pages when a page/byte budget runs out
+    budget_stop: bool = True
+
+    # Fetched bodies kept in RAM per run; the rest spill to a temp file
+    page_store_ram_bytes: int = 32_000_000
 
     # LLM payload limits
     max_html_chars_for_llm: int = 150_000
+    max_prompt_tokens_for_llm: int = 100_000
+    reserve_output_tokens_for_llm: int = 8_000
 
     def with_overrides(self, overrides: dict[str, object]) -> "Limits":
         values = {**self.__dict__}
@@ -46,63 +62,184 @@ class Limits:
         return dict(self.__dict__)
 
 
+# Limits that end discovery early (keeping fetched pages) when budget_stop is on.
+BUDGET_LIMITS = frozenset(
+    {
+        "max_pages",
+        "max_total_bytes",
+        "max_pages_per_host",
+        "max_bytes_per_host",
+        "batch_max_total_bytes",
+    }
+)
+PER_HOST_LIMITS = frozenset({"max_pages_per_host", "max_bytes_per_host"})
+
+
 @dataclass
-class LimitTracker:
-    limits: Limits
-    start_time_s: float = field(default_factory=time.time)
-    pages_fetched: int = 0
-    total_bytes: int = 0
-    consecutive_failures: int = 0
-    current_page_bytes: int = 0
+class PageBudget:
+    """Byte accounting for a single in-flight request."""
 
-    def check_runtime(self) -> None:
-        elapsed = time.time() - self.start_time_s
-        if elapsed > self.limits.max_runtime_s:
-            raise LimitExceededError(
-                "max_runtime_s",
-                "Max runtime exceeded",
-                {"elapsed_s": round(elapsed, 2)},
-                self.limits.max_runtime_s,
-            )
+    url: str
+    host: str
+    bytes: int = 0
+    open: bool = True
 
-    def start_page(self) -> None:
-        if self.pages_fetched >= self.limits.max_pages:
-            raise LimitExceededError(
-                "max_pages",
-                "Max pages exceeded",
-                {"pages_fetched": self.pages_fetched},
-                self.limits.max_pages,
-            )
-        self.current_page_bytes = 0
 
-    def add_bytes(self, count: int) -> None:
-        self.current_page_bytes += count
-        self.total_bytes += count
-        if self.current_page_bytes > self.limits.max_response_bytes:
-            raise LimitExceededError(
-                "max_response_bytes",
-                "Max response bytes exceeded",
-                {"response_bytes": self.current_page_bytes},
-                self.limits.max_response_bytes,
-            )
-        if self.total_bytes > self.limits.max_total_bytes:
-            raise LimitExceededError(
-                "max_total_bytes",
-                "Max total bytes exceeded",
-                {"total_bytes": self.total_bytes},
-                self.limits.max_total_bytes,
-            )
+_CURRENT_PAGE: ContextVar[PageBudget | None] = ContextVar("scraparse_page", default=None)
 
-    def finish_page(self) -> None:
-        self.pages_fetched += 1
+
+class LimitTracker:
+    """Run-wide limit accounting, safe to share between fetch threads.
+
+    Every counter is updated under one lock. Each request gets its own
+    ``PageBudget`` from ``start_page``; callers that do not pass it back
+    explicitly use the one started last in the current context.
+    """
+
+    def __init__(self, limits: Limits, parent_deadline: Deadline | None = None) -> None:
+        self.limits = limits
+        self.deadline = Deadline(limits.max_runtime_s, parent=parent_deadline)
+        self.start_time_s = time.monotonic()
+        self.pages_fetched = 0
+        self.pages_in_flight = 0
+        self.total_bytes = 0
         self.consecutive_failures = 0
+        self.host_pages: dict[str, int] = {}
+        self.host_bytes: dict[str, int] = {}
+        self._host_in_flight: dict[str, int] = {}
+        self.truncation: LimitExceededError | None = None
+        self._lock = threading.Lock()
 
-    def record_failure(self) -> None:
-        self.consecutive_failures += 1
-        if self.consecutive_failures > self.limits.max_consecutive_failures:
+    @property
+    def current_page_bytes(self) -> int:
+        page = _CURRENT_PAGE.get()
+        return page.bytes if page is not None else 0
+
+    def elapsed_s(self) -> float:
+        return time.monotonic() - self.start_time_s
+
+    def check_runtime(self) -> None:
+        self.deadline.check()
+
+    def start_page(self, url: str = "") -> PageBudget:
+        host = urlparse(url).netloc
+        with self._lock:
+            reserved = self.pages_fetched + self.pages_in_flight
+            if reserved >= self.limits.max_pages:
+                raise LimitExceededError(
+                    "max_pages",
+                    "Max pages exceeded",
+                    {"pages_fetched": self.pages_fetched, "pages_in_flight": self.pages_in_flight},
+                    self.limits.max_pages,
+                )
+            host_reserved = self.host_pages.get(host, 0) + self._host_in_flight.get(host, 0)
+            if self.limits.max_pages_per_host and host_reserved >= self.limits.max_pages_per_host:
+                raise LimitExceededError(
+                    "max_pages_per_host",
+                    f"Max pages for host {host or 'unknown'} exceeded",
+                    {"host_pages": self.host_pages.get(host, 0)},
+                    self.limits.max_pages_per_host,
+                )
+            self.pages_in_flight += 1
+            self._host_in_flight[host] = self._host_in_flight.get(host, 0) + 1
+        page = PageBudget(url=url, host=host)
+        _CURRENT_PAGE.set(page)
+        return page
+
+    def add_bytes(self, count: int, page: PageBudget | None = None) -> None:
+        page = page or self._current_page()
+        with self._lock:
+            page.bytes += count
+            self.total_bytes += count
+            host_bytes = self.host_bytes.get(page.host, 0) + count
+            self.host_bytes[page.host] = host_bytes
+            error: LimitExceededError | None = None
+            if page.bytes > self.limits.max_response_bytes:
+                error = LimitExceededError(
+                    "max_response_bytes",
+                    "Max response bytes exceeded",
+                    {"response_bytes": page.bytes},
+                    self.limits.max_response_bytes,
+                )
+            elif self.total_bytes > self.limits.max_total_bytes:
+                error = LimitExceededError(
+                    "max_total_bytes",
+                    "Max total bytes exceeded",
+                    {"total_bytes": self.total_bytes},
+                    self.limits.max_total_bytes,
+                )
+            elif self.limits.max_bytes_per_host and host_bytes > self.limits.max_bytes_per_host:
+                error = LimitExceededError(
+                    "max_bytes_per_host",
+                    f"Max bytes for host {page.host or 'unknown'} exceeded",
+                    {"host_bytes": host_bytes},
+                    self.limits.max_bytes_per_host,
+                )
+            if error is not None:
+                self._release(page)
+                raise error
+
+    def finish_page(self, page: PageBudget | None = None) -> None:
+        page = page or self._current_page()
+        with self._lock:
+            if not page.open:
+                return
+            self._release(page)
+            self.pages_fetched += 1
+            self.host_pages[page.host] = self.host_pages.get(page.host, 0) + 1
+            self.consecutive_failures = 0
+
+    def record_failure(self, page: PageBudget | None = None) -> None:
+        page = page or _CURRENT_PAGE.get()
+        with self._lock:
+            if page is not None:
+                self._release(page)
+            self.consecutive_failures += 1
+            failures = self.consecutive_failures
+        if failures > self.limits.max_consecutive_failures:
             raise LimitExceededError(
                 "max_consecutive_failures",
                 "Max consecutive failures exceeded",
-                {"consecutive_failures": self.consecutive_failures},
+                {"consecutive_failures": failures},
                 self.limits.max_consecutive_failures,
             )
+
+    def stop_on_budget(self, exc: LimitExceededError, has_results: bool = True) -> bool:
+        """Record ``exc`` as a truncation if discovery should stop instead of failing."""
+        if not self.limits.budget_stop or not has_results:
+            return False
+        if exc.limit_name not in BUDGET_LIMITS:
+            return False
+        with self._lock:
+            first = self.truncation is None
+            if first:
+                self.truncation = exc
+        if first:
+            emit("budget_stop", limit_name=exc.limit_name, message=str(exc), limit=exc.limit)
+        return True
+
+    def snapshot(self) -> dict[str, object]:
+        with self._lock:
+            return {
+                "pages_fetched": self.pages_fetched,
+                "pages_in_flight": self.pages_in_flight,
+                "total_bytes": self.total_bytes,
+                "consecutive_failures": self.consecutive_failures,
+                "host_pages": dict(self.host_pages),
+                "host_bytes": dict(self.host_bytes),
+                "elapsed_s": round(self.elapsed_s(), 3),
+            }
+
+    def _current_page(self) -> PageBudget:
+        page = _CURRENT_PAGE.get()
+        if page is None:
+            raise RuntimeError("No page in progress; call start_page() first")
+        return page
+
+    def _release(self, page: PageBudget) -> None:
+        # Caller holds the lock.
+        if not page.open:
+            return
+        page.open = False
+        self.pages_in_flight -= 1
+        self._host_in_flight[page.host] -= 1
@@ -2,10 +2,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from typing import Literal, Optional
+import hashlib
 
 from scraparse.core.util import snake_case
 from scraparse.core.limits import Limits
 
+# What a run generates: a Python parser script or a declarative extraction plan.
+OUTPUT_MODES = {"script", "plan"}
 FieldType = Literal["string", "number", "money", "date", "url", "boolean"]
 ALLOWED_FIELD_TYPES: set[str] = {"string", "number", "money", "date", "url", "boolean"}
 
@@ -88,6 +91,11 @@ class RunSpec:
     limits: Limits
     next_selector: Optional[str] = None
     detail_selector: Optional[str] = None
+    schema: Optional[FieldSchema] = None
+    profile: bool = False
+    trace: bool = False
+    force_regenerate: bool = False
+    output_mode: str = "script"
 
 
 @dataclass
@@ -97,6 +105,27 @@ class FetchResult:
     content_text: str
     status_code: int
     content_type: str
+    encoding: str = "utf-8"
+
+    @property
+    def size(self) -> int:
+        return len(self.content_bytes)
+
+    @property
+    def content_hash(self) -> str:
+        """sha256 of the body, computed on first use and then kept."""
+        cached = self.__dict__.get("_content_hash")
+        if cached is None:
+            cached = hashlib.sha256(self.content_bytes).hexdigest()
+            self.__dict__["_content_hash"] = cached
+        return cached
+
+    @property
+    def char_count(self) -> int:
+        return len(self.content_text)
+
+    def read_text(self, max_chars: int | None = None) -> str:
+        return self.content_text if max_chars is None else self.content_text[:max_chars]
 
 
 @dataclass
@@ -106,3 +135,5 @@ class RunOutcome:
     report_path: str
     fetched_urls: list[str]
     errors: list[str]
+    bytes_total: int = 0
+    profile_summary: list[str] = field(default_factory=list)
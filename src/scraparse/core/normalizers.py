@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Callable
+from urllib.parse import urljoin
+import re
+
+# Value normalizers shared by extraction plans. Each takes the raw extracted
+# string and the page URL and returns the cleaned string ("" when unusable).
+Normalizer = Callable[[str, str], str]
+
+_WHITESPACE = re.compile(r"\s+")
+_NUMBER = re.compile(r"[-+]?\d[\d,.\s ']*")
+_TRUE_WORDS = {"true", "yes", "y", "1", "on"}
+_FALSE_WORDS = {"false", "no", "n", "0", "off"}
+# Checked as phrases inside longer text, negative first ("unavailable" contains "available").
+_FALSE_PHRASES = re.compile(
+    r"\b(?:out of stock|sold out|unavailable|not available|not in stock|no longer available"
+    r"|discontinued)\b"
+)
+_TRUE_PHRASES = re.compile(r"\b(?:in stock|available)\b")
+_PUNCTUATION = re.compile(r"[^\w\s]+")
+DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y/%m/%d",
+    "%d %B %Y",
+    "%d %b %Y",
+    "%B %d, %Y",
+    "%b %d, %Y",
+    "%d.%m.%Y",
+    # Ambiguous with each other; per value the first wins, per column inference decides.
+    "%m/%d/%Y",
+    "%d/%m/%Y",
+)
+CURRENCY_SYMBOLS = {"$": "USD", "€": "EUR", "£": "GBP", "¥": "JPY", "₹": "INR", "₩": "KRW"}
+_CURRENCY_CODE = re.compile(r"\b([A-Z]{3})\b")
+
+
+def normalize_text(value: str, base_url: str = "") -> str:
+    return _WHITESPACE.sub(" ", value).strip()
+
+
+def normalize_number(value: str, base_url: str = "") -> str:
+    match = _NUMBER.search(value)
+    if match is None:
+        return ""
+    raw = re.sub(r"[\s ']", "", match.group()).rstrip(".,")
+    if "," in raw and "." in raw:
+        # Whichever separator comes last is the decimal point.
+        if raw.rfind(",") > raw.rfind("."):
+            raw = raw.replace(".", "").replace(",", ".")
+        else:
+            raw = raw.replace(",", "")
+    elif "," in raw:
+        head, _, tail = raw.rpartition(",")
+        raw = f"{head.replace(',', '')}.{tail}" if len(tail) != 3 else raw.replace(",", "")
+    return raw
+
+
+def normalize_money(value: str, base_url: str = "") -> str:
+    return normalize_number(value)
+
+
+def parse_money(value: str) -> tuple[str, str]:
+    """Split a price into (amount, ISO currency code); either may be ""."""
+    currency = ""
+    code = _CURRENCY_CODE.search(value)
+    if code is not None:
+        currency = code.group(1)
+    else:
+        for symbol, iso in CURRENCY_SYMBOLS.items():
+            if symbol in value:
+                currency = iso
+                break
+    return normalize_number(value), currency
+
+
+def normalize_date(value: str, base_url: str = "") -> str:
+    text = normalize_text(value)
+    candidate = text[:19] if re.match(r"\d{4}-\d{2}-\d{2}T", text) else text
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(candidate, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return text
+
+
+def normalize_url(value: str, base_url: str = "") -> str:
+    text = value.strip()
+    return urljoin(base_url, text) if text else ""
+
+
+def normalize_boolean(value: str, base_url: str = "") -> str:
+    text = normalize_text(_PUNCTUATION.sub(" ", value)).lower()
+    if text in _FALSE_WORDS or _FALSE_PHRASES.search(text):
+        return "false"
+    if text in _TRUE_WORDS or _TRUE_PHRASES.search(text):
+        return "true"
+    # Unrecognized text is not a boolean; guessing "true" would hide "Out of stock!" variants.
+    return ""
+
+
+def normalize_none(value: str, base_url: str = "") -> str:
+    return value
+
+
+NORMALIZERS: dict[str, Normalizer] = {
+    "text": normalize_text,
+    "number": normalize_number,
+    "money": normalize_money,
+    "date": normalize_date,
+    "url": normalize_url,
+    "boolean": normalize_boolean,
+    "none": normalize_none,
+}
+# Normalizer used when a plan leaves it out, and the ones a field type accepts.
+DEFAULT_NORMALIZER = {
+    "string": "text",
+    "number": "number",
+    "money": "money",
+    "date": "date",
+    "url": "url",
+    "boolean": "boolean",
+}
+COMPATIBLE_NORMALIZERS = {
+    "string": {"text", "none"},
+    "number": {"number", "text"},
+    "money": {"money", "number", "text"},
+    "date": {"date", "text"},
+    "url": {"url", "text"},
+    "boolean": {"boolean", "text"},
+}
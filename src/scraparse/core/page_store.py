@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import BinaryIO
+import io
+import os
+import tempfile
+import threading
+
+from scraparse.core.models import FetchResult
+
+
+class PageStore:
+    """Holds fetched bodies for one run with bounded memory.
+
+    Bodies stay in RAM until ``ram_limit_bytes`` is used up; later ones are
+    appended to an anonymous temp file and read back on demand. ``add``
+    returns a ``StoredPage`` that loads its body lazily, so callers can keep
+    a list of pages without keeping their contents resident.
+    """
+
+    def __init__(self, ram_limit_bytes: int, spill_dir: Path | None = None) -> None:
+        self.ram_limit_bytes = ram_limit_bytes
+        self.spill_dir = spill_dir
+        self.ram_bytes = 0
+        self.spilled_bytes = 0
+        self.spilled_pages = 0
+        self._ram: dict[int, bytes] = {}
+        self._segments: dict[int, tuple[int, int]] = {}
+        self._spill: BinaryIO | None = None
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def add(self, result: FetchResult) -> "StoredPage":
+        body = result.content_bytes
+        with self._lock:
+            page_id = self._next_id
+            self._next_id += 1
+            if self.ram_bytes + len(body) <= self.ram_limit_bytes:
+                self._ram[page_id] = body
+                self.ram_bytes += len(body)
+            else:
+                spill = self._spill_file()
+                offset = spill.seek(0, os.SEEK_END)
+                spill.write(body)
+                spill.flush()
+                self._segments[page_id] = (offset, len(body))
+                self.spilled_bytes += len(body)
+                self.spilled_pages += 1
+        return StoredPage(
+            store=self,
+            page_id=page_id,
+            url=result.url,
+            status_code=result.status_code,
+            content_type=result.content_type,
+            encoding=result.encoding,
+            size=len(body),
+            char_count=len(result.content_text),
+            content_hash=result.content_hash,
+        )
+
+    def open(self, page_id: int) -> BinaryIO:
+        """Return a binary stream over one body without copying it whole."""
+        with self._lock:
+            body = self._ram.get(page_id)
+            segment = self._segments.get(page_id)
+        if body is not None:
+            return io.BytesIO(body)
+        if segment is None or self._spill is None:
+            raise KeyError(f"Unknown page {page_id}")
+        offset, length = segment
+        return io.BufferedReader(_SegmentReader(self, offset, length))
+
+    def read_bytes(self, page_id: int) -> bytes:
+        with self.open(page_id) as stream:
+            return stream.read()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "pages": self._next_id,
+                "ram_bytes": self.ram_bytes,
+                "spilled_bytes": self.spilled_bytes,
+                "spilled_pages": self.spilled_pages,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._ram.clear()
+            self._segments.clear()
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+
+    def __enter__(self) -> "PageStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:  # type: ignore[no-untyped-def]
+        self.close()
+
+    def _spill_file(self) -> BinaryIO:
+        # Caller holds the lock.
+        if self._spill is None:
+            self._spill = tempfile.TemporaryFile(dir=self.spill_dir, prefix="scraparse-pages-")
+        return self._spill
+
+    def _read_at(self, offset: int, size: int) -> bytes:
+        spill = self._spill
+        if spill is None:
+            raise ValueError("Page store is closed")
+        if hasattr(os, "pread"):
+            return os.pread(spill.fileno(), size, offset)
+        with self._lock:
+            spill.seek(offset)
+            return spill.read(size)
+
+
+class _SegmentReader(io.RawIOBase):
+    def __init__(self, store: PageStore, offset: int, length: int) -> None:
+        self._store = store
+        self._offset = offset
+        self._end = offset + length
+        self._position = offset
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:  # type: ignore[no-untyped-def]
+        size = min(len(buffer), self._end - self._position)
+        if size <= 0:
+            return 0
+        data = self._store._read_at(self._position, size)
+        buffer[: len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+
+class StoredPage(FetchResult):
+    """A ``FetchResult`` whose body lives in a ``PageStore``."""
+
+    def __init__(
+        self,
+        store: PageStore,
+        page_id: int,
+        url: str,
+        status_code: int,
+        content_type: str,
+        encoding: str,
+        size: int,
+        char_count: int,
+        content_hash: str | None = None,
+    ) -> None:
+        # FetchResult.__init__ is skipped on purpose: the body is never held here.
+        self.store = store
+        self.page_id = page_id
+        self.url = url
+        self.status_code = status_code
+        self.content_type = content_type
+        self.encoding = encoding
+        self._size = size
+        self._char_count = char_count
+        if content_hash is not None:
+            self._content_hash = content_hash
+
+    @property  # type: ignore[override]
+    def content_bytes(self) -> bytes:
+        return self.store.read_bytes(self.page_id)
+
+    @property  # type: ignore[override]
+    def content_text(self) -> str:
+        return self.content_bytes.decode(self.encoding, errors="replace")
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def char_count(self) -> int:
+        return self._char_count
+
+    def read_text(self, max_chars: int | None = None) -> str:
+        if max_chars is None:
+            return self.content_text
+        stream = io.TextIOWrapper(
+            self.store.open(self.page_id), encoding=self.encoding, errors="replace"
+        )
+        with stream:
+            return stream.read(max_chars)
+
+    def __repr__(self) -> str:
+        return f"StoredPage(url={self.url!r}, size={self._size}, status_code={self.status_code})"
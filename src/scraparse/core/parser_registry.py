@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+import hashlib
+import json
+import sqlite3
+import threading
+
+from scraparse.core.fingerprint import LSH_BANDS, PageFingerprint, hamming, lsh_bands
+from scraparse.core.util import now_utc_iso
+
+# Shapes further apart than this are not offered unless the URL template matches.
+MAX_SHAPE_DISTANCE = 12
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    prompt_key TEXT NOT NULL,
+    host TEXT NOT NULL,
+    url_template TEXT NOT NULL,
+    shape INTEGER NOT NULL,
+    parser_sha TEXT NOT NULL,
+    schema_json TEXT NOT NULL,
+    parser TEXT NOT NULL,
+    fill_rate REAL NOT NULL,
+    run_id TEXT,
+    created_at TEXT NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (prompt_key, host, url_template, shape, parser_sha)
+);
+CREATE TABLE IF NOT EXISTS shape_bands (
+    entry_id INTEGER NOT NULL REFERENCES entries(id) ON DELETE CASCADE,
+    band INTEGER NOT NULL,
+    value INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_template ON entries(prompt_key, host, url_template);
+CREATE INDEX IF NOT EXISTS shape_bands_lookup ON shape_bands(band, value, entry_id);
+"""
+
+
+@dataclass
+class RegistryEntry:
+    entry_id: int
+    host: str
+    url_template: str
+    shape: int
+    schema: dict[str, object]
+    parser: str
+    fill_rate: float
+    run_id: str
+    distance: int = 0
+
+
+class ParserRegistry:
+    """Validated parsers indexed by page fingerprint, shared by every run.
+
+    Lookups are narrowed with SQLite indexes: exact URL-template matches
+    and LSH bands of the DOM shape simhash. Only those candidates are
+    compared bit by bit, so the cost does not grow with the registry size.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def register(
+        self,
+        page_print: PageFingerprint,
+        prompt_key: str,
+        schema: dict[str, object],
+        parser: str,
+        fill_rate: float,
+        run_id: str,
+    ) -> None:
+        parser_sha = hashlib.sha256(parser.encode("utf-8")).hexdigest()
+        shape = _to_signed(page_print.shape)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO entries (prompt_key, host, url_template, shape, parser_sha, "
+                "schema_json, parser, fill_rate, run_id, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (prompt_key, host, url_template, shape, parser_sha) "
+                "DO UPDATE SET fill_rate = excluded.fill_rate, run_id = excluded.run_id",
+                (
+                    prompt_key,
+                    page_print.host,
+                    page_print.url_template,
+                    shape,
+                    parser_sha,
+                    json.dumps(schema, sort_keys=True),
+                    parser,
+                    fill_rate,
+                    run_id,
+                    now_utc_iso(),
+                ),
+            )
+            # lastrowid is stale after an upsert that updated, so look the row up.
+            (entry_id,) = self._conn.execute(
+                "SELECT id FROM entries WHERE prompt_key = ? AND host = ? AND url_template = ? "
+                "AND shape = ? AND parser_sha = ?",
+                (prompt_key, page_print.host, page_print.url_template, shape, parser_sha),
+            ).fetchone()
+            existing = self._conn.execute(
+                "SELECT 1 FROM shape_bands WHERE entry_id = ? LIMIT 1", (entry_id,)
+            ).fetchone()
+            if existing is None:
+                self._conn.executemany(
+                    "INSERT INTO shape_bands (entry_id, band, value) VALUES (?, ?, ?)",
+                    [
+                        (entry_id, band, value)
+                        for band, value in enumerate(lsh_bands(page_print.shape))
+                    ],
+                )
+
+    def candidates(
+        self, page_print: PageFingerprint, prompt_key: str, limit: int = 3
+    ) -> list[RegistryEntry]:
+        """Entries for the same prompt and host, closest DOM shape first."""
+        bands = lsh_bands(page_print.shape)
+        band_clause = " OR ".join("(band = ? AND value = ?)" for _ in range(LSH_BANDS))
+        params: list[object] = [prompt_key, page_print.host, page_print.url_template, prompt_key]
+        params.append(page_print.host)
+        for band, value in enumerate(bands):
+            params.extend((band, value))
+        sql = (
+            "SELECT id, host, url_template, shape, schema_json, parser, fill_rate, run_id "
+            "FROM entries WHERE prompt_key = ? AND host = ? AND url_template = ? "
+            "UNION "
+            "SELECT id, host, url_template, shape, schema_json, parser, fill_rate, run_id "
+            "FROM entries WHERE prompt_key = ? AND host = ? AND id IN "
+            f"(SELECT entry_id FROM shape_bands WHERE {band_clause})"
+        )
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        entries: list[RegistryEntry] = []
+        for row in rows:
+            shape = _to_unsigned(row[3])
+            distance = hamming(page_print.shape, shape)
+            if row[2] != page_print.url_template and distance > MAX_SHAPE_DISTANCE:
+                continue
+            entries.append(
+                RegistryEntry(
+                    entry_id=row[0],
+                    host=row[1],
+                    url_template=row[2],
+                    shape=shape,
+                    schema=json.loads(row[4]),
+                    parser=row[5],
+                    fill_rate=row[6],
+                    run_id=row[7] or "",
+                    distance=distance,
+                )
+            )
+        entries.sort(
+            key=lambda entry: (
+                entry.url_template != page_print.url_template,
+                entry.distance,
+                -entry.fill_rate,
+            )
+        )
+        return entries[:limit]
+
+    def record_hit(self, entry_id: int) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE entries SET hits = hits + 1 WHERE id = ?", (entry_id,))
+
+
+def _to_signed(value: int) -> int:
+    # SQLite integers are signed 64-bit.
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _to_unsigned(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+import csv
+import io
+import subprocess
+import sys
+import tempfile
+
+from scraparse.core.errors import ValidationError
+from scraparse.core.models import FetchResult, FieldSchema
+
+PARSER_TIMEOUT_S = 60.0
+# Share of rows that must fill every required field for a cached parser to be reused.
+REQUIRED_FILL_RATE = 0.8
+
+
+@dataclass
+class ParserCheck:
+    rows: int
+    fill_rates: dict[str, float] = field(default_factory=dict)
+    problems: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.problems
+
+    @property
+    def score(self) -> float:
+        """Lowest required-field fill rate; 1.0 when the schema requires nothing."""
+        if not self.rows:
+            return 0.0
+        return min(self.fill_rates.values(), default=1.0)
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "rows": self.rows,
+            "fill_rates": {name: round(rate, 3) for name, rate in self.fill_rates.items()},
+            "score": round(self.score, 3),
+            "problems": self.problems,
+        }
+
+
+def run_parser(
+    script_path: Path, html_paths: list[Path], timeout_s: float = PARSER_TIMEOUT_S
+) -> list[dict[str, str]]:
+    """Run a generated parser in a subprocess and parse the CSV it prints."""
+    with tempfile.TemporaryDirectory(prefix="scraparse-parser-") as workdir:
+        try:
+            completed = subprocess.run(
+                [sys.executable, str(script_path.resolve()), *map(str, html_paths)],
+                cwd=workdir,
+                capture_output=True,
+                timeout=timeout_s,
+                check=False,
+            )
+        except subprocess.TimeoutExpired as exc:
+            raise ValidationError(f"Parser timed out after {timeout_s:.0f}s") from exc
+    if completed.returncode != 0:
+        stderr = completed.stderr.decode("utf-8", errors="replace").strip().splitlines()
+        detail = stderr[-1] if stderr else f"exit code {completed.returncode}"
+        raise ValidationError(f"Parser failed: {detail}")
+    text = completed.stdout.decode("utf-8", errors="replace")
+    return list(csv.DictReader(io.StringIO(text)))
+
+
+def check_parser(
+    script_path: Path,
+    pages: list[FetchResult],
+    schema: FieldSchema,
+    timeout_s: float = PARSER_TIMEOUT_S,
+    min_fill_rate: float = REQUIRED_FILL_RATE,
+) -> ParserCheck:
+    """Run ``script_path`` on ``pages`` and report how well required fields are filled."""
+    with tempfile.TemporaryDirectory(prefix="scraparse-pages-") as tmp:
+        html_paths: list[Path] = []
+        for idx, page in enumerate(pages, start=1):
+            path = Path(tmp) / f"{idx}.html"
+            path.write_bytes(page.content_bytes)
+            html_paths.append(path)
+        try:
+            rows = run_parser(script_path, html_paths, timeout_s)
+        except ValidationError as exc:
+            return ParserCheck(rows=0, problems=[str(exc)])
+    return score_rows(rows, schema, min_fill_rate)
+
+
+def score_rows(
+    rows: list[dict[str, str]], schema: FieldSchema, min_fill_rate: float = REQUIRED_FILL_RATE
+) -> ParserCheck:
+    check = ParserCheck(rows=len(rows))
+    if not rows:
+        check.problems.append("Parser produced no rows")
+        return check
+    for spec in schema.fields:
+        if not spec.required:
+            continue
+        filled = sum(1 for row in rows if (row.get(spec.name) or "").strip())
+        rate = filled / len(rows)
+        check.fill_rates[spec.name] = rate
+        if rate < min_fill_rate:
+            check.problems.append(
+                f"Required field '{spec.name}' filled in {filled}/{len(rows)} rows"
+            )
+    return check
+
+
+def call_parser_main(main: Callable[[], object], script_name: str, html_path: str) -> str:
+    """Call an already imported parser's ``main()`` on one file and return its CSV."""
+    buffer = io.StringIO()
+    saved_argv = sys.argv
+    sys.argv = [script_name, html_path]
+    try:
+        with redirect_stdout(buffer):
+            main()
+    except SystemExit as exc:
+        if exc.code not in (None, 0):
+            raise ValidationError(f"Parser exited with code {exc.code}") from exc
+    finally:
+        sys.argv = saved_argv
+    return buffer.getvalue()
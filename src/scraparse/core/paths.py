@@ -6,3 +6,27 @@ from pathlib import Path
 
 def templates_dir() -> Path:
     return Path(resources.files("scraparse") / "templates")
+
+
+def cache_dir() -> Path:
+    return Path(".scraparse") / "cache"
+
+
+def blobs_dir() -> Path:
+    return Path(".scraparse") / "blobs"
+
+
+def run_store_path() -> Path:
+    return Path(".scraparse") / "runs.sqlite"
+
+
+def memo_dir() -> Path:
+    return Path(".scraparse") / "memo"
+
+
+def registry_path() -> Path:
+    return Path(".scraparse") / "registry.sqlite"
+
+
+def bench_dir() -> Path:
+    return Path(".scraparse") / "bench"
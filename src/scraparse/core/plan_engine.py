@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.element import Tag
+import soupsieve
+
+try:  # optional: a faster tree builder for BeautifulSoup
+    import lxml  # noqa: F401
+
+    DEFAULT_FEATURES = "lxml"
+except ImportError:
+    DEFAULT_FEATURES = "html.parser"
+
+from scraparse.core.extraction_plan import HTML_ATTRIBUTE, TEXT_ATTRIBUTE, ExtractionPlan
+from scraparse.core.normalizers import NORMALIZERS, Normalizer
+
+MULTIPLE_SEPARATOR = "; "
+# "tag", ".class" and "tag.class" go through bs4's find(), which skips
+# soupsieve's general matcher; everything else is compiled by soupsieve.
+_SIMPLE_SELECTOR = re.compile(r"([a-zA-Z][\w-]*)?(?:\.([a-zA-Z_][\w-]*))?")
+
+
+class _SimpleSelector:
+    def __init__(self, name: str | None, class_name: str | None) -> None:
+        self._kwargs: dict[str, Any] = {"class_": class_name} if class_name else {}
+        self._name = name.lower() if name else None
+
+    def strainer(self) -> SoupStrainer:
+        return SoupStrainer(self._name, **self._kwargs)
+
+    def select_one(self, row: Tag) -> Tag | None:
+        return row.find(self._name, **self._kwargs)
+
+    def select(self, row: Tag) -> list[Tag]:
+        return list(row.find_all(self._name, **self._kwargs))
+
+
+def compile_selector(selector: str) -> Any:
+    match = _SIMPLE_SELECTOR.fullmatch(selector.strip())
+    if match is not None and any(match.groups()):
+        return _SimpleSelector(*match.groups())
+    return soupsieve.compile(selector)
+
+
+@dataclass
+class _CompiledRule:
+    name: str
+    selector: Any  # _SimpleSelector or soupsieve.SoupSieve; None for the row itself
+    attribute: str
+    normalize: Normalizer
+    multiple: bool
+
+
+class CompiledPlan:
+    """An extraction plan with every selector compiled once, reusable across documents.
+
+    Each document is parsed once; rows are selected once and every field
+    is looked up inside its row, so the cost per document is one parse
+    plus work proportional to the rows. A simple row selector also limits
+    tree building to the row subtrees, skipping page chrome entirely.
+    """
+
+    def __init__(self, plan: ExtractionPlan, features: str = DEFAULT_FEATURES) -> None:
+        self.plan = plan
+        self.features = features
+        self._rows = compile_selector(plan.row_selector) if plan.row_selector else None
+        self._strainer = (
+            self._rows.strainer() if isinstance(self._rows, _SimpleSelector) else None
+        )
+        self._rules = [
+            _CompiledRule(
+                name=rule.name,
+                selector=compile_selector(rule.selector) if rule.selector else None,
+                attribute=rule.attribute,
+                normalize=NORMALIZERS.get(rule.normalizer or "text", NORMALIZERS["text"]),
+                multiple=rule.multiple,
+            )
+            for rule in plan.fields
+        ]
+
+    @property
+    def fieldnames(self) -> list[str]:
+        return self.plan.fieldnames
+
+    def extract(self, html: str | bytes, base_url: str = "") -> list[dict[str, str]]:
+        soup = BeautifulSoup(html, self.features, parse_only=self._strainer)
+        rows: list[Tag] = list(self._rows.select(soup)) if self._rows is not None else [soup]
+        records: list[dict[str, str]] = []
+        for row in rows:
+            record = {rule.name: self._value(rule, row, base_url) for rule in self._rules}
+            if any(record.values()):
+                records.append(record)
+        return records
+
+    def _value(self, rule: _CompiledRule, row: Tag, base_url: str) -> str:
+        if rule.selector is None:
+            matches = [row]
+        elif rule.multiple:
+            matches = rule.selector.select(row)
+        else:
+            match = rule.selector.select_one(row)
+            matches = [match] if match is not None else []
+        values = [
+            rule.normalize(_raw_value(match, rule.attribute), base_url) for match in matches
+        ]
+        values = [value for value in values if value]
+        if not values:
+            return ""
+        return MULTIPLE_SEPARATOR.join(values) if rule.multiple else values[0]
+
+
+def _raw_value(element: Tag, attribute: str) -> str:
+    if attribute == TEXT_ATTRIBUTE:
+        return str(element.get_text(" "))
+    if attribute == HTML_ATTRIBUTE:
+        return str(element)
+    value = element.get(attribute)
+    if isinstance(value, list):
+        return " ".join(value)
+    return value if isinstance(value, str) else ""
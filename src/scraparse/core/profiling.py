@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+import cProfile
+import pstats
+import time
+import tracemalloc
+
+_CURRENT_PROFILER: ContextVar["StageProfiler | None"] = ContextVar(
+    "scraparse_profiler", default=None
+)
+_IGNORED_FRAMES = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+)
+
+
+@dataclass
+class StageProfile:
+    name: str
+    wall_s: float
+    peak_bytes: int
+    pstats_path: Path
+    alloc_path: Path
+    hot_spots: list[tuple[str, float]]
+
+
+class StageProfiler:
+    def __init__(self, output_dir: Path | None = None, top_n: int = 15) -> None:
+        self.output_dir = output_dir
+        self.top_n = top_n
+        self.stages: list[StageProfile] = []
+        self._active = False
+
+    @contextmanager
+    def profile(self, name: str) -> Iterator[None]:
+        # cProfile cannot nest, so inner stages are covered by the outer one.
+        output_dir = self.output_dir
+        if self._active or output_dir is None:
+            yield
+            return
+        self._active = True
+        output_dir.mkdir(parents=True, exist_ok=True)
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            wall_s = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED_FRAMES)
+            if started_tracing:
+                tracemalloc.stop()
+            self._active = False
+            self.stages.append(self._write(output_dir, name, profiler, snapshot, wall_s, peak))
+
+    def _write(
+        self,
+        output_dir: Path,
+        name: str,
+        profiler: cProfile.Profile,
+        snapshot: tracemalloc.Snapshot,
+        wall_s: float,
+        peak: int,
+    ) -> StageProfile:
+        prefix = f"{len(self.stages) + 1:02d}_{name}"
+        pstats_path = output_dir / f"{prefix}.pstats"
+        alloc_path = output_dir / f"{prefix}_alloc.txt"
+        profiler.dump_stats(str(pstats_path))
+        lines = [f"# {name}: top {self.top_n} allocations alive at stage end (peak {peak} bytes)"]
+        lines.extend(str(stat) for stat in snapshot.statistics("lineno")[: self.top_n])
+        alloc_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        stats = pstats.Stats(profiler)
+        entries = sorted(
+            stats.stats.items(),  # type: ignore[attr-defined]
+            key=lambda item: item[1][2],
+            reverse=True,
+        )
+        hot_spots = [
+            (f"{Path(filename).name}:{line}({func})", own_s)
+            for (filename, line, func), (_, _, own_s, _, _) in entries[:3]
+        ]
+        return StageProfile(name, wall_s, peak, pstats_path, alloc_path, hot_spots)
+
+    def summary(self) -> list[str]:
+        lines: list[str] = []
+        for profile in self.stages:
+            lines.append(
+                f"{profile.name}: {profile.wall_s:.3f}s wall, "
+                f"peak {profile.peak_bytes / 1_048_576:.1f} MiB"
+            )
+            for location, own_s in profile.hot_spots:
+                lines.append(f"  {own_s:.3f}s  {location}")
+        return lines
+
+
+def current_profiler() -> StageProfiler | None:
+    return _CURRENT_PROFILER.get()
+
+
+@contextmanager
+def activate(profiler: StageProfiler | None) -> Iterator[StageProfiler | None]:
+    token = _CURRENT_PROFILER.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _CURRENT_PROFILER.reset(token)
+
+
+@contextmanager
+def profile_stage(name: str) -> Iterator[None]:
+    profiler = _CURRENT_PROFILER.get()
+    if profiler is None:
+        yield
+        return
+    with profiler.profile(name):
+        yield
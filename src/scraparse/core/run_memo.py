@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urldefrag, urlparse, urlunparse
+import hashlib
+import json
+import os
+import re
+import tempfile
+
+from scraparse.core.models import FieldSchema, RunSpec
+from scraparse.core.util import now_utc_iso
+
+MEMO_VERSION = 1
+
+
+def normalize_url(url: str) -> str:
+    cleaned, _ = urldefrag(url.strip())
+    parts = urlparse(cleaned)
+    return urlunparse(parts._replace(scheme=parts.scheme.lower(), netloc=parts.netloc.lower()))
+
+
+def _normalize_text(value: str | None) -> str:
+    return re.sub(r"\s+", " ", value or "").strip()
+
+
+def memo_key(spec: RunSpec) -> str:
+    """Hash of the inputs that determine the schema and parser of a run."""
+    inputs = {
+        "version": MEMO_VERSION,
+        "url": normalize_url(spec.url),
+        "prompt": _normalize_text(spec.prompt),
+        "context": _normalize_text(spec.context),
+        "promptpack": spec.promptpack,
+        "discover": spec.discover,
+        "discover_strategy": spec.discover_strategy if spec.discover else "none",
+        "next_selector": spec.next_selector or "",
+        "detail_selector": spec.detail_selector or "",
+        "schema": spec.schema.to_dict() if spec.schema is not None else None,
+        "output_mode": spec.output_mode,
+    }
+    encoded = json.dumps(inputs, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def prompt_key(spec: RunSpec) -> str:
+    """Hash of what a run extracts, independent of the URL it starts from."""
+    inputs = {
+        "version": MEMO_VERSION,
+        "prompt": _normalize_text(spec.prompt),
+        "context": _normalize_text(spec.context),
+        "promptpack": spec.promptpack,
+        "schema": spec.schema.to_dict() if spec.schema is not None else None,
+        "output_mode": spec.output_mode,
+    }
+    encoded = json.dumps(inputs, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class MemoEntry:
+    key: str
+    schema: FieldSchema
+    parser: str | None
+    run_id: str
+    saved_at: str
+
+
+class RunMemo:
+    """Confirmed schemas and validated parsers from earlier runs, by input hash."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def load(self, key: str) -> MemoEntry | None:
+        path = self._path(key)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or not isinstance(data.get("schema"), dict):
+            return None
+        # Entries from older versions (or damaged files) are a miss, not a failed run.
+        try:
+            schema = FieldSchema.from_dict(data["schema"])
+        except ValueError:
+            return None
+        parser = data.get("parser")
+        return MemoEntry(
+            key=key,
+            schema=schema,
+            parser=parser if isinstance(parser, str) else None,
+            run_id=str(data.get("run_id") or ""),
+            saved_at=str(data.get("saved_at") or ""),
+        )
+
+    def save(
+        self, key: str, schema: dict[str, object], parser: str | None, run_id: str
+    ) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "schema": schema,
+            "parser": parser,
+            "run_id": run_id,
+            "saved_at": now_utc_iso(),
+        }
+        # Write then rename so concurrent batch runs never see a partial entry.
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(payload, handle)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
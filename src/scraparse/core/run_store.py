@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable, Iterator
+from urllib.parse import urlparse
+import json
+import sqlite3
+import threading
+
+from scraparse.core.events import EVENTS_FILENAME, read_events
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    ended_at TEXT,
+    url TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    mode TEXT,
+    discover_strategy TEXT,
+    fetched_count INTEGER NOT NULL DEFAULT 0,
+    bytes_total INTEGER NOT NULL DEFAULT 0,
+    total_s REAL,
+    ok INTEGER NOT NULL,
+    truncated_limit TEXT,
+    parser_path TEXT,
+    report_path TEXT
+);
+CREATE TABLE IF NOT EXISTS pages (
+    run_id TEXT NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    url TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    artifact TEXT
+);
+CREATE TABLE IF NOT EXISTS llm_calls (
+    run_id TEXT NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    purpose TEXT NOT NULL,
+    attempt INTEGER NOT NULL,
+    duration_s REAL,
+    prompt_chars INTEGER,
+    completion_chars INTEGER,
+    prompt_tokens INTEGER,
+    completion_tokens INTEGER
+);
+CREATE TABLE IF NOT EXISTS stage_timings (
+    run_id TEXT NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    start_s REAL,
+    duration_s REAL
+);
+CREATE TABLE IF NOT EXISTS errors (
+    run_id TEXT NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_domain_started ON runs(domain, started_at);
+CREATE INDEX IF NOT EXISTS runs_started ON runs(started_at);
+CREATE INDEX IF NOT EXISTS pages_url ON pages(url);
+CREATE INDEX IF NOT EXISTS pages_domain ON pages(domain);
+CREATE INDEX IF NOT EXISTS pages_run ON pages(run_id);
+CREATE INDEX IF NOT EXISTS llm_calls_run ON llm_calls(run_id);
+CREATE INDEX IF NOT EXISTS stage_timings_run ON stage_timings(run_id);
+CREATE INDEX IF NOT EXISTS errors_run ON errors(run_id);
+"""
+
+RUN_COLUMNS = (
+    "run_id",
+    "started_at",
+    "ended_at",
+    "url",
+    "domain",
+    "mode",
+    "discover_strategy",
+    "fetched_count",
+    "bytes_total",
+    "total_s",
+    "ok",
+    "truncated_limit",
+    "parser_path",
+    "report_path",
+)
+
+
+class RunStore:
+    """Indexes run reports in one SQLite file (WAL mode) for cross-run queries.
+
+    A single connection is shared between threads; every write runs in one
+    transaction under a lock, with child rows inserted via ``executemany``.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "RunStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:  # type: ignore[no-untyped-def]
+        self.close()
+
+    def record_report(self, report: dict[str, object], report_path: Path | None = None) -> None:
+        self.record_reports([(report, report_path)])
+
+    def record_reports(
+        self, reports: Iterable[tuple[dict[str, object], Path | None]]
+    ) -> int:
+        count = 0
+        with self._lock, self._conn:
+            for report, report_path in reports:
+                self._insert(report, report_path)
+                count += 1
+        return count
+
+    def import_reports(self, generated_dir: Path, batch_size: int = 500) -> int:
+        """Backfill the store from existing ``<run>/run_report.json`` files."""
+        batch: list[tuple[dict[str, object], Path | None]] = []
+        imported = 0
+        for report_path in sorted(generated_dir.glob("*/run_report.json")):
+            try:
+                report = json.loads(report_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            if not isinstance(report, dict) or not isinstance(report.get("run_id"), str):
+                continue
+            batch.append((report, report_path))
+            if len(batch) >= batch_size:
+                imported += self.record_reports(batch)
+                batch = []
+        if batch:
+            imported += self.record_reports(batch)
+        return imported
+
+    def runs_for_url(self, url: str, limit: int = 50) -> list[dict[str, object]]:
+        return self._query(
+            "SELECT DISTINCT runs.* FROM pages JOIN runs USING (run_id) "
+            "WHERE pages.url = ? ORDER BY runs.started_at DESC LIMIT ?",
+            (url, limit),
+        )
+
+    def recent_runs(
+        self, domain: str | None = None, since: str | None = None, limit: int = 50
+    ) -> list[dict[str, object]]:
+        clauses: list[str] = []
+        params: list[object] = []
+        if domain:
+            clauses.append("domain = ?")
+            params.append(domain)
+        if since:
+            clauses.append("started_at >= ?")
+            params.append(since)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        params.append(limit)
+        return self._query(
+            f"SELECT * FROM runs {where}ORDER BY started_at DESC LIMIT ?", tuple(params)
+        )
+
+    def domain_stats(
+        self, domain: str | None = None, since: str | None = None
+    ) -> list[dict[str, object]]:
+        clauses: list[str] = []
+        params: list[object] = []
+        if domain:
+            clauses.append("pages.domain = ?")
+            params.append(domain)
+        if since:
+            clauses.append("runs.started_at >= ?")
+            params.append(since)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        return self._query(
+            "SELECT pages.domain AS domain, COUNT(DISTINCT pages.run_id) AS runs, "
+            "COUNT(*) AS pages, ROUND(AVG(pages.bytes), 1) AS avg_bytes_per_page, "
+            "SUM(pages.bytes) AS total_bytes "
+            f"FROM pages JOIN runs USING (run_id) {where}"
+            "GROUP BY pages.domain ORDER BY pages DESC",
+            tuple(params),
+        )
+
+    def _query(self, sql: str, params: tuple[object, ...]) -> list[dict[str, object]]:
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def _insert(self, report: dict[str, object], report_path: Path | None) -> None:
+        # Caller holds the lock and an open transaction.
+        run_id = str(report["run_id"])
+        inputs = _as_dict(report.get("inputs"))
+        url = str(inputs.get("url") or "")
+        timings = _as_dict(report.get("timings"))
+        truncated = _as_dict(report.get("truncated"))
+        errors = [str(error) for error in _as_list(report.get("errors"))]
+        row = {
+            "run_id": run_id,
+            "started_at": report.get("started_at") or "",
+            "ended_at": report.get("ended_at"),
+            "url": url,
+            "domain": urlparse(url).netloc,
+            "mode": inputs.get("mode"),
+            "discover_strategy": inputs.get("discover_strategy"),
+            "fetched_count": report.get("fetched_count") or 0,
+            "bytes_total": report.get("bytes_total") or 0,
+            "total_s": timings.get("total_s"),
+            "ok": int(not errors and bool(report.get("parser_path"))),
+            "truncated_limit": truncated.get("limit_name"),
+            "parser_path": report.get("parser_path") or None,
+            "report_path": str(report_path) if report_path else None,
+        }
+        conn = self._conn
+        # Re-recording a run replaces it (child rows cascade).
+        conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+        conn.execute(
+            f"INSERT INTO runs ({', '.join(RUN_COLUMNS)}) "
+            f"VALUES ({', '.join('?' for _ in RUN_COLUMNS)})",
+            tuple(row[column] for column in RUN_COLUMNS),
+        )
+        conn.executemany(
+            "INSERT INTO pages (run_id, url, domain, bytes, artifact) VALUES (?, ?, ?, ?, ?)",
+            _page_rows(run_id, report, report_path),
+        )
+        conn.executemany(
+            "INSERT INTO llm_calls (run_id, purpose, attempt, duration_s, prompt_chars, "
+            "completion_chars, prompt_tokens, completion_tokens) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    run_id,
+                    call.get("purpose"),
+                    call.get("attempt"),
+                    call.get("duration_s"),
+                    call.get("prompt_chars"),
+                    call.get("completion_chars"),
+                    call.get("prompt_tokens"),
+                    call.get("completion_tokens"),
+                )
+                for call in map(_as_dict, _as_list(timings.get("llm_calls")))
+            ],
+        )
+        conn.executemany(
+            "INSERT INTO stage_timings (run_id, name, start_s, duration_s) VALUES (?, ?, ?, ?)",
+            [
+                (run_id, stage.get("name"), stage.get("start_s"), stage.get("duration_s"))
+                for stage in map(_as_dict, _as_list(timings.get("stages")))
+            ],
+        )
+        conn.executemany(
+            "INSERT INTO errors (run_id, message) VALUES (?, ?)",
+            [(run_id, message) for message in errors],
+        )
+
+
+def _events_log(report: dict[str, object], report_path: Path | None) -> Path | None:
+    events_path = report.get("events_path")
+    if not isinstance(events_path, str):
+        return None
+    if Path(events_path).exists():
+        return Path(events_path)
+    # Moved or copied workspaces: the log still sits next to its report.
+    if report_path is not None and (report_path.parent / EVENTS_FILENAME).exists():
+        return report_path.parent / EVENTS_FILENAME
+    return None
+
+
+def _page_rows(
+    run_id: str, report: dict[str, object], report_path: Path | None
+) -> Iterator[tuple[str, str, str, int, object]]:
+    events_path = _events_log(report, report_path)
+    if events_path is not None:
+        # Streamed straight from the event log, one page at a time.
+        for event in read_events(events_path):
+            if event.get("type") != "page_fetched":
+                continue
+            url = str(event.get("url") or "")
+            size = event.get("bytes")
+            size = size if isinstance(size, int) else 0
+            yield run_id, url, urlparse(url).netloc, size, event.get("artifact")
+        return
+    # Reports written before the event log kept pages inline.
+    artifacts = _as_dict(report.get("artifacts"))
+    for url, size in _as_dict(report.get("bytes_per_page")).items():
+        size = size if isinstance(size, int) else 0
+        yield run_id, url, urlparse(url).netloc, size, artifacts.get(url)
+
+
+def _as_dict(value: object) -> dict[str, object]:
+    return value if isinstance(value, dict) else {}
+
+
+def _as_list(value: object) -> list[object]:
+    return value if isinstance(value, list) else []
@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection
+from pathlib import Path
+from types import ModuleType
+from typing import TextIO
+import csv
+import io
+import math
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+
+try:  # POSIX only; without it workers run with the wall-clock limit alone.
+    import resource
+except ImportError:  # pragma: no cover - exercised on Windows only
+    resource = None  # type: ignore[assignment]
+
+from scraparse.core.deadline import Deadline
+from scraparse.core.models import FieldSchema
+from scraparse.core.parser_runner import (
+    REQUIRED_FILL_RATE,
+    ParserCheck,
+    call_parser_main,
+    score_rows,
+)
+
+# Time allowed for a fresh worker to import its parsing libraries.
+WORKER_START_S = 30.0
+
+
+@dataclass(frozen=True)
+class SandboxLimits:
+    cpu_s: int = 5
+    memory_bytes: int = 512_000_000
+    wall_s: float = 10.0
+    # A single page slower than this is reported as a problem.
+    slow_page_s: float = 2.0
+
+
+@dataclass
+class PageRun:
+    index: int
+    rows: int
+    seconds: float
+    error: str | None = None
+
+
+@dataclass
+class SandboxResult:
+    rows: list[dict[str, str]] = field(default_factory=list)
+    pages: list[PageRun] = field(default_factory=list)
+    # Set when the candidate never ran to completion (load error or a limit hit).
+    error: str | None = None
+
+    def check(self, schema: FieldSchema, min_fill_rate: float = REQUIRED_FILL_RATE) -> ParserCheck:
+        if self.error is not None:
+            return ParserCheck(rows=0, problems=[self.error])
+        return score_rows(self.rows, schema, min_fill_rate)
+
+    def problems(
+        self,
+        schema: FieldSchema,
+        slow_page_s: float,
+        min_fill_rate: float = REQUIRED_FILL_RATE,
+    ) -> list[str]:
+        """Runtime findings phrased as feedback for the next generation attempt."""
+        if self.error is not None:
+            return [self.error]
+        problems = [
+            f"Parser raised on sample {page.index + 1}: {page.error}"
+            for page in self.pages
+            if page.error is not None
+        ]
+        problems.extend(
+            f"Parser took {page.seconds:.2f}s on sample {page.index + 1} "
+            f"(limit {slow_page_s:.1f}s); avoid repeated full-document searches"
+            for page in self.pages
+            if page.error is None and page.seconds > slow_page_s
+        )
+        if not problems:
+            problems.extend(self.check(schema, min_fill_rate).problems)
+        return problems
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "rows": len(self.rows),
+            "error": self.error,
+            "page_ms": [round(page.seconds * 1000, 2) for page in self.pages],
+            "page_errors": sum(1 for page in self.pages if page.error is not None),
+        }
+
+
+class _Worker:
+    def __init__(self, ctx: multiprocessing.context.SpawnContext, limits: SandboxLimits) -> None:
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, limits.memory_bytes),
+            name="scraparse-sandbox",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def run(
+        self, script: str, html_paths: list[str], cpu_s: int, wall_s: float
+    ) -> SandboxResult:
+        if not self.ready:
+            # Start-up cost is paid once per worker, outside the candidate's budget.
+            if not self.conn.poll(WORKER_START_S):
+                self.kill()
+                return SandboxResult(error="Sandbox worker did not start")
+            self.conn.recv()
+            self.ready = True
+        self.conn.send((script, html_paths, cpu_s))
+        if not self.conn.poll(wall_s):
+            self.kill()
+            return SandboxResult(error=f"Parser exceeded the {wall_s:.1f}s wall-clock limit")
+        try:
+            result = self.conn.recv()
+        except (EOFError, OSError):
+            self.process.join(1.0)
+            return SandboxResult(error=_death_reason(self.process.exitcode, cpu_s))
+        if not isinstance(result, SandboxResult):
+            self.kill()
+            return SandboxResult(error="Sandbox worker sent an unexpected reply")
+        if result.error is not None or any(page.error is not None for page in result.pages):
+            # A candidate that failed may have left the interpreter in any state; retire it.
+            self.close()
+        return result
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join(1.0)
+        self.conn.close()
+
+    def close(self) -> None:
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(1.0)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+
+def _death_reason(exitcode: int | None, cpu_s: int) -> str:
+    if exitcode == -signal.SIGXCPU:
+        return f"Parser exceeded the {cpu_s}s CPU time limit"
+    if exitcode == -signal.SIGKILL:
+        return "Parser was killed (likely out of memory)"
+    return f"Sandbox worker exited with code {exitcode}"
+
+
+class SandboxPool:
+    """Warm worker processes that test-run candidate parsers under rlimits.
+
+    Workers are spawned once and import bs4 up front, so running a
+    candidate costs a pipe round trip plus the parse itself. Each worker
+    caps its address space; every job gets a fresh CPU-time allowance and
+    the pool enforces a wall-clock limit. A worker that hits a limit is
+    killed, and one whose candidate failed is retired; either is replaced
+    in the background. Between jobs a worker restores ``sys.modules`` and
+    the standard streams to their state at start-up.
+    """
+
+    def __init__(self, workers: int = 2, limits: SandboxLimits | None = None) -> None:
+        self.limits = limits or SandboxLimits()
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle: queue.Queue[_Worker] = queue.Queue()
+        self._lock = threading.Lock()
+        self._workers: list[_Worker] = []
+        self._closed = False
+        for _ in range(max(1, workers)):
+            self._idle.put(self._spawn())
+
+    def run(
+        self, script: str, html_paths: list[Path], deadline: Deadline | None = None
+    ) -> SandboxResult:
+        wall_s = self.limits.wall_s
+        if deadline is not None:
+            wall_s = deadline.timeout(wall_s)
+        worker = self._idle.get()
+        try:
+            return worker.run(
+                script, [str(path) for path in html_paths], self.limits.cpu_s, wall_s
+            )
+        finally:
+            self._release(worker)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.close()
+
+    def __enter__(self) -> "SandboxPool":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker(self._ctx, self.limits)
+        with self._lock:
+            self._workers.append(worker)
+        return worker
+
+    def _release(self, worker: _Worker) -> None:
+        if worker.alive() and not worker.conn.closed:
+            self._idle.put(worker)
+            return
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+            closed = self._closed
+        if not closed:
+            self._idle.put(self._spawn())
+
+
+def _worker_main(conn: Connection, memory_bytes: int) -> None:
+    import bs4  # noqa: F401  (warm the import every candidate needs)
+
+    _limit_memory(memory_bytes)
+    clean = _InterpreterState.capture()
+    conn.send("ready")
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            return
+        if job is None:
+            return
+        script, html_paths, cpu_s = job
+        _limit_cpu(cpu_s)
+        try:
+            conn.send(_execute(script, html_paths))
+        finally:
+            clean.restore()
+
+
+@dataclass(frozen=True)
+class _InterpreterState:
+    """What a candidate's module-level code most often changes in a warm worker."""
+
+    modules: dict[str, ModuleType]
+    stdout: TextIO
+    stderr: TextIO
+    argv: list[str]
+
+    @classmethod
+    def capture(cls) -> "_InterpreterState":
+        return cls(dict(sys.modules), sys.stdout, sys.stderr, list(sys.argv))
+
+    def restore(self) -> None:
+        for name in set(sys.modules) - set(self.modules):
+            del sys.modules[name]
+        sys.modules.update(self.modules)
+        sys.stdout = self.stdout
+        sys.stderr = self.stderr
+        sys.argv = list(self.argv)
+
+
+def _limit_memory(memory_bytes: int) -> None:
+    if resource is None or memory_bytes <= 0:
+        return
+    try:
+        page_size = os.sysconf("SC_PAGE_SIZE")
+        with open("/proc/self/statm", encoding="ascii") as handle:
+            current = int(handle.read().split()[0]) * page_size
+    except (OSError, ValueError):
+        current = 0
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    soft = current + memory_bytes
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (soft, hard))
+    except (ValueError, OSError):
+        pass
+
+
+def _limit_cpu(cpu_s: int) -> None:
+    # RLIMIT_CPU counts the whole process life, so each job extends it by its budget.
+    if resource is None:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = math.ceil(usage.ru_utime + usage.ru_stime)
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = used + cpu_s
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    try:
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    except (ValueError, OSError):
+        pass
+
+
+def _execute(script: str, html_paths: list[str]) -> SandboxResult:
+    namespace: dict[str, object] = {"__name__": "scraparse_candidate"}
+    try:
+        exec(compile(script, "<candidate parser>", "exec"), namespace)
+    except BaseException as exc:  # noqa: BLE001 - candidate code may raise anything
+        return SandboxResult(error=f"Parser failed to load: {type(exc).__name__}: {exc}")
+    main = namespace.get("main")
+    if not callable(main):
+        return SandboxResult(error="Parser has no main() function")
+    result = SandboxResult()
+    for index, path in enumerate(html_paths):
+        started = time.perf_counter()
+        try:
+            text = call_parser_main(main, "parser.py", path)
+            rows = list(csv.DictReader(io.StringIO(text)))
+        except Exception as exc:
+            result.pages.append(
+                PageRun(index, 0, time.perf_counter() - started, f"{type(exc).__name__}: {exc}")
+            )
+            continue
+        result.rows.extend(rows)
+        result.pages.append(PageRun(index, len(rows), time.perf_counter() - started))
+    return result
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 import ast
 
 ALLOWED_IMPORTS = {
@@ -17,26 +18,263 @@ ALLOWED_IMPORTS = {
 
 FORBIDDEN_CALLS = {"eval", "exec", "compile", "__import__"}
 
+# Calls and attributes that yield elements of a parsed document.
+ELEMENT_QUERIES = {
+    "find_all",
+    "findAll",
+    "select",
+    "find_all_next",
+    "find_all_previous",
+    "find_next_siblings",
+    "find_previous_siblings",
+    "find_parents",
+}
+ELEMENT_ITERATORS = {"children", "descendants", "contents", "strings", "stripped_strings"}
+DOCUMENT_SCANS = {"find_all", "findAll", "select"}
+DOCUMENT_LOOKUPS = {"find", "select_one"}
+REGEX_FUNCTIONS = {
+    "compile",
+    "search",
+    "match",
+    "fullmatch",
+    "findall",
+    "finditer",
+    "sub",
+    "subn",
+    "split",
+}
+
+
+@dataclass
+class ScriptReport:
+    errors: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+
 
-def validate_script(script: str) -> list[str]:
-    errors: list[str] = []
+def validate_script(script: str, performance: bool = True) -> list[str]:
+    """Blocking problems: forbidden imports/calls and, by default, slow patterns."""
+    report = check_script(script, performance)
+    return report.errors
+
+
+def check_script(script: str, performance: bool = True) -> ScriptReport:
+    report = ScriptReport()
     try:
         tree = ast.parse(script)
     except SyntaxError as exc:
-        return [f"Syntax error: {exc}"]
+        report.errors.append(f"Syntax error: {exc}")
+        return report
 
     for node in ast.walk(tree):
         if isinstance(node, ast.Import):
             for alias in node.names:
                 if alias.name not in ALLOWED_IMPORTS:
-                    errors.append(f"Forbidden import: {alias.name}")
+                    report.errors.append(f"Forbidden import: {alias.name}")
         elif isinstance(node, ast.ImportFrom):
             module = node.module or ""
             if module not in ALLOWED_IMPORTS:
-                errors.append(f"Forbidden import: {module}")
+                report.errors.append(f"Forbidden import: {module}")
         elif isinstance(node, ast.Call):
             if isinstance(node.func, ast.Name) and node.func.id in FORBIDDEN_CALLS:
-                errors.append(f"Forbidden call: {node.func.id}")
-            if isinstance(node.func, ast.Attribute) and node.func.attr in FORBIDDEN_CALLS:
-                errors.append(f"Forbidden call: {node.func.attr}")
-    return errors
+                report.errors.append(f"Forbidden call: {node.func.id}")
+            if (
+                isinstance(node.func, ast.Attribute)
+                and node.func.attr in FORBIDDEN_CALLS
+                # re.compile is how the performance lints ask for patterns to be built.
+                and not _is_regex_call(node.func)
+            ):
+                report.errors.append(f"Forbidden call: {node.func.attr}")
+    if performance:
+        linter = _PerformanceLinter(tree)
+        linter.visit(tree)
+        report.errors.extend(linter.errors)
+        report.warnings.extend(linter.warnings)
+    return report
+
+
+class _PerformanceLinter(ast.NodeVisitor):
+    """Flags patterns that make a parser quadratic or re-do work per element.
+
+    Loops over files are expected; the expensive cases are loops over
+    elements of a parsed document, where every iteration repeats work
+    proportional to the whole document.
+    """
+
+    def __init__(self, tree: ast.AST) -> None:
+        self.errors: list[str] = []
+        self.warnings: list[str] = []
+        # Each entry marks whether that loop iterates over document elements.
+        self.loops: list[bool] = []
+        self.soup_names: set[str] = set()
+        self.str_names: set[str] = set()
+        self.file_names: set[str] = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Assign):
+                names = [target.id for target in node.targets if isinstance(target, ast.Name)]
+                if _is_soup_call(node.value):
+                    self.soup_names.update(names)
+                elif _is_str_literal(node.value):
+                    self.str_names.update(names)
+                elif _is_open_call(node.value):
+                    self.file_names.update(names)
+            elif isinstance(node, (ast.With, ast.AsyncWith)):
+                for item in node.items:
+                    if _is_open_call(item.context_expr) and isinstance(
+                        item.optional_vars, ast.Name
+                    ):
+                        self.file_names.add(item.optional_vars.id)
+
+    @property
+    def in_loop(self) -> bool:
+        return bool(self.loops)
+
+    @property
+    def in_element_loop(self) -> bool:
+        return any(self.loops)
+
+    def visit_For(self, node: ast.For) -> None:
+        self._check_line_reads(node.iter, node.lineno)
+        self._loop(node.iter, [*node.body, *node.orelse], _iterates_elements(node.iter))
+
+    visit_AsyncFor = visit_For  # type: ignore[assignment]
+
+    def visit_While(self, node: ast.While) -> None:
+        self._loop(None, [node.test, *node.body, *node.orelse], False)
+
+    def visit_ListComp(self, node: ast.ListComp) -> None:
+        self._comprehension(node.generators, [node.elt])
+
+    def visit_SetComp(self, node: ast.SetComp) -> None:
+        self._comprehension(node.generators, [node.elt])
+
+    def visit_GeneratorExp(self, node: ast.GeneratorExp) -> None:
+        self._comprehension(node.generators, [node.elt])
+
+    def visit_DictComp(self, node: ast.DictComp) -> None:
+        self._comprehension(node.generators, [node.key, node.value])
+
+    def visit_Call(self, node: ast.Call) -> None:
+        if self.in_element_loop and _is_soup_call(node):
+            self.errors.append(
+                f"Performance: BeautifulSoup() is called inside a loop over elements "
+                f"(line {node.lineno}); parse each document once and search the element itself"
+            )
+        func = node.func
+        if isinstance(func, ast.Attribute):
+            owner = func.value
+            soup = owner.id if isinstance(owner, ast.Name) else None
+            if soup not in self.soup_names:
+                soup = None
+            if self.in_element_loop and soup and func.attr in DOCUMENT_SCANS:
+                self.errors.append(
+                    f"Performance: {soup}.{func.attr}() searches the whole document for "
+                    f"every element (line {node.lineno}); search within the current element "
+                    "or collect the results once before the loop"
+                )
+            elif self.in_element_loop and soup and func.attr in DOCUMENT_LOOKUPS:
+                self.warnings.append(
+                    f"Performance: {soup}.{func.attr}() scans the document from the top "
+                    f"for every element (line {node.lineno}); look it up once before the loop"
+                )
+            if self.in_loop and _is_regex_call(func):
+                if func.attr == "compile":
+                    self.warnings.append(
+                        f"Performance: re.compile() inside a loop (line {node.lineno}); "
+                        "compile patterns once at module level"
+                    )
+                elif self.in_element_loop:
+                    self.warnings.append(
+                        f"Performance: re.{func.attr}() with an uncompiled pattern inside a "
+                        f"loop over elements (line {node.lineno}); use a precompiled pattern"
+                    )
+            if self.in_loop and func.attr == "readline":
+                self._warn_line_reads(node.lineno)
+        self.generic_visit(node)
+
+    def visit_AugAssign(self, node: ast.AugAssign) -> None:
+        target = node.target
+        if (
+            self.in_loop
+            and isinstance(node.op, ast.Add)
+            and isinstance(target, ast.Name)
+            and target.id in self.str_names
+        ):
+            self.warnings.append(
+                f"Performance: string '{target.id}' is built with += inside a loop "
+                f"(line {node.lineno}); collect parts in a list and ''.join() them"
+            )
+        self.generic_visit(node)
+
+    def _check_line_reads(self, iterable: ast.AST, lineno: int) -> None:
+        # Iterating a file object (or open() itself) yields it one line at a time.
+        if _is_open_call(iterable) or (
+            isinstance(iterable, ast.Name) and iterable.id in self.file_names
+        ):
+            self._warn_line_reads(lineno)
+
+    def _warn_line_reads(self, lineno: int) -> None:
+        self.warnings.append(
+            f"Performance: file read line by line (line {lineno}); "
+            "read the whole file once with read()"
+        )
+
+    def _loop(self, outer: ast.AST | None, inner: list[ast.AST], element_loop: bool) -> None:
+        if outer is not None:
+            self.visit(outer)
+        self.loops.append(element_loop)
+        for child in inner:
+            self.visit(child)
+        self.loops.pop()
+
+    def _comprehension(self, generators: list[ast.comprehension], inner: list[ast.AST]) -> None:
+        # The first iterable is evaluated once, outside the comprehension's loop.
+        self.visit(generators[0].iter)
+        pushed = 0
+        for idx, generator in enumerate(generators):
+            self._check_line_reads(generator.iter, generator.iter.lineno)
+            if idx:
+                self.visit(generator.iter)
+            self.loops.append(_iterates_elements(generator.iter))
+            pushed += 1
+            for condition in generator.ifs:
+                self.visit(condition)
+        for child in inner:
+            self.visit(child)
+        del self.loops[len(self.loops) - pushed :]
+
+
+def _is_soup_call(node: ast.AST) -> bool:
+    if not isinstance(node, ast.Call):
+        return False
+    func = node.func
+    if isinstance(func, ast.Name):
+        return func.id == "BeautifulSoup"
+    return isinstance(func, ast.Attribute) and func.attr == "BeautifulSoup"
+
+
+def _is_open_call(node: ast.AST) -> bool:
+    return isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "open"
+
+
+def _is_str_literal(node: ast.AST) -> bool:
+    return isinstance(node, ast.JoinedStr) or (
+        isinstance(node, ast.Constant) and isinstance(node.value, str)
+    )
+
+
+def _is_regex_call(func: ast.Attribute) -> bool:
+    return (
+        isinstance(func.value, ast.Name)
+        and func.value.id == "re"
+        and func.attr in REGEX_FUNCTIONS
+    )
+
+
+def _iterates_elements(node: ast.AST) -> bool:
+    for child in ast.walk(node):
+        if isinstance(child, ast.Call) and isinstance(child.func, ast.Attribute):
+            if child.func.attr in ELEMENT_QUERIES:
+                return True
+        elif isinstance(child, ast.Attribute) and child.attr in ELEMENT_ITERATORS:
+            return True
+    return False
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator
+import threading
+import time
+
+from scraparse.core.events import emit
+
+_CURRENT_TIMINGS: ContextVar["RunTimings | None"] = ContextVar("scraparse_timings", default=None)
+_CURRENT_LLM_CALL: ContextVar["LLMCallTiming | None"] = ContextVar(
+    "scraparse_llm_call", default=None
+)
+
+
+def _round(value: float | None) -> float | None:
+    return None if value is None else round(value, 6)
+
+
+@dataclass
+class StageTiming:
+    name: str
+    start_s: float
+    duration_s: float
+    attrs: dict[str, object] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "name": self.name,
+            "start_s": _round(self.start_s),
+            "duration_s": _round(self.duration_s),
+            **self.attrs,
+        }
+
+
+@dataclass
+class FetchTiming:
+    url: str
+    attempt: int
+    start_s: float = 0.0
+    duration_s: float = 0.0
+    connect_s: float | None = None  # includes DNS resolution
+    tls_s: float | None = None
+    ttfb_s: float | None = None
+    body_s: float | None = None
+    status_code: int | None = None
+    bytes: int = 0
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "url": self.url,
+            "attempt": self.attempt,
+            "start_s": _round(self.start_s),
+            "duration_s": _round(self.duration_s),
+            "connect_s": _round(self.connect_s),
+            "tls_s": _round(self.tls_s),
+            "ttfb_s": _round(self.ttfb_s),
+            "body_s": _round(self.body_s),
+            "status_code": self.status_code,
+            "bytes": self.bytes,
+            "error": self.error,
+        }
+
+
+@dataclass
+class LLMCallTiming:
+    purpose: str
+    attempt: int
+    prompt_chars: int
+    start_s: float = 0.0
+    duration_s: float = 0.0
+    completion_chars: int = 0
+    prompt_tokens: int | None = None
+    completion_tokens: int | None = None
+    api_attempts: int = 0
+    api_errors: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "purpose": self.purpose,
+            "attempt": self.attempt,
+            "start_s": _round(self.start_s),
+            "duration_s": _round(self.duration_s),
+            "prompt_chars": self.prompt_chars,
+            "completion_chars": self.completion_chars,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "api_attempts": self.api_attempts,
+            "api_errors": self.api_errors,
+        }
+
+
+class RunTimings:
+    def __init__(self) -> None:
+        self.origin = time.perf_counter()
+        self.stages: list[StageTiming] = []
+        self.fetches: list[FetchTiming] = []
+        self.llm_calls: list[LLMCallTiming] = []
+        self._lock = threading.Lock()
+
+    def now(self) -> float:
+        return time.perf_counter() - self.origin
+
+    @contextmanager
+    def stage(self, name: str, **attrs: object) -> Iterator[dict[str, object]]:
+        start = self.now()
+        try:
+            yield attrs
+        finally:
+            timing = StageTiming(name, start, self.now() - start, attrs)
+            with self._lock:
+                self.stages.append(timing)
+
+    def record_fetch(self, timing: FetchTiming) -> None:
+        with self._lock:
+            self.fetches.append(timing)
+
+    def record_llm_call(self, timing: LLMCallTiming) -> None:
+        with self._lock:
+            self.llm_calls.append(timing)
+
+    def to_dict(self) -> dict[str, object]:
+        with self._lock:
+            stages = list(self.stages)
+            fetches = list(self.fetches)
+            llm_calls = list(self.llm_calls)
+        totals: dict[str, float] = {}
+        for stage in stages:
+            totals[stage.name] = totals.get(stage.name, 0.0) + stage.duration_s
+        return {
+            "clock": "monotonic",
+            "total_s": _round(self.now()),
+            "stage_totals_s": {name: _round(value) for name, value in totals.items()},
+            "stages": [stage.to_dict() for stage in stages],
+            "fetches": [fetch.to_dict() for fetch in fetches],
+            "llm_calls": [call.to_dict() for call in llm_calls],
+        }
+
+
+def current_timings() -> RunTimings | None:
+    return _CURRENT_TIMINGS.get()
+
+
+@contextmanager
+def activate(timings: RunTimings) -> Iterator[RunTimings]:
+    token = _CURRENT_TIMINGS.set(timings)
+    try:
+        yield timings
+    finally:
+        _CURRENT_TIMINGS.reset(token)
+
+
+@contextmanager
+def stage(name: str, **attrs: object) -> Iterator[dict[str, object]]:
+    timings = _CURRENT_TIMINGS.get()
+    if timings is None:
+        yield attrs
+        return
+    with timings.stage(name, **attrs) as stage_attrs:
+        yield stage_attrs
+
+
+@contextmanager
+def llm_call(purpose: str, attempt: int, prompt_chars: int) -> Iterator[LLMCallTiming]:
+    timings = _CURRENT_TIMINGS.get()
+    call = LLMCallTiming(purpose=purpose, attempt=attempt, prompt_chars=prompt_chars)
+    call.start_s = timings.now() if timings else 0.0
+    started = time.perf_counter()
+    token = _CURRENT_LLM_CALL.set(call)
+    try:
+        yield call
+    finally:
+        _CURRENT_LLM_CALL.reset(token)
+        call.duration_s = time.perf_counter() - started
+        if timings is not None:
+            timings.record_llm_call(call)
+        emit("llm_call", **call.to_dict())
+
+
+def note_llm_attempt(
+    error: str | None = None,
+    prompt_tokens: int | None = None,
+    completion_tokens: int | None = None,
+) -> None:
+    call = _CURRENT_LLM_CALL.get()
+    if call is None:
+        return
+    call.api_attempts += 1
+    if error:
+        call.api_errors.append(error)
+    if prompt_tokens is not None:
+        call.prompt_tokens = prompt_tokens
+    if completion_tokens is not None:
+        call.completion_tokens = completion_tokens
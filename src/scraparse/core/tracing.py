@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator
+import itertools
+import json
+import os
+import threading
+import time
+
+_CURRENT_TRACER: ContextVar["Tracer | None"] = ContextVar("scraparse_tracer", default=None)
+_CURRENT_SPAN: ContextVar[int | None] = ContextVar("scraparse_span", default=None)
+
+
+@dataclass
+class Span:
+    span_id: int
+    parent_id: int | None
+    name: str
+    start_ns: int
+    duration_ns: int
+    thread_id: int
+    thread_name: str
+    attrs: dict[str, object] = field(default_factory=dict)
+
+
+class Tracer:
+    def __init__(self) -> None:
+        self.origin_ns = time.perf_counter_ns()
+        self.spans: list[Span] = []
+        self._ids = itertools.count(1)
+        # OS thread idents are reused once a thread exits, so tracks get ids of their own.
+        self._thread_ids: dict[threading.Thread, int] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, **attrs: object) -> Iterator[dict[str, object]]:
+        span_id = next(self._ids)
+        parent_id = _CURRENT_SPAN.get()
+        token = _CURRENT_SPAN.set(span_id)
+        start_ns = time.perf_counter_ns()
+        try:
+            yield attrs
+        except BaseException as exc:
+            attrs.setdefault("error", f"{type(exc).__name__}: {exc}")
+            raise
+        finally:
+            duration_ns = time.perf_counter_ns() - start_ns
+            _CURRENT_SPAN.reset(token)
+            thread = threading.current_thread()
+            record = Span(
+                span_id=span_id,
+                parent_id=parent_id,
+                name=name,
+                start_ns=start_ns - self.origin_ns,
+                duration_ns=duration_ns,
+                thread_id=self._track_id(thread),
+                thread_name=thread.name,
+                attrs=attrs,
+            )
+            with self._lock:
+                self.spans.append(record)
+
+    def _track_id(self, thread: threading.Thread) -> int:
+        with self._lock:
+            return self._thread_ids.setdefault(thread, len(self._thread_ids) + 1)
+
+    def to_chrome_trace(self) -> dict[str, object]:
+        pid = os.getpid()
+        with self._lock:
+            spans = sorted(self.spans, key=lambda item: item.start_ns)
+        events: list[dict[str, object]] = []
+        threads: dict[int, str] = {}
+        for span in spans:
+            threads.setdefault(span.thread_id, span.thread_name)
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": "scraparse",
+                    "ph": "X",
+                    "ts": span.start_ns / 1000,
+                    "dur": span.duration_ns / 1000,
+                    "pid": pid,
+                    "tid": span.thread_id,
+                    "args": {"span_id": span.span_id, "parent_id": span.parent_id, **span.attrs},
+                }
+            )
+        for thread_id, thread_name in threads.items():
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": thread_id,
+                    "args": {"name": thread_name},
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: Path) -> None:
+        path.write_text(json.dumps(self.to_chrome_trace(), default=str), encoding="utf-8")
+
+
+def current_tracer() -> Tracer | None:
+    return _CURRENT_TRACER.get()
+
+
+@contextmanager
+def activate(tracer: Tracer | None) -> Iterator[Tracer | None]:
+    token = _CURRENT_TRACER.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _CURRENT_TRACER.reset(token)
+
+
+@contextmanager
+def span(name: str, **attrs: object) -> Iterator[dict[str, object]]:
+    tracer = _CURRENT_TRACER.get()
+    if tracer is None:
+        yield attrs
+        return
+    with tracer.span(name, **attrs) as span_attrs:
+        yield span_attrs
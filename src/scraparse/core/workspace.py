@@ -3,9 +3,18 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 import json
+import logging
+import sqlite3
+import threading
 
+from scraparse.core.blob_store import BlobRef, BlobStore
+from scraparse.core.events import EVENTS_FILENAME
+from scraparse.core.run_store import RunStore
+from scraparse.core.tracing import span
 from scraparse.core.util import slugify_domain
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class WorkspacePaths:
@@ -15,15 +24,38 @@ class WorkspacePaths:
     parser_path: Path
     report_path: Path
     schema_path: Path
+    manifest_path: Path
+    events_path: Path
+    plan_path: Path
 
 
 class WorkspaceManager:
-    def __init__(self, base_dir: Path) -> None:
+    def __init__(
+        self,
+        base_dir: Path,
+        blob_store: BlobStore | None = None,
+        run_store: RunStore | None = None,
+    ) -> None:
         self.base_dir = base_dir
+        # When set, page bodies go to the shared store and runs keep only a manifest.
+        self.blob_store = blob_store
+        # When set, every report is also indexed for cross-run queries.
+        self.run_store = run_store
+        self._issued_run_ids: set[str] = set()
+        self._lock = threading.Lock()
 
     def make_run_id(self, url: str, timestamp: str) -> str:
         safe_domain = slugify_domain(url)
-        return f"{timestamp}_{safe_domain}"
+        base_id = f"{timestamp}_{safe_domain}"
+        # Concurrent runs against one domain can share a timestamp.
+        with self._lock:
+            run_id = base_id
+            suffix = 2
+            while run_id in self._issued_run_ids or (self.base_dir / run_id).exists():
+                run_id = f"{base_id}_{suffix}"
+                suffix += 1
+            self._issued_run_ids.add(run_id)
+            return run_id
 
     def create(self, run_id: str, save_artifacts: bool) -> WorkspacePaths:
         run_dir = self.base_dir / run_id
@@ -31,7 +63,10 @@ class WorkspaceManager:
         html_dir = artifacts_dir / "html"
         run_dir.mkdir(parents=True, exist_ok=True)
         if save_artifacts:
-            html_dir.mkdir(parents=True, exist_ok=True)
+            if self.blob_store is None:
+                html_dir.mkdir(parents=True, exist_ok=True)
+            else:
+                artifacts_dir.mkdir(parents=True, exist_ok=True)
         parser_path = run_dir / "parser.py"
         report_path = run_dir / "run_report.json"
         schema_path = artifacts_dir / "schema.json"
@@ -42,17 +77,44 @@ class WorkspaceManager:
             parser_path=parser_path,
             report_path=report_path,
             schema_path=schema_path,
+            manifest_path=artifacts_dir / "manifest.json",
+            events_path=run_dir / EVENTS_FILENAME,
+            plan_path=run_dir / "plan.json",
         )
 
     def write_parser(self, path: Path, content: str) -> None:
-        path.write_text(content, encoding="utf-8")
+        with span("workspace.write", kind="parser", path=str(path), bytes=len(content)):
+            path.write_text(content, encoding="utf-8")
+
+    def write_plan(self, path: Path, content: str) -> None:
+        with span("workspace.write", kind="plan", path=str(path), bytes=len(content)):
+            path.write_text(content, encoding="utf-8")
 
     def write_report(self, path: Path, report: dict[str, object]) -> None:
-        path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        with span("workspace.write", kind="report", path=str(path)):
+            path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        if self.run_store is not None:
+            with span("workspace.write", kind="run_store", path=str(self.run_store.path)):
+                try:
+                    self.run_store.record_report(report, path)
+                except sqlite3.Error as exc:
+                    # The JSON report is already on disk; `runs import` can backfill it.
+                    logger.warning("Could not index run %s: %s", report.get("run_id"), exc)
 
     def write_schema(self, path: Path, schema: dict[str, object]) -> None:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(json.dumps(schema, indent=2), encoding="utf-8")
+        with span("workspace.write", kind="schema", path=str(path)):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(schema, indent=2), encoding="utf-8")
+
+    def write_manifest(self, path: Path, blobs: dict[str, BlobRef]) -> None:
+        assert self.blob_store is not None
+        manifest = {
+            "store": str(self.blob_store.root),
+            "pages": [{"url": url, **ref.to_dict()} for url, ref in blobs.items()],
+        }
+        with span("workspace.write", kind="manifest", path=str(path)):
+            path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
 
     def write_html(self, path: Path, content: bytes) -> None:
-        path.write_bytes(content)
+        with span("workspace.write", kind="html", path=str(path), bytes=len(content)):
+            path.write_bytes(content)
@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import AbstractContextManager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+import json
+import threading
+import time
+
+from scraparse.adapters.llm.base import LLMClient, Message
+from scraparse.cli.schema_editor import AutoApproveSchemaEditor
+from scraparse.core.deadline import Deadline
+from scraparse.core.errors import ConfigError, LimitExceededError
+from scraparse.core.limits import Limits, LimitTracker
+from scraparse.core.models import OUTPUT_MODES, FetchResult, FieldSchema, RunSpec
+from scraparse.core.parser_registry import ParserRegistry
+from scraparse.core.run_memo import RunMemo
+from scraparse.core.sandbox import SandboxPool
+from scraparse.core.workspace import WorkspaceManager
+from scraparse.engine.orchestrator import Orchestrator, OrchestratorDeps
+from scraparse.plugins.ai.plan_generator import PlanGenerator
+from scraparse.plugins.ai.prompt_renderer import PromptRenderer
+from scraparse.plugins.ai.schema_generator import SchemaGenerator
+from scraparse.plugins.ai.script_generator import ScriptGenerator
+from scraparse.plugins.ai.token_budget import TokenEstimator
+from scraparse.plugins.fetchers.base import Fetcher
+
+DISCOVERY_STRATEGIES = {"crawl", "pagination", "listing"}
+
+
+@dataclass(frozen=True)
+class BatchConfig:
+    workers: int = 4
+    max_concurrent_fetches: int = 8
+    max_concurrent_llm: int = 4
+    max_total_bytes: int = 500_000_000
+
+
+@dataclass
+class BatchItem:
+    line_no: int
+    spec: RunSpec
+
+
+@dataclass
+class BatchResult:
+    line_no: int
+    url: str
+    run_id: str
+    parser_path: str
+    report_path: str
+    pages: int
+    bytes_total: int
+    duration_s: float
+    errors: list[str]
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "line": self.line_no,
+            "url": self.url,
+            "ok": self.ok,
+            "run_id": self.run_id,
+            "parser_path": self.parser_path,
+            "report_path": self.report_path,
+            "pages": self.pages,
+            "bytes_total": self.bytes_total,
+            "duration_s": round(self.duration_s, 3),
+            "errors": self.errors,
+        }
+
+
+@dataclass
+class BatchSummary:
+    runs: int
+    succeeded: int
+    pages: int
+    bytes_total: int
+    wall_s: float
+
+    @property
+    def failed(self) -> int:
+        return self.runs - self.succeeded
+
+    def lines(self) -> list[str]:
+        wall = max(self.wall_s, 1e-9)
+        return [
+            f"Runs: {self.runs} ({self.succeeded} succeeded, {self.failed} failed)",
+            f"Pages fetched: {self.pages} ({self.pages / wall:.2f} pages/s)",
+            f"Bytes fetched: {self.bytes_total} ({self.bytes_total / wall:.0f} bytes/s)",
+            f"Wall time: {self.wall_s:.2f}s ({self.runs * 60 / wall:.2f} runs/min)",
+        ]
+
+
+def load_manifest(path: Path, base_limits: Limits) -> list[BatchItem]:
+    items: list[BatchItem] = []
+    with path.open("r", encoding="utf-8") as handle:
+        for line_no, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+                items.append(BatchItem(line_no, _spec_from_dict(data, base_limits)))
+            except (ValueError, TypeError) as exc:
+                raise ConfigError(f"{path}:{line_no}: invalid manifest entry: {exc}") from exc
+    return items
+
+
+def _spec_from_dict(data: object, base_limits: Limits) -> RunSpec:
+    if not isinstance(data, dict):
+        raise ValueError("entry must be a JSON object")
+    url = str(data.get("url") or "").strip()
+    prompt = str(data.get("prompt") or "").strip()
+    schema_data = data.get("schema")
+    schema = FieldSchema.from_dict(schema_data) if isinstance(schema_data, dict) else None
+    if not url:
+        raise ValueError("'url' is required")
+    if not prompt and schema is None:
+        raise ValueError("'prompt' or 'schema' is required")
+    discover_mode = data.get("discover_mode")
+    discover = bool(data.get("discover")) or discover_mode is not None
+    strategy = str(discover_mode or "crawl") if discover else "none"
+    if discover and strategy not in DISCOVERY_STRATEGIES:
+        raise ValueError(f"unknown discover_mode: {strategy}")
+    output_mode = str(data.get("output_mode") or "script")
+    if output_mode not in OUTPUT_MODES:
+        raise ValueError(f"unknown output_mode: {output_mode}")
+    raw_limits = data.get("limits") or {}
+    if not isinstance(raw_limits, dict):
+        raise ValueError("'limits' must be an object")
+    return RunSpec(
+        url=url,
+        discover=discover,
+        discover_strategy=strategy,
+        prompt=prompt,
+        context=str(data.get("context") or ""),
+        promptpack=str(data.get("promptpack") or "default"),
+        save_artifacts=bool(data.get("save_artifacts", False)),
+        mode="batch",
+        limits=base_limits.with_overrides(raw_limits),
+        next_selector=data.get("next_selector"),
+        detail_selector=data.get("detail_selector"),
+        schema=schema,
+        trace=bool(data.get("trace", False)),
+        force_regenerate=bool(data.get("force_regenerate", False)),
+        output_mode=output_mode,
+    )
+
+
+class SharedByteBudget:
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def check(self) -> None:
+        with self._lock:
+            used = self.used
+        if used >= self.max_bytes:
+            raise LimitExceededError(
+                "batch_max_total_bytes",
+                "Batch byte budget exhausted",
+                {"total_bytes": used},
+                self.max_bytes,
+            )
+
+    def add(self, count: int) -> None:
+        with self._lock:
+            self.used += count
+
+
+class BoundedFetcher:
+    def __init__(
+        self, inner: Fetcher, slots: threading.BoundedSemaphore, budget: SharedByteBudget
+    ) -> None:
+        self.inner = inner
+        self.slots = slots
+        self.budget = budget
+
+    def fetch(self, url: str, tracker: LimitTracker) -> FetchResult:
+        self.budget.check()
+        with self.slots:
+            result = self.inner.fetch(url, tracker)
+        self.budget.add(result.size)
+        return result
+
+
+class BoundedLLMClient:
+    def __init__(self, inner: LLMClient, slots: threading.BoundedSemaphore) -> None:
+        self.inner = inner
+        self.slots = slots
+
+    def complete(
+        self,
+        messages: list[Message],
+        model: str | None = None,
+        temperature: float = 0,
+        deadline: Deadline | None = None,
+    ) -> str:
+        with self.slots:
+            # Without an explicit model the wrapped client keeps its own default.
+            if model is None:
+                return self.inner.complete(messages, temperature=temperature, deadline=deadline)
+            return self.inner.complete(
+                messages, model=model, temperature=temperature, deadline=deadline
+            )
+
+
+class BatchRunner:
+    def __init__(
+        self,
+        config: BatchConfig,
+        llm: LLMClient,
+        workspace: WorkspaceManager,
+        renderer_factory: Callable[[str], PromptRenderer],
+        fetcher_factory: Callable[[Limits], AbstractContextManager[Fetcher]],
+        token_estimator: TokenEstimator | None = None,
+        memo: RunMemo | None = None,
+        registry: ParserRegistry | None = None,
+        sandbox: SandboxPool | None = None,
+    ) -> None:
+        self.config = config
+        self.memo = memo
+        self.registry = registry
+        self.sandbox = sandbox
+        self.workspace = workspace
+        self.renderer_factory = renderer_factory
+        self.fetcher_factory = fetcher_factory
+        self.token_estimator = token_estimator or TokenEstimator()
+        self.llm = BoundedLLMClient(llm, threading.BoundedSemaphore(config.max_concurrent_llm))
+        self.fetch_slots = threading.BoundedSemaphore(config.max_concurrent_fetches)
+        self.byte_budget = SharedByteBudget(config.max_total_bytes)
+        # Parent of every run deadline; cancelling it stops in-flight runs.
+        self.deadline = Deadline()
+
+    def cancel(self, reason: str = "batch cancelled") -> None:
+        self.deadline.cancel(reason)
+
+    def run(
+        self,
+        items: list[BatchItem],
+        output_path: Path,
+        on_result: Callable[[BatchResult], None] | None = None,
+    ) -> BatchSummary:
+        started = time.perf_counter()
+        succeeded = pages = bytes_total = 0
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with output_path.open("w", encoding="utf-8") as out, ThreadPoolExecutor(
+            max_workers=self.config.workers, thread_name_prefix="scraparse-batch"
+        ) as pool:
+            futures: dict[Future[BatchResult], BatchItem] = {
+                pool.submit(self._run_one, item): item for item in items
+            }
+            try:
+                for future in as_completed(futures):
+                    result = future.result()
+                    out.write(json.dumps(result.to_dict()) + "\n")
+                    out.flush()
+                    succeeded += int(result.ok)
+                    pages += result.pages
+                    bytes_total += result.bytes_total
+                    if on_result is not None:
+                        on_result(result)
+            except KeyboardInterrupt:
+                self.cancel("interrupted")
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+        return BatchSummary(
+            runs=len(items),
+            succeeded=succeeded,
+            pages=pages,
+            bytes_total=bytes_total,
+            wall_s=time.perf_counter() - started,
+        )
+
+    def _run_one(self, item: BatchItem) -> BatchResult:
+        spec = item.spec
+        started = time.perf_counter()
+        try:
+            renderer = self.renderer_factory(spec.promptpack)
+            with self.fetcher_factory(spec.limits) as fetcher:
+                orchestrator = Orchestrator(
+                    OrchestratorDeps(
+                        schema_generator=SchemaGenerator(self.llm, renderer),
+                        script_generator=ScriptGenerator(self.llm, renderer),
+                        fetcher=BoundedFetcher(fetcher, self.fetch_slots, self.byte_budget),
+                        workspace=self.workspace,
+                        schema_editor=AutoApproveSchemaEditor(),
+                        token_estimator=self.token_estimator,
+                        memo=self.memo,
+                        registry=self.registry,
+                        sandbox=self.sandbox,
+                        plan_generator=PlanGenerator(self.llm, renderer),
+                    )
+                )
+                outcome = orchestrator.run(spec, parent_deadline=self.deadline)
+        except Exception as exc:  # one broken run must not stop the batch
+            return BatchResult(
+                line_no=item.line_no,
+                url=spec.url,
+                run_id="",
+                parser_path="",
+                report_path="",
+                pages=0,
+                bytes_total=0,
+                duration_s=time.perf_counter() - started,
+                errors=[f"{type(exc).__name__}: {exc}"],
+            )
+        return BatchResult(
+            line_no=item.line_no,
+            url=spec.url,
+            run_id=outcome.run_id,
+            parser_path=outcome.parser_path,
+            report_path=outcome.report_path,
+            pages=len(outcome.fetched_urls),
+            bytes_total=outcome.bytes_total,
+            duration_s=time.perf_counter() - started,
+            errors=outcome.errors,
+        )
@@ -0,0 +1,495 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Protocol
+import csv
+import glob
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import tempfile
+import time
+
+from scraparse.core.blob_store import BlobStore
+from scraparse.core.columnar import (
+    ColumnNormalizer,
+    ColumnWriter,
+    JsonColumnWriter,
+    ParquetColumnWriter,
+)
+from scraparse.core.errors import ConfigError, ValidationError
+from scraparse.core.extract_state import ExtractState, parser_version
+from scraparse.core.extraction_plan import load_plan
+from scraparse.core.models import FieldSchema
+from scraparse.core.parser_runner import call_parser_main
+from scraparse.core.script_validation import validate_script
+
+if TYPE_CHECKING:
+    from scraparse.core.plan_engine import CompiledPlan
+
+SOURCE_COLUMN = "_source"
+HTML_SUFFIXES = {".html", ".htm"}
+MANIFEST_NAME = "manifest.json"
+PLAN_SUFFIX = ".json"
+# Rows normalized and written per columnar batch (one Parquet row group).
+COLUMN_BATCH_ROWS = 65_536
+
+
+@dataclass(frozen=True)
+class ExtractConfig:
+    workers: int = os.cpu_count() or 1
+    # Files handed to a worker per task; larger chunks mean less IPC per file.
+    chunk_size: int = 16
+    ordered: bool = True
+    output_format: str = "csv"
+    # Ignore stored hashes and parse every input; the state is still refreshed.
+    reparse_all: bool = False
+
+
+@dataclass(frozen=True)
+class ExtractInput:
+    source: str  # file path, or the page URL for blob-backed pages
+    path: str = ""
+    blob_root: str = ""
+    digest: str = ""
+    # Content hash this input had when the current parser version last ran on it.
+    known_hash: str = ""
+
+
+@dataclass
+class FileOutcome:
+    source: str
+    fieldnames: list[str] = field(default_factory=list)
+    rows: list[dict[str, str]] = field(default_factory=list)
+    error: str | None = None
+    duration_s: float = 0.0
+    content_hash: str = ""
+    # Unchanged since the last run: rows come from the extract state, not the parser.
+    reused: bool = False
+
+
+@dataclass
+class ExtractSummary:
+    files: int
+    failed: int
+    rows: int
+    wall_s: float
+    reused: int = 0
+    pruned: int = 0
+    # Values a columnar format could not convert to their field type.
+    invalid: dict[str, int] = field(default_factory=dict)
+
+    def lines(self) -> list[str]:
+        wall = max(self.wall_s, 1e-9)
+        parsed = self.files - self.failed - self.reused
+        lines = [
+            f"Files: {self.files} ({parsed} parsed, {self.reused} unchanged, "
+            f"{self.failed} failed)",
+            f"Rows: {self.rows} ({self.rows / wall:.1f} rows/s)",
+            f"Wall time: {self.wall_s:.2f}s ({self.files / wall:.1f} files/s)",
+        ]
+        if self.invalid:
+            counts = ", ".join(f"{name}={count}" for name, count in sorted(self.invalid.items()))
+            lines.append(f"Invalid values (written as null): {counts}")
+        return lines
+
+
+def resolve_parser(target: Path) -> Path:
+    """Accept a parser script, a ``plan.json``, or a run folder containing either."""
+    script = target
+    if target.is_dir():
+        script = target / "parser.py"
+        if not script.is_file() and (target / "plan.json").is_file():
+            script = target / "plan.json"
+    if not script.is_file():
+        raise ConfigError(f"No parser script at {script}")
+    return script
+
+
+def output_format_for(path: Path) -> str:
+    name = path.name.lower()
+    if name.endswith(".columns.jsonl"):
+        return "columns"
+    if name.endswith(".parquet"):
+        return "parquet"
+    return "jsonl" if name.endswith(".jsonl") else "csv"
+
+
+def resolve_schema(script_path: Path, explicit: Path | None = None) -> FieldSchema | None:
+    """The field schema for typed output: ``explicit``, else the parser's run folder."""
+    run_dir = script_path.parent
+    candidates = [explicit] if explicit else [
+        run_dir / "artifacts" / "schema.json",
+        run_dir / "run_report.json",
+    ]
+    for path in candidates:
+        if path is None or not path.is_file():
+            continue
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if path.name == "run_report.json":
+                data = data.get("schema")
+            if isinstance(data, dict):
+                return FieldSchema.from_dict(data)
+        except ValueError as exc:
+            raise ConfigError(f"{path}: invalid schema: {exc}") from exc
+    if explicit is not None:
+        raise ConfigError(f"No schema at {explicit}")
+    return None
+
+
+def collect_inputs(sources: Iterable[str]) -> list[ExtractInput]:
+    """Expand files, directories, globs and artifact manifests into parser inputs."""
+    inputs: list[ExtractInput] = []
+    for source in sources:
+        path = Path(source)
+        if path.is_dir():
+            manifest = path / "artifacts" / MANIFEST_NAME
+            if manifest.is_file():
+                inputs.extend(_manifest_inputs(manifest))
+            else:
+                inputs.extend(
+                    ExtractInput(source=str(item), path=str(item))
+                    for item in sorted(path.rglob("*"))
+                    if item.suffix.lower() in HTML_SUFFIXES and item.is_file()
+                )
+        elif path.is_file() and path.name == MANIFEST_NAME:
+            inputs.extend(_manifest_inputs(path))
+        elif path.is_file():
+            inputs.append(ExtractInput(source=str(path), path=str(path)))
+        else:
+            matches = sorted(glob.glob(source, recursive=True))
+            if not matches:
+                raise ConfigError(f"No input files match {source}")
+            inputs.extend(
+                ExtractInput(source=match, path=match)
+                for match in matches
+                if Path(match).is_file()
+            )
+    return inputs
+
+
+def _manifest_inputs(path: Path) -> list[ExtractInput]:
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+        root = str(manifest["store"])
+        return [
+            ExtractInput(source=str(page["url"]), blob_root=root, digest=str(page["digest"]))
+            for page in manifest["pages"]
+        ]
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        raise ConfigError(f"{path}: invalid artifact manifest: {exc}") from exc
+
+
+class RowSink(Protocol):
+    def write(self, outcome: FileOutcome) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class CsvSink:
+    def __init__(self, path: Path) -> None:
+        self._handle = path.open("w", encoding="utf-8", newline="")
+        self._writer: csv.DictWriter[str] | None = None
+
+    def write(self, outcome: FileOutcome) -> None:
+        if not outcome.rows:
+            return
+        if self._writer is None:
+            # Columns come from the first file that produced rows.
+            self._writer = csv.DictWriter(
+                self._handle,
+                fieldnames=[SOURCE_COLUMN, *outcome.fieldnames],
+                restval="",
+                extrasaction="ignore",
+            )
+            self._writer.writeheader()
+        for row in outcome.rows:
+            self._writer.writerow({SOURCE_COLUMN: outcome.source, **row})
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+class JsonlSink:
+    def __init__(self, path: Path) -> None:
+        self._handle = path.open("w", encoding="utf-8")
+
+    def write(self, outcome: FileOutcome) -> None:
+        for row in outcome.rows:
+            self._handle.write(json.dumps({SOURCE_COLUMN: outcome.source, **row}) + "\n")
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+class ColumnarSink:
+    """Buffers rows into batches and writes them as typed columns."""
+
+    def __init__(
+        self,
+        path: Path,
+        schema: FieldSchema,
+        writer: Callable[[Path, dict[str, str]], ColumnWriter],
+        batch_rows: int = COLUMN_BATCH_ROWS,
+    ) -> None:
+        self.normalizer = ColumnNormalizer(schema, source_key=SOURCE_COLUMN)
+        self.invalid: dict[str, int] = {}
+        self._writer = writer(path, self.normalizer.types)
+        self._batch_rows = batch_rows
+        self._pending: list[dict[str, str]] = []
+
+    def write(self, outcome: FileOutcome) -> None:
+        self._pending.extend({SOURCE_COLUMN: outcome.source, **row} for row in outcome.rows)
+        if len(self._pending) >= self._batch_rows:
+            self._flush()
+
+    def close(self) -> None:
+        try:
+            self._flush()
+        finally:
+            self._writer.close()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        batch = self.normalizer.normalize(self._pending)
+        self._pending = []
+        for name, count in batch.invalid.items():
+            self.invalid[name] = self.invalid.get(name, 0) + count
+        self._writer.write(batch)
+
+
+SINKS: dict[str, Callable[[Path], RowSink]] = {"csv": CsvSink, "jsonl": JsonlSink}
+COLUMN_WRITERS: dict[str, Callable[[Path, dict[str, str]], ColumnWriter]] = {
+    "parquet": ParquetColumnWriter,
+    "columns": JsonColumnWriter,
+}
+
+
+class ExtractRunner:
+    """Run one generated parser over many HTML files on a process pool.
+
+    Each worker imports the parser once and then calls its ``main()`` per
+    file with ``sys.argv`` and stdout redirected, so the per-file cost is
+    the parse itself rather than a Python start-up. Extraction plans are
+    compiled once per worker and run in-process without the CSV round trip.
+    With an ``ExtractState``, inputs whose content hash and parser version
+    match the last run skip the parse and reuse their stored rows. Only a bounded window
+    of chunks is in flight, which keeps memory flat for any input size.
+    """
+
+    def __init__(self, config: ExtractConfig) -> None:
+        if config.output_format not in SINKS and config.output_format not in COLUMN_WRITERS:
+            raise ConfigError(f"Unknown output format: {config.output_format}")
+        self.config = config
+
+    def run(
+        self,
+        script_path: Path,
+        inputs: list[ExtractInput],
+        output_path: Path,
+        on_failure: Callable[[FileOutcome], None] | None = None,
+        state: ExtractState | None = None,
+        schema: FieldSchema | None = None,
+    ) -> ExtractSummary:
+        text = script_path.read_text(encoding="utf-8")
+        if script_path.suffix == PLAN_SUFFIX:
+            # bs4 is only needed for plans; parser.py workers import their own.
+            from scraparse.core.plan_engine import CompiledPlan
+
+            try:
+                CompiledPlan(load_plan(text))
+            except ValueError as exc:  # soupsieve's syntax error is a ValueError too
+                raise ValidationError(f"Extraction plan is invalid: {exc}") from exc
+        else:
+            problems = validate_script(text, performance=False)
+            if problems:
+                raise ValidationError("Parser failed validation: " + "; ".join(problems))
+        started = time.perf_counter()
+        files = failed = rows = reused = 0
+        parser_sha = parser_version(text)
+        if state is not None and not self.config.reparse_all:
+            known = state.hashes([item.source for item in inputs], parser_sha)
+            inputs = [replace(item, known_hash=known.get(item.source, "")) for item in inputs]
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        sink = self._sink(output_path, schema)
+        size = max(1, self.config.chunk_size)
+        chunks = [inputs[idx : idx + size] for idx in range(0, len(inputs), size)]
+        try:
+            with ProcessPoolExecutor(
+                max_workers=max(1, self.config.workers),
+                initializer=_init_worker,
+                initargs=(str(script_path.resolve()),),
+            ) as pool:
+                for outcomes in self._results(pool, chunks):
+                    if state is not None:
+                        self._sync_state(state, outcomes, parser_sha)
+                    for outcome in outcomes:
+                        files += 1
+                        rows += len(outcome.rows)
+                        reused += outcome.reused
+                        if outcome.error is not None:
+                            failed += 1
+                            if on_failure is not None:
+                                on_failure(outcome)
+                        sink.write(outcome)
+        finally:
+            sink.close()
+        invalid = sink.invalid if isinstance(sink, ColumnarSink) else {}
+        pruned = state.retain(item.source for item in inputs) if state is not None else 0
+        return ExtractSummary(
+            files=files,
+            failed=failed,
+            rows=rows,
+            wall_s=time.perf_counter() - started,
+            reused=reused,
+            pruned=pruned,
+            invalid=invalid,
+        )
+
+    def _sink(self, output_path: Path, schema: FieldSchema | None) -> RowSink:
+        fmt = self.config.output_format
+        if fmt in SINKS:
+            return SINKS[fmt](output_path)
+        if schema is None:
+            raise ConfigError(f"{fmt} output needs the field schema (pass --schema)")
+        try:
+            return ColumnarSink(output_path, schema, COLUMN_WRITERS[fmt])
+        except ImportError as exc:
+            raise ConfigError(str(exc)) from exc
+
+    @staticmethod
+    def _sync_state(state: ExtractState, outcomes: list[FileOutcome], parser_sha: str) -> None:
+        """Fill unchanged outcomes from the state and record freshly parsed ones."""
+        fresh = []
+        for outcome in outcomes:
+            if outcome.reused:
+                stored = state.rows(outcome.source)
+                if stored is None:  # the entry vanished since the hash lookup
+                    outcome.reused = False
+                    outcome.error = "Stored rows missing; run again to re-parse"
+                    continue
+                outcome.fieldnames, outcome.rows = stored.fieldnames, stored.rows
+            elif outcome.error is None and outcome.content_hash:
+                fresh.append(
+                    (outcome.source, outcome.content_hash, outcome.fieldnames, outcome.rows)
+                )
+        if fresh:
+            state.store(fresh, parser_sha)
+
+    def _results(
+        self, pool: ProcessPoolExecutor, chunks: list[list[ExtractInput]]
+    ) -> Iterator[list[FileOutcome]]:
+        window = max(1, self.config.workers) * 2
+        pending: deque[Future[list[FileOutcome]]] = deque()
+        remaining = iter(chunks)
+
+        def refill() -> None:
+            while len(pending) < window:
+                chunk = next(remaining, None)
+                if chunk is None:
+                    return
+                pending.append(pool.submit(_parse_chunk, chunk))
+
+        refill()
+        while pending:
+            if self.config.ordered:
+                future = pending.popleft()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                future = done.pop()
+                pending.remove(future)
+            outcomes = future.result()
+            refill()
+            yield outcomes
+
+
+def failure_record(outcome: FileOutcome) -> dict[str, object]:
+    record = asdict(outcome)
+    record.pop("rows")
+    record.pop("fieldnames")
+    return record
+
+
+# Worker side. State lives at module level because each pool process
+# imports the parser (or compiles the plan) exactly once in ``_init_worker``.
+_parser_main: Callable[[], object] | None = None
+_plan: CompiledPlan | None = None
+_parser_path = ""
+_load_error: str | None = None
+
+
+def _init_worker(script_path: str) -> None:
+    global _parser_main, _parser_path, _load_error, _plan
+    _parser_path = script_path
+    try:
+        if script_path.endswith(PLAN_SUFFIX):
+            from scraparse.core.plan_engine import CompiledPlan
+
+            _plan = CompiledPlan(load_plan(Path(script_path).read_text(encoding="utf-8")))
+            return
+        spec = importlib.util.spec_from_file_location("scraparse_generated_parser", script_path)
+        if spec is None or spec.loader is None:
+            raise ImportError(f"cannot load {script_path}")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        main = getattr(module, "main", None)
+        if not callable(main):
+            raise AttributeError("parser has no main() function")
+        _parser_main = main
+    except Exception as exc:  # reported once per chunk instead of killing the pool
+        _load_error = f"{type(exc).__name__}: {exc}"
+
+
+def _parse_chunk(chunk: list[ExtractInput]) -> list[FileOutcome]:
+    if _load_error is not None or (_parser_main is None and _plan is None):
+        raise ValidationError(f"Parser could not be loaded: {_load_error}")
+    return [_parse_one(item) for item in chunk]
+
+
+def _parse_one(item: ExtractInput) -> FileOutcome:
+    started = time.perf_counter()
+    outcome = FileOutcome(source=item.source)
+    try:
+        if item.digest:
+            # Blob digests are content hashes already; unchanged blobs are never read.
+            outcome.content_hash = item.digest
+            if item.known_hash == item.digest:
+                outcome.reused = True
+                outcome.duration_s = time.perf_counter() - started
+                return outcome
+            content = BlobStore(Path(item.blob_root)).read_bytes(item.digest)
+        else:
+            content = Path(item.path).read_bytes()
+            outcome.content_hash = hashlib.sha256(content).hexdigest()
+            if item.known_hash == outcome.content_hash:
+                outcome.reused = True
+                outcome.duration_s = time.perf_counter() - started
+                return outcome
+        if _plan is not None:
+            outcome.rows = _plan.extract(content, base_url=item.source if item.digest else "")
+            outcome.fieldnames = _plan.fieldnames
+            outcome.duration_s = time.perf_counter() - started
+            return outcome
+        assert _parser_main is not None
+        if item.digest:
+            # The parser reads paths, so blob bodies are materialized briefly.
+            with tempfile.NamedTemporaryFile(suffix=".html") as handle:
+                handle.write(content)
+                handle.flush()
+                text = call_parser_main(_parser_main, _parser_path, handle.name)
+        else:
+            text = call_parser_main(_parser_main, _parser_path, item.path)
+        reader = csv.DictReader(io.StringIO(text))
+        outcome.rows = list(reader)
+        outcome.fieldnames = list(reader.fieldnames or [])
+    except Exception as exc:  # one bad page must not stop the others
+        outcome.error = f"{type(exc).__name__}: {exc}"
+    outcome.duration_s = time.perf_counter() - started
+    return outcome
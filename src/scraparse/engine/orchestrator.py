@@ -1,20 +1,43 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterator
+from urllib.parse import urlparse
+import itertools
+import sqlite3
+import tempfile
+
 from scraparse.cli.schema_editor import SchemaEditor
-from scraparse.core.errors import LimitExceededError, ScraparseError, ValidationError
+from scraparse.core.artifact_writer import ArtifactWriter
+from scraparse.core.deadline import Deadline
+from scraparse.core.errors import ConfigError, LimitExceededError, ScraparseError, ValidationError
 from scraparse.core.limits import LimitTracker
-from scraparse.core.models import FetchResult, RunOutcome, RunSpec
-from scraparse.core.script_validation import validate_script
+from scraparse.core.models import FetchResult, FieldSchema, RunOutcome, RunSpec
+from scraparse.core.extraction_plan import apply_defaults, load_plan, validate_plan
+from scraparse.core.fingerprint import MAX_SHAPE_CHARS, PageFingerprint, fingerprint
+from scraparse.core.page_store import PageStore
+from scraparse.core.parser_registry import ParserRegistry
+from scraparse.core.parser_runner import PARSER_TIMEOUT_S, ParserCheck, check_parser, score_rows
+from scraparse.core.profiling import StageProfiler, profile_stage
+from scraparse.core.run_memo import MemoEntry, RunMemo, memo_key, prompt_key
+from scraparse.core.sandbox import SandboxPool
+from scraparse.core import events, profiling, tracing
+from scraparse.core.events import EventLog, summarize_events
+from scraparse.core.script_validation import check_script, validate_script
+from scraparse.core.timing import RunTimings, activate, stage
 from scraparse.core.util import now_utc_iso
-from scraparse.core.workspace import WorkspaceManager
+from scraparse.core.workspace import WorkspaceManager, WorkspacePaths
+from scraparse.plugins.ai.plan_generator import PlanGenerator
 from scraparse.plugins.ai.schema_generator import SchemaGenerator
 from scraparse.plugins.ai.script_generator import ScriptGenerator
-from scraparse.plugins.discovery.crawl import CrawlDiscovery
-from scraparse.plugins.discovery.pagination import PaginationDiscovery
-from scraparse.plugins.discovery.listing import ListingDiscovery
+from scraparse.plugins.ai.token_budget import PackedPrompt, PromptPacker, TokenEstimator
+from scraparse.plugins.discovery.base import DiscoveryPlugin
 from scraparse.plugins.fetchers.base import Fetcher
+from scraparse.plugins.fetchers.observing import ObservingFetcher
+from scraparse.plugins.fetchers.storing import StoringFetcher
 
 
 @dataclass
@@ -24,56 +47,254 @@ class OrchestratorDeps:
     fetcher: Fetcher
     workspace: WorkspaceManager
     schema_editor: SchemaEditor
+    token_estimator: TokenEstimator = field(default_factory=TokenEstimator)
+    memo: RunMemo | None = None
+    registry: ParserRegistry | None = None
+    sandbox: SandboxPool | None = None
+    plan_generator: PlanGenerator | None = None
+
+# Room kept in the prompt for validation feedback on retries.
+VALIDATION_FEEDBACK_TOKENS = 512
+TRACE_FILENAME = "trace.json"
+LIMIT_CHECKPOINT_PAGES = 10
+# Registry candidates test-run on the fetched pages before falling back to the LLM.
+REGISTRY_CANDIDATES = 3
+# Fetched pages a candidate parser is test-run on in the sandbox.
+SANDBOX_MAX_PAGES = 20
+
+
+def _write_samples(directory: Path, pages: list[FetchResult]) -> list[Path]:
+    paths: list[Path] = []
+    for idx, page in enumerate(pages, start=1):
+        path = directory / f"{idx}.html"
+        path.write_bytes(page.content_bytes)
+        paths.append(path)
+    return paths
+
+
+@contextmanager
+def _stage(name: str, **attrs: object) -> Iterator[dict[str, object]]:
+    with stage(name, **attrs) as stage_attrs, profile_stage(name):
+        yield stage_attrs
 
 
 class Orchestrator:
     def __init__(self, deps: OrchestratorDeps) -> None:
         self.deps = deps
 
-    def run(self, spec: RunSpec) -> RunOutcome:
+    def run(self, spec: RunSpec, parent_deadline: Deadline | None = None) -> RunOutcome:
+        timings = RunTimings()
+        profiler = StageProfiler() if spec.profile else None
+        tracer = tracing.Tracer() if spec.trace else None
+        with activate(timings), profiling.activate(profiler), tracing.activate(tracer):
+            with tracing.span("orchestrator.run", url=spec.url) as attrs:
+                outcome = self._run(spec, timings, profiler, parent_deadline)
+                attrs.update(run_id=outcome.run_id, pages=len(outcome.fetched_urls))
+        if tracer is not None:
+            tracer.write_chrome_trace(Path(outcome.report_path).parent / TRACE_FILENAME)
+        if profiler is not None:
+            outcome.profile_summary = profiler.summary()
+        return outcome
+
+    def _run(
+        self,
+        spec: RunSpec,
+        timings: RunTimings,
+        profiler: StageProfiler | None,
+        parent_deadline: Deadline | None,
+    ) -> RunOutcome:
         start_iso = now_utc_iso()
         run_id = self._make_run_id(spec)
         paths = self.deps.workspace.create(run_id, spec.save_artifacts)
-        tracker = LimitTracker(spec.limits)
+        if profiler is not None:
+            profiler.output_dir = paths.run_dir / "profile"
+        log = EventLog(paths.events_path)
+        try:
+            with events.activate(log):
+                log.emit(
+                    "run_started",
+                    run_id=run_id,
+                    url=spec.url,
+                    discover_strategy=spec.discover_strategy,
+                )
+                return self._execute(
+                    spec, run_id, start_iso, paths, timings, profiler, parent_deadline
+                )
+        finally:
+            log.close()
+
+    def _execute(
+        self,
+        spec: RunSpec,
+        run_id: str,
+        start_iso: str,
+        paths: WorkspacePaths,
+        timings: RunTimings,
+        profiler: StageProfiler | None,
+        parent_deadline: Deadline | None,
+    ) -> RunOutcome:
+        tracker = LimitTracker(spec.limits, parent_deadline=parent_deadline)
         errors: list[str] = []
         fetched: list[FetchResult] = []
         parser_path = ""
         schema_dict: dict[str, object] | None = None
+        packed: PackedPrompt | None = None
+        writer: ArtifactWriter | None = None
+        if spec.save_artifacts:
+            writer = ArtifactWriter(blob_store=self.deps.workspace.blob_store)
+        fetcher: Fetcher = ObservingFetcher(
+            self.deps.fetcher, self._page_observer(tracker, writer, paths.html_dir)
+        )
+        # Bodies past the RAM threshold spill to disk; later stages read them lazily.
+        page_store = PageStore(spec.limits.page_store_ram_bytes)
+        fetcher = StoringFetcher(fetcher, page_store)
+        memo = self.deps.memo
+        key = memo_key(spec) if memo is not None else ""
+        memo_entry: MemoEntry | None = None
+        memo_info: dict[str, object] | None = None
+        if memo is not None:
+            memo_info = {"key": key, "schema": "miss", "parser": "miss"}
+            if spec.force_regenerate:
+                memo_info.update(schema="forced", parser="forced")
+            else:
+                memo_entry = memo.load(key)
+        plan_mode = spec.output_mode == "plan"
+        registry = self.deps.registry
+        registry_info: dict[str, object] | None = None
+        if registry is not None:
+            registry_info = {
+                "prompt_key": prompt_key(spec),
+                "parser": "forced" if spec.force_regenerate else "miss",
+            }
 
         try:
             tracker.check_runtime()
-            schema = self.deps.schema_generator.generate(spec.prompt, spec.context)
-            schema = self.deps.schema_editor.confirm(schema)
-            schema_dict = schema.to_dict()
-            if spec.save_artifacts:
-                self.deps.workspace.write_schema(paths.schema_path, schema.to_dict())
+            schema: FieldSchema | None = None
+            if spec.schema is not None:
+                schema = spec.schema
+            elif memo_entry is not None and memo_info is not None:
+                schema = memo_entry.schema
+                memo_info["schema"] = "hit"
+                events.emit("memo_hit", kind="schema", key=key, run_id=memo_entry.run_id)
+            elif registry_info is None or spec.force_regenerate:
+                schema = self._generate_schema(spec, tracker)
+            # Otherwise the schema waits until the registry had a look at the pages.
+            if schema is not None:
+                schema_dict = schema.to_dict()
 
             tracker.check_runtime()
-            fetched = self._fetch_pages(spec, tracker)
-            if spec.save_artifacts:
-                for idx, result in enumerate(fetched, start=1):
-                    html_path = paths.html_dir / f"{idx}.html"
-                    self.deps.workspace.write_html(html_path, result.content_bytes)
-
-            html_samples = [result.content_text for result in fetched]
-            total_chars = sum(len(sample) for sample in html_samples)
-            if total_chars > spec.limits.max_html_chars_for_llm:
-                raise LimitExceededError(
-                    "max_html_chars_for_llm",
-                    "Max HTML chars for LLM exceeded",
-                    {"html_chars": total_chars},
-                    spec.limits.max_html_chars_for_llm,
-                )
+            with _stage("fetch", strategy=spec.discover_strategy):
+                fetched = self._fetch_pages(spec, tracker, fetcher)
+            events.emit("limit_checkpoint", **self._checkpoint(tracker))
+            if writer is not None:
+                # Pages were written while fetching; this only waits for the tail.
+                with _stage("artifact_write", pages=len(fetched)):
+                    writer.close()
+                    if writer.blob_store is not None:
+                        self.deps.workspace.write_manifest(paths.manifest_path, writer.blobs)
 
-            schema_json = self._schema_json_for_prompt(schema.to_dict())
-            tracker.check_runtime()
-            script = self._generate_valid_script(schema_json, html_samples)
-            tracker.check_runtime()
-            self.deps.workspace.write_parser(paths.parser_path, script)
-            parser_path = str(paths.parser_path)
+            script: str | None = None
+            check: ParserCheck | None = None
+            if memo_entry is not None and memo_entry.parser and memo_info is not None:
+                assert schema is not None
+                check = self._reuse_parser(
+                    memo_entry, schema, fetched, paths, tracker.deadline, memo_info, plan_mode
+                )
+                if check is not None:
+                    script = memo_entry.parser
+            page_print = None
+            if registry is not None and registry_info is not None and fetched:
+                first = fetched[0]
+                page_print = fingerprint(first.url, first.read_text(max_chars=MAX_SHAPE_CHARS))
+                registry_info["fingerprint"] = {
+                    "host": page_print.host,
+                    "url_template": page_print.url_template,
+                    "shape": f"{page_print.shape:016x}",
+                }
+                if script is None and not spec.force_regenerate:
+                    adopted = self._lookup_registry(
+                        registry,
+                        page_print,
+                        schema,
+                        fetched,
+                        paths,
+                        tracker.deadline,
+                        registry_info,
+                        plan_mode,
+                    )
+                    if adopted is not None:
+                        schema, script, check = adopted
+            if schema is None:
+                tracker.check_runtime()
+                schema = self._generate_schema(spec, tracker)
+            schema_dict = schema.to_dict()
+            if spec.save_artifacts:
+                self.deps.workspace.write_schema(paths.schema_path, schema_dict)
+            if script is None and plan_mode:
+                generator = self._plan_generator()
+                schema_json = self._schema_json_for_prompt(schema.to_dict())
+                with _stage("prompt_packing"):
+                    packed = self._pack_samples(spec, schema_json, fetched, generator)
+                tracker.check_runtime()
+                with _stage("plan_generation"):
+                    script, check = self._generate_valid_plan(
+                        generator, schema, schema_json, packed.samples, fetched, tracker.deadline
+                    )
+                with _stage("parser_write"):
+                    self.deps.workspace.write_plan(paths.plan_path, script)
+            elif script is None:
+                schema_json = self._schema_json_for_prompt(schema.to_dict())
+                with _stage("prompt_packing"):
+                    packed = self._pack_samples(
+                        spec, schema_json, fetched, self.deps.script_generator
+                    )
+                tracker.check_runtime()
+                with _stage("script_generation"):
+                    script, check = self._generate_valid_script(
+                        schema, schema_json, packed.samples, fetched, tracker.deadline
+                    )
+                tracker.check_runtime()
+                with _stage("parser_write"):
+                    self.deps.workspace.write_parser(paths.parser_path, script)
+            parser_path = str(paths.plan_path if plan_mode else paths.parser_path)
+            if memo is not None:
+                memo.save(key, schema.to_dict(), script, run_id)
+            if registry is not None and registry_info is not None and page_print is not None:
+                if check is None and plan_mode:
+                    with _stage("registry_update", pages=len(fetched)):
+                        check = self._dry_run_plan(script, schema, fetched)
+                elif check is None:
+                    with _stage("registry_update", pages=len(fetched)):
+                        check = check_parser(
+                            paths.parser_path,
+                            fetched,
+                            schema,
+                            timeout_s=tracker.deadline.timeout(PARSER_TIMEOUT_S),
+                        )
+                registry_info["registered"] = False
+                if check.ok:
+                    try:
+                        registry.register(
+                            page_print,
+                            str(registry_info["prompt_key"]),
+                            schema_dict,
+                            script,
+                            check.score,
+                            run_id,
+                        )
+                        registry_info["registered"] = True
+                    except sqlite3.Error as exc:
+                        # The parser is saved either way; only future reuse is lost.
+                        registry_info["error"] = str(exc)
         except ScraparseError as exc:
             errors.append(self._format_error(exc))
         finally:
+            if writer is not None and not writer.closed:
+                try:
+                    writer.close()
+                except ScraparseError as exc:
+                    errors.append(self._format_error(exc))
+            events.emit("run_finished", errors=errors, parser_path=parser_path)
             report = self._build_report(
                 run_id=run_id,
                 start_iso=start_iso,
@@ -84,8 +305,23 @@ class Orchestrator:
                 schema_dict=schema_dict,
                 schema_path=str(paths.schema_path) if spec.save_artifacts else None,
                 total_bytes=tracker.total_bytes,
+                truncation=tracker.truncation,
+                events_path=paths.events_path,
+                manifest_path=(
+                    paths.manifest_path
+                    if writer is not None and writer.blob_store is not None
+                    else None
+                ),
+                page_store=page_store.stats(),
+                memo_info=memo_info,
+                registry_info=registry_info,
+                packed=packed,
+                timings=timings,
+                profile_dir=str(profiler.output_dir) if profiler and profiler.output_dir else None,
+                trace_path=str(paths.run_dir / TRACE_FILENAME) if spec.trace else None,
                 end_iso=now_utc_iso(),
             )
+            page_store.close()
             self.deps.workspace.write_report(paths.report_path, report)
 
         return RunOutcome(
@@ -94,41 +330,334 @@ class Orchestrator:
             report_path=str(paths.report_path),
             fetched_urls=[result.url for result in fetched],
             errors=errors,
+            bytes_total=tracker.total_bytes,
         )
 
-    def _fetch_pages(self, spec: RunSpec, tracker: LimitTracker) -> list[FetchResult]:
+    def _page_observer(
+        self, tracker: LimitTracker, writer: ArtifactWriter | None, html_dir: Path
+    ) -> Callable[[FetchResult], None]:
+        counter = itertools.count(1)
+
+        def observe(result: FetchResult) -> None:
+            seq = next(counter)
+            artifact: str | None = None
+            if writer is not None and writer.blob_store is not None:
+                digest = result.content_hash
+                artifact = f"blob:{digest}"
+                writer.submit_blob(result.url, result.content_bytes, digest=digest)
+            elif writer is not None:
+                # Files are numbered in arrival order; page events map URLs to them.
+                html_path = html_dir / f"{seq}.html"
+                artifact = str(html_path)
+                writer.submit(html_path, result.content_bytes)
+            events.emit(
+                "page_fetched",
+                url=result.url,
+                host=urlparse(result.url).netloc,
+                status_code=result.status_code,
+                bytes=result.size,
+                content_hash=result.content_hash,
+                artifact=artifact,
+            )
+            if seq % LIMIT_CHECKPOINT_PAGES == 0:
+                events.emit("limit_checkpoint", **self._checkpoint(tracker))
+
+        return observe
+
+    def _generate_schema(self, spec: RunSpec, tracker: LimitTracker) -> FieldSchema:
+        with _stage("schema_generation"):
+            schema = self.deps.schema_generator.generate(
+                spec.prompt, spec.context, deadline=tracker.deadline
+            )
+        with _stage("editor_wait"):
+            return self.deps.schema_editor.confirm(schema)
+
+    def _check_stored_parser(
+        self,
+        parser: str,
+        schema: FieldSchema,
+        fetched: list[FetchResult],
+        paths: WorkspacePaths,
+        deadline: Deadline,
+        plan_mode: bool = False,
+    ) -> ParserCheck:
+        if plan_mode:
+            problems = self._plan_problems(parser, schema)
+            if problems:
+                return ParserCheck(rows=0, problems=problems)
+            self.deps.workspace.write_plan(paths.plan_path, parser)
+            return self._dry_run_plan(parser, schema, fetched)
+        # Stored parsers already passed the lints when generated; only safety is rechecked.
+        problems = validate_script(parser, performance=False)
+        if problems:
+            return ParserCheck(rows=0, problems=problems)
+        self.deps.workspace.write_parser(paths.parser_path, parser)
+        if self.deps.sandbox is not None:
+            # Same page cap as new candidates: the sandbox limits cover one job, not a crawl.
+            with tempfile.TemporaryDirectory(prefix="scraparse-samples-") as tmp:
+                sample_paths = _write_samples(Path(tmp), fetched[:SANDBOX_MAX_PAGES])
+                return self.deps.sandbox.run(parser, sample_paths, deadline).check(schema)
+        return check_parser(
+            paths.parser_path, fetched, schema, timeout_s=deadline.timeout(PARSER_TIMEOUT_S)
+        )
+
+    def _reuse_parser(
+        self,
+        entry: MemoEntry,
+        schema: FieldSchema,
+        fetched: list[FetchResult],
+        paths: WorkspacePaths,
+        deadline: Deadline,
+        memo_info: dict[str, object],
+        plan_mode: bool = False,
+    ) -> ParserCheck | None:
+        """Check the cached parser; return the check if it still fills required fields."""
+        assert entry.parser is not None
+        with _stage("parser_check", pages=len(fetched)) as attrs:
+            check = self._check_stored_parser(
+                entry.parser, schema, fetched, paths, deadline, plan_mode
+            )
+            memo_info["check"] = check.to_dict()
+            attrs["ok"] = check.ok
+        if not check.ok:
+            memo_info["parser"] = "stale"
+            events.emit("memo_miss", kind="parser", key=entry.key, problems=check.problems)
+            return None
+        memo_info["parser"] = "reused"
+        events.emit("memo_hit", kind="parser", key=entry.key, run_id=entry.run_id)
+        return check
+
+    def _lookup_registry(
+        self,
+        registry: ParserRegistry,
+        page_print: PageFingerprint,
+        schema: FieldSchema | None,
+        fetched: list[FetchResult],
+        paths: WorkspacePaths,
+        deadline: Deadline,
+        registry_info: dict[str, object],
+        plan_mode: bool = False,
+    ) -> tuple[FieldSchema, str, ParserCheck] | None:
+        """Adopt the closest stored parser for this page template that still scores."""
+        prompt = str(registry_info["prompt_key"])
+        with _stage("registry_lookup") as attrs:
+            try:
+                candidates = registry.candidates(page_print, prompt, limit=REGISTRY_CANDIDATES)
+            except sqlite3.Error as exc:
+                registry_info["error"] = str(exc)
+                candidates = []
+            if schema is not None:
+                # A fixed schema only accepts parsers written against that schema.
+                wanted = schema.to_dict()
+                candidates = [entry for entry in candidates if entry.schema == wanted]
+            attrs["candidates"] = len(candidates)
+        registry_info["candidates"] = len(candidates)
+        rejected: list[dict[str, object]] = []
+        for entry in candidates:
+            candidate_schema = FieldSchema.from_dict(entry.schema)
+            with _stage("parser_check", pages=len(fetched)) as attrs:
+                check = self._check_stored_parser(
+                    entry.parser, candidate_schema, fetched, paths, deadline, plan_mode
+                )
+                attrs["ok"] = check.ok
+            if not check.ok:
+                rejected.append({"run_id": entry.run_id, "problems": check.problems})
+                continue
+            registry.record_hit(entry.entry_id)
+            registry_info.update(
+                parser="reused",
+                run_id=entry.run_id,
+                distance=entry.distance,
+                check=check.to_dict(),
+            )
+            events.emit(
+                "registry_hit", run_id=entry.run_id, distance=entry.distance, score=check.score
+            )
+            return candidate_schema, entry.parser, check
+        if rejected:
+            registry_info["parser"] = "rejected"
+            registry_info["rejected"] = rejected
+        events.emit("registry_miss", candidates=len(candidates))
+        return None
+
+    @staticmethod
+    def _checkpoint(tracker: LimitTracker) -> dict[str, object]:
+        snapshot = tracker.snapshot()
+        # Per-host maps grow with the crawl; checkpoints keep only run-wide counters.
+        snapshot.pop("host_pages", None)
+        snapshot.pop("host_bytes", None)
+        return snapshot
+
+    def _fetch_pages(
+        self, spec: RunSpec, tracker: LimitTracker, fetcher: Fetcher
+    ) -> list[FetchResult]:
         if not spec.discover:
-            return [self.deps.fetcher.fetch(spec.url, tracker)]
+            return [fetcher.fetch(spec.url, tracker)]
+        # Discovery plugins load bs4, so only the strategy in use is imported.
         if spec.discover_strategy == "pagination":
-            plugin = PaginationDiscovery()
+            from scraparse.plugins.discovery.pagination import PaginationDiscovery
+
+            plugin: DiscoveryPlugin = PaginationDiscovery()
         elif spec.discover_strategy == "listing":
+            from scraparse.plugins.discovery.listing import ListingDiscovery
+
             plugin = ListingDiscovery()
         elif spec.discover_strategy == "crawl":
+            from scraparse.plugins.discovery.crawl import CrawlDiscovery
+
             plugin = CrawlDiscovery()
         else:
             raise ValidationError(f"Unknown discovery strategy: {spec.discover_strategy}")
         return plugin.discover(
             start_url=spec.url,
-            fetcher=self.deps.fetcher,
+            fetcher=fetcher,
             tracker=tracker,
             limits=spec.limits,
             next_selector=spec.next_selector,
             detail_selector=spec.detail_selector,
         )
 
+    def _pack_samples(
+        self,
+        spec: RunSpec,
+        schema_json: str,
+        fetched: list[FetchResult],
+        generator: ScriptGenerator | PlanGenerator,
+    ) -> PackedPrompt:
+        estimator = self.deps.token_estimator
+        packer = PromptPacker(
+            estimator,
+            max_prompt_tokens=spec.limits.max_prompt_tokens_for_llm,
+            reserve_output_tokens=spec.limits.reserve_output_tokens_for_llm,
+            max_sample_chars=spec.limits.max_html_chars_for_llm,
+        )
+        overhead_messages = generator.render_messages(schema_json, [])
+        overhead_tokens = VALIDATION_FEEDBACK_TOKENS + sum(
+            estimator.count(message.content) for message in overhead_messages
+        )
+        return packer.pack_sources(overhead_tokens, fetched)
+
     def _schema_json_for_prompt(self, schema: dict[str, object]) -> str:
         import json
 
         return json.dumps(schema, indent=2)
 
-    def _generate_valid_script(self, schema_json: str, html_samples: list[str]) -> str:
+    def _generate_valid_script(
+        self,
+        schema: FieldSchema,
+        schema_json: str,
+        html_samples: list[str],
+        fetched: list[FetchResult],
+        deadline: Deadline,
+    ) -> tuple[str, ParserCheck | None]:
+        """Generate until a script passes static checks and, with a sandbox, a test run.
+
+        Sandbox findings (exceptions, limits, slow pages, empty required
+        fields) are fed back to the next attempt like static errors.
+        Performance lint warnings do not block a script but ride along with
+        the feedback when another attempt is needed. The returned check
+        comes from the sandbox run, if there was one.
+        """
+        sandbox = self.deps.sandbox
+        with tempfile.TemporaryDirectory(prefix="scraparse-samples-") as tmp:
+            sample_paths: list[Path] = []
+            if sandbox is not None:
+                sample_paths = _write_samples(Path(tmp), fetched[:SANDBOX_MAX_PAGES])
+            feedback: list[str] = []
+            validation_errors: list[str] = []
+            for attempt in range(3):
+                script = self.deps.script_generator.generate(
+                    schema_json,
+                    html_samples,
+                    feedback,
+                    attempt=attempt + 1,
+                    deadline=deadline,
+                )
+                check: ParserCheck | None = None
+                run: dict[str, object] | None = None
+                with _stage("validation", attempt=attempt + 1) as attrs:
+                    static = check_script(script)
+                    validation_errors = static.errors
+                    if not validation_errors and sandbox is not None and sample_paths:
+                        result = sandbox.run(script, sample_paths, deadline)
+                        validation_errors = result.problems(schema, sandbox.limits.slow_page_s)
+                        check = result.check(schema)
+                        run = result.to_dict()
+                    attrs["errors"] = len(validation_errors)
+                    attrs["warnings"] = len(static.warnings)
+                events.emit(
+                    "validation",
+                    attempt=attempt + 1,
+                    errors=validation_errors,
+                    warnings=static.warnings,
+                    sandbox=run,
+                )
+                if not validation_errors:
+                    return script, check
+                feedback = validation_errors + static.warnings
+        raise ValidationError("Generated script failed validation: " + "; ".join(validation_errors))
+
+    def _plan_generator(self) -> PlanGenerator:
+        if self.deps.plan_generator is None:
+            raise ConfigError("Plan output mode needs a plan generator")
+        return self.deps.plan_generator
+
+    def _generate_valid_plan(
+        self,
+        generator: PlanGenerator,
+        schema: FieldSchema,
+        schema_json: str,
+        html_samples: list[str],
+        fetched: list[FetchResult],
+        deadline: Deadline,
+    ) -> tuple[str, ParserCheck]:
+        """Generate until the plan validates exactly and fills required fields on the pages.
+
+        Plans are data, so the dry run happens in-process with the same
+        engine that will execute them; no sandbox is needed.
+        """
         validation_errors: list[str] = []
         for attempt in range(3):
-            script = self.deps.script_generator.generate(schema_json, html_samples, validation_errors)
-            validation_errors = validate_script(script)
-            if not validation_errors:
-                return script
-        raise ValidationError("Generated script failed validation: " + "; ".join(validation_errors))
+            raw = generator.generate(
+                schema_json, html_samples, validation_errors, attempt=attempt + 1, deadline=deadline
+            )
+            check: ParserCheck | None = None
+            with _stage("validation", attempt=attempt + 1) as attrs:
+                validation_errors = self._plan_problems(raw, schema)
+                if not validation_errors:
+                    plan_json = apply_defaults(load_plan(raw), schema).to_json()
+                    check = self._dry_run_plan(plan_json, schema, fetched[:SANDBOX_MAX_PAGES])
+                    validation_errors = check.problems
+                attrs["errors"] = len(validation_errors)
+            events.emit("validation", attempt=attempt + 1, errors=validation_errors)
+            if check is not None and not validation_errors:
+                return plan_json, check
+        raise ValidationError("Generated plan failed validation: " + "; ".join(validation_errors))
+
+    @staticmethod
+    def _plan_problems(raw: str, schema: FieldSchema) -> list[str]:
+        try:
+            plan = load_plan(raw)
+        except ValueError as exc:
+            return [str(exc)]
+        return validate_plan(plan, schema)
+
+    @staticmethod
+    def _dry_run_plan(
+        plan_json: str, schema: FieldSchema, pages: list[FetchResult]
+    ) -> ParserCheck:
+        from scraparse.core.plan_engine import CompiledPlan
+
+        compiled = CompiledPlan(load_plan(plan_json))
+        rows: list[dict[str, str]] = []
+        for idx, page in enumerate(pages, start=1):
+            try:
+                rows.extend(compiled.extract(page.content_bytes, base_url=page.url))
+            except Exception as exc:  # report the page instead of failing the run
+                return ParserCheck(
+                    rows=0, problems=[f"Plan failed on sample {idx}: {type(exc).__name__}: {exc}"]
+                )
+        return score_rows(rows, schema)
 
     def _make_run_id(self, spec: RunSpec) -> str:
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
@@ -150,8 +679,40 @@ class Orchestrator:
         schema_dict: dict[str, object] | None,
         schema_path: str | None,
         total_bytes: int,
+        truncation: LimitExceededError | None,
+        events_path: Path,
+        manifest_path: Path | None,
+        page_store: dict[str, int],
+        memo_info: dict[str, object] | None,
+        registry_info: dict[str, object] | None,
+        packed: PackedPrompt | None,
+        timings: RunTimings,
+        profile_dir: str | None,
+        trace_path: str | None,
         end_iso: str,
     ) -> dict[str, object]:
+        llm_prompt: dict[str, object] | None = None
+        if packed is not None:
+            llm_prompt = packed.to_dict()
+            # Dropped samples are only counted so the report stays small on big crawls.
+            llm_prompt["samples"] = [
+                {"url": fetched[budget.index].url, **budget.to_dict()}
+                for budget in packed.sample_budgets
+                if budget.status != "dropped"
+            ]
+            llm_prompt["dropped_samples"] = sum(
+                1 for budget in packed.sample_budgets if budget.status == "dropped"
+            )
+        truncated: dict[str, object] | None = None
+        if truncation is not None:
+            truncated = {
+                "limit_name": truncation.limit_name,
+                "message": str(truncation),
+                "current": truncation.current,
+                "limit": truncation.limit,
+            }
+        # Per-page detail lives in the event stream; the report keeps aggregates.
+        summary = summarize_events(events_path)
         return {
             "run_id": run_id,
             "started_at": start_iso,
@@ -167,18 +728,25 @@ class Orchestrator:
                 "save_artifacts": spec.save_artifacts,
                 "next_selector": spec.next_selector,
                 "detail_selector": spec.detail_selector,
+                "output_mode": spec.output_mode,
             },
             "schema": schema_dict,
             "schema_path": schema_path,
             "limits": spec.limits.to_dict(),
-            "discovered_urls": [result.url for result in fetched],
-            "discovered_count": len(fetched),
-            "fetched_count": len(fetched),
+            "discovered_count": summary.pages_fetched,
+            "fetched_count": summary.pages_fetched,
             "bytes_total": total_bytes,
-            "bytes_per_page": {
-                result.url: len(result.content_bytes)
-                for result in fetched
-            },
+            "truncated": truncated,
+            "events_path": str(events_path.resolve()),
+            "events": summary.to_dict(),
+            "manifest_path": str(manifest_path) if manifest_path else None,
+            "page_store": page_store,
+            "memo": memo_info,
+            "registry": registry_info,
+            "llm_prompt": llm_prompt,
+            "timings": timings.to_dict(),
+            "profile_dir": profile_dir,
+            "trace_path": trace_path,
             "errors": errors,
             "parser_path": parser_path,
         }
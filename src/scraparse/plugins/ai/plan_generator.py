@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from scraparse.adapters.llm.base import LLMClient, Message
+from scraparse.core.deadline import Deadline
+from scraparse.core.timing import llm_call
+from scraparse.core.tracing import span
+from scraparse.plugins.ai.prompt_renderer import PromptRenderer
+
+
+class PlanGenerator:
+    """Asks the LLM for a declarative extraction plan instead of a parser script."""
+
+    def __init__(self, llm: LLMClient, renderer: PromptRenderer) -> None:
+        self.llm = llm
+        self.renderer = renderer
+
+    def generate(
+        self,
+        schema_json: str,
+        html_samples: list[str],
+        validation_errors: list[str] | None = None,
+        attempt: int = 1,
+        deadline: Deadline | None = None,
+    ) -> str:
+        messages = self.render_messages(schema_json, html_samples, validation_errors)
+        prompt_chars = sum(len(message.content) for message in messages)
+        with llm_call("plan_generation", attempt, prompt_chars) as call, span(
+            "llm.complete", purpose="plan_generation", attempt=attempt
+        ) as attrs:
+            plan = self.llm.complete(messages, temperature=0, deadline=deadline)
+            call.completion_chars = len(plan)
+            attrs.update(prompt_chars=prompt_chars, completion_chars=len(plan))
+        return plan
+
+    def render_messages(
+        self,
+        schema_json: str,
+        html_samples: list[str],
+        validation_errors: list[str] | None = None,
+    ) -> list[Message]:
+        system_prompt = self.renderer.render_static("plan_generator_system_prompt.jinja")
+        user_prompt = self.renderer.render(
+            "plan_generator_user_prompt.jinja",
+            {
+                "schema_json": schema_json,
+                "html_samples": html_samples,
+                "validation_errors": validation_errors or [],
+            },
+        )
+        return [
+            Message(role="system", content=system_prompt),
+            Message(role="user", content=user_prompt),
+        ]
@@ -2,7 +2,14 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+import threading
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+# Process-wide caches shared by every renderer, keyed by prompt pack directory.
+_ENVIRONMENTS: dict[tuple[str, str | None], Environment] = {}
+_STATIC_RENDERS: dict[tuple[str, str], str] = {}
+_CACHE_LOCK = threading.Lock()
 
 
 @dataclass(frozen=True)
@@ -10,16 +17,56 @@ class PromptPack:
     name: str
 
 
+def _environment(pack_dir: Path, bytecode_cache_dir: Path | None) -> Environment:
+    key = (str(pack_dir), str(bytecode_cache_dir) if bytecode_cache_dir else None)
+    with _CACHE_LOCK:
+        env = _ENVIRONMENTS.get(key)
+        if env is None:
+            bytecode_cache = None
+            if bytecode_cache_dir is not None:
+                bytecode_cache_dir.mkdir(parents=True, exist_ok=True)
+                bytecode_cache = FileSystemBytecodeCache(str(bytecode_cache_dir))
+            env = Environment(
+                loader=FileSystemLoader(str(pack_dir)),
+                autoescape=select_autoescape(),
+                bytecode_cache=bytecode_cache,
+                auto_reload=False,
+            )
+            _ENVIRONMENTS[key] = env
+        return env
+
+
+def clear_template_caches() -> None:
+    with _CACHE_LOCK:
+        _ENVIRONMENTS.clear()
+        _STATIC_RENDERS.clear()
+
+
 class PromptRenderer:
-    def __init__(self, templates_dir: Path, promptpack: PromptPack) -> None:
+    def __init__(
+        self,
+        templates_dir: Path,
+        promptpack: PromptPack,
+        bytecode_cache_dir: Path | None = None,
+    ) -> None:
         self.templates_dir = templates_dir
         self.promptpack = promptpack
-        pack_dir = templates_dir / "promptpacks" / promptpack.name
-        self.env = Environment(
-            loader=FileSystemLoader(str(pack_dir)),
-            autoescape=select_autoescape(),
-        )
+        self.pack_dir = templates_dir / "promptpacks" / promptpack.name
+        self.env = _environment(self.pack_dir, bytecode_cache_dir)
 
     def render(self, template_name: str, context: dict[str, object]) -> str:
         template = self.env.get_template(template_name)
         return template.render(**context)
+
+    def render_static(self, template_name: str) -> str:
+        key = (str(self.pack_dir), template_name)
+        cached = _STATIC_RENDERS.get(key)
+        if cached is None:
+            cached = self.render(template_name, {})
+            with _CACHE_LOCK:
+                _STATIC_RENDERS[key] = cached
+        return cached
+
+    def prerender(self, template_names: list[str]) -> None:
+        for template_name in template_names:
+            self.render_static(template_name)
@@ -3,8 +3,11 @@ from __future__ import annotations
 import json
 
 from scraparse.adapters.llm.base import LLMClient, Message
+from scraparse.core.deadline import Deadline
 from scraparse.core.errors import AIError
 from scraparse.core.models import FieldSchema
+from scraparse.core.timing import llm_call
+from scraparse.core.tracing import span
 from scraparse.plugins.ai.prompt_renderer import PromptRenderer
 
 
@@ -13,11 +16,10 @@ class SchemaGenerator:
         self.llm = llm
         self.renderer = renderer
 
-    def generate(self, user_prompt: str, context: str) -> FieldSchema:
-        system_prompt = self.renderer.render(
-            "schema_generator_system_prompt.jinja",
-            {},
-        )
+    def generate(
+        self, user_prompt: str, context: str, deadline: Deadline | None = None
+    ) -> FieldSchema:
+        system_prompt = self.renderer.render_static("schema_generator_system_prompt.jinja")
         base_user_prompt = self.renderer.render(
             "schema_generator_user_prompt.jinja",
             {"user_prompt": user_prompt, "context": context},
@@ -32,7 +34,13 @@ class SchemaGenerator:
                     "Return only valid JSON matching the required schema."
                 )
             messages_with_user = messages + [Message(role="user", content=user_prompt_text)]
-            raw = self.llm.complete(messages_with_user, temperature=0)
+            prompt_chars = sum(len(message.content) for message in messages_with_user)
+            with llm_call("schema_generation", attempt + 1, prompt_chars) as call, span(
+                "llm.complete", purpose="schema_generation", attempt=attempt + 1
+            ) as attrs:
+                raw = self.llm.complete(messages_with_user, temperature=0, deadline=deadline)
+                call.completion_chars = len(raw)
+                attrs.update(prompt_chars=prompt_chars, completion_chars=len(raw))
             try:
                 data = json.loads(raw)
                 return FieldSchema.from_dict(data)
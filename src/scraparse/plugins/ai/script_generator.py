@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 from scraparse.adapters.llm.base import LLMClient, Message
+from scraparse.core.deadline import Deadline
+from scraparse.core.timing import llm_call
+from scraparse.core.tracing import span
 from scraparse.plugins.ai.prompt_renderer import PromptRenderer
 
 
@@ -14,11 +17,26 @@ class ScriptGenerator:
         schema_json: str,
         html_samples: list[str],
         validation_errors: list[str] | None = None,
+        attempt: int = 1,
+        deadline: Deadline | None = None,
     ) -> str:
-        system_prompt = self.renderer.render(
-            "script_generator_system_prompt.jinja",
-            {},
-        )
+        messages = self.render_messages(schema_json, html_samples, validation_errors)
+        prompt_chars = sum(len(message.content) for message in messages)
+        with llm_call("script_generation", attempt, prompt_chars) as call, span(
+            "llm.complete", purpose="script_generation", attempt=attempt
+        ) as attrs:
+            script = self.llm.complete(messages, temperature=0, deadline=deadline)
+            call.completion_chars = len(script)
+            attrs.update(prompt_chars=prompt_chars, completion_chars=len(script))
+        return script
+
+    def render_messages(
+        self,
+        schema_json: str,
+        html_samples: list[str],
+        validation_errors: list[str] | None = None,
+    ) -> list[Message]:
+        system_prompt = self.renderer.render_static("script_generator_system_prompt.jinja")
         user_prompt = self.renderer.render(
             "script_generator_user_prompt.jinja",
             {
@@ -27,8 +45,7 @@ class ScriptGenerator:
                 "validation_errors": validation_errors or [],
             },
         )
-        messages = [
+        return [
             Message(role="system", content=system_prompt),
             Message(role="user", content=user_prompt),
         ]
-        return self.llm.complete(messages, temperature=0)
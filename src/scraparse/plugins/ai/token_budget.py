@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Protocol, Sequence
+import math
+
+from scraparse.core.errors import LimitExceededError
+
+# Per-sample framing added by the script prompt ("--- SAMPLE n START/END ---").
+SAMPLE_FRAME_TOKENS = 16
+
+
+@dataclass(frozen=True)
+class ModelFamily:
+    name: str
+    chars_per_token: float
+    context_window: int
+
+
+# Ordered so that the longest matching prefix wins (gpt-4o before gpt-4).
+MODEL_FAMILIES: tuple[ModelFamily, ...] = (
+    ModelFamily("gpt-4o", 3.9, 128_000),
+    ModelFamily("gpt-4.1", 3.9, 1_000_000),
+    ModelFamily("gpt-4-turbo", 3.7, 128_000),
+    ModelFamily("gpt-4", 3.7, 8_192),
+    ModelFamily("gpt-3.5-turbo", 3.7, 16_385),
+    ModelFamily("o1", 3.9, 128_000),
+    ModelFamily("o3", 3.9, 200_000),
+)
+GENERIC_FAMILY = ModelFamily("generic", 3.5, 128_000)
+
+
+class TokenEstimator:
+    """Offline token estimate based on a per-family chars-per-token ratio."""
+
+    def __init__(self, family: ModelFamily = GENERIC_FAMILY) -> None:
+        self.family = family
+
+    @classmethod
+    def for_model(cls, model: str) -> "TokenEstimator":
+        normalized = model.strip().lower()
+        for family in MODEL_FAMILIES:
+            if normalized.startswith(family.name):
+                return cls(family)
+        return cls(GENERIC_FAMILY)
+
+    def count(self, text: str) -> int:
+        return self.tokens_for_chars(len(text))
+
+    def tokens_for_chars(self, chars: int) -> int:
+        return math.ceil(chars / self.family.chars_per_token)
+
+    def chars_for_tokens(self, tokens: int) -> int:
+        return max(int(tokens * self.family.chars_per_token), 0)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        return text[: self.chars_for_tokens(max_tokens)]
+
+
+class SampleSource(Protocol):
+    """A sample whose length is known up front and whose text is read on demand."""
+
+    @property
+    def char_count(self) -> int:
+        ...
+
+    def read_text(self, max_chars: int | None = None) -> str:
+        ...
+
+
+@dataclass(frozen=True)
+class _TextSample:
+    text: str
+
+    @property
+    def char_count(self) -> int:
+        return len(self.text)
+
+    def read_text(self, max_chars: int | None = None) -> str:
+        return self.text if max_chars is None else self.text[:max_chars]
+
+
+@dataclass
+class SampleBudget:
+    index: int
+    tokens: int
+    packed_tokens: int
+    status: str  # kept | truncated | dropped
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "index": self.index,
+            "tokens": self.tokens,
+            "packed_tokens": self.packed_tokens,
+            "status": self.status,
+        }
+
+
+@dataclass
+class PackedPrompt:
+    samples: list[str]
+    model_family: str
+    budget_tokens: int
+    reserved_output_tokens: int
+    overhead_tokens: int
+    sample_budgets: list[SampleBudget] = field(default_factory=list)
+
+    @property
+    def prompt_tokens(self) -> int:
+        return self.overhead_tokens + sum(
+            budget.packed_tokens + SAMPLE_FRAME_TOKENS
+            for budget in self.sample_budgets
+            if budget.status != "dropped"
+        )
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "model_family": self.model_family,
+            "budget_tokens": self.budget_tokens,
+            "reserved_output_tokens": self.reserved_output_tokens,
+            "overhead_tokens": self.overhead_tokens,
+            "prompt_tokens": self.prompt_tokens,
+            "samples": [budget.to_dict() for budget in self.sample_budgets],
+        }
+
+
+class PromptPacker:
+    def __init__(
+        self,
+        estimator: TokenEstimator,
+        max_prompt_tokens: int,
+        reserve_output_tokens: int,
+        max_sample_chars: int | None = None,
+        min_sample_tokens: int = 256,
+    ) -> None:
+        self.estimator = estimator
+        self.max_prompt_tokens = max_prompt_tokens
+        self.reserve_output_tokens = reserve_output_tokens
+        self.max_sample_chars = max_sample_chars
+        self.min_sample_tokens = min_sample_tokens
+
+    def budget_tokens(self) -> int:
+        context = min(self.max_prompt_tokens, self.estimator.family.context_window)
+        return context - self.reserve_output_tokens
+
+    def pack(self, overhead_tokens: int, samples: list[str]) -> PackedPrompt:
+        return self.pack_sources(overhead_tokens, [_TextSample(sample) for sample in samples])
+
+    def pack_sources(
+        self, overhead_tokens: int, samples: Sequence[SampleSource]
+    ) -> PackedPrompt:
+        """Pack samples, reading only the prefix of each one that fits the budget."""
+        budget = self.budget_tokens()
+        available = budget - overhead_tokens
+        if self.max_sample_chars is not None:
+            available = min(available, self.estimator.tokens_for_chars(self.max_sample_chars))
+        sizes = [self.estimator.tokens_for_chars(sample.char_count) for sample in samples]
+
+        if samples and available - SAMPLE_FRAME_TOKENS <= 0:
+            raise LimitExceededError(
+                "max_prompt_tokens_for_llm",
+                "Prompt overhead leaves no room for HTML samples",
+                {"overhead_tokens": overhead_tokens},
+                budget,
+            )
+
+        kept = list(range(len(samples)))
+        allocations = self._allocate(sizes, kept, available)
+        # Drop only samples too big to fit that cannot get a useful share, latest first;
+        # samples that fit whole (small pages) are never dropped.
+        while len(kept) > 1:
+            starved = [
+                idx for idx in kept if allocations[idx] < min(sizes[idx], self.min_sample_tokens)
+            ]
+            if not starved:
+                break
+            kept.remove(starved[-1])
+            allocations = self._allocate(sizes, kept, available)
+
+        packed: list[str] = []
+        budgets: list[SampleBudget] = []
+        for index, (sample, size) in enumerate(zip(samples, sizes, strict=True)):
+            if index not in allocations:
+                budgets.append(SampleBudget(index, size, 0, "dropped"))
+                continue
+            allocation = allocations[index]
+            if allocation >= size:
+                packed.append(sample.read_text())
+                budgets.append(SampleBudget(index, size, size, "kept"))
+            else:
+                truncated = sample.read_text(self.estimator.chars_for_tokens(allocation))
+                packed.append(truncated)
+                budgets.append(
+                    SampleBudget(index, size, self.estimator.count(truncated), "truncated")
+                )
+        return PackedPrompt(
+            samples=packed,
+            model_family=self.estimator.family.name,
+            budget_tokens=budget,
+            reserved_output_tokens=self.reserve_output_tokens,
+            overhead_tokens=overhead_tokens,
+            sample_budgets=budgets,
+        )
+
+    @staticmethod
+    def _allocate(sizes: list[int], kept: list[int], available: int) -> dict[int, int]:
+        # Water-fill: small samples are kept whole; their unused share goes to larger ones.
+        allocations: dict[int, int] = {}
+        remaining = max(available - len(kept) * SAMPLE_FRAME_TOKENS, 0)
+        order = sorted(kept, key=lambda idx: (sizes[idx], idx))
+        for position, idx in enumerate(order):
+            share = remaining // (len(order) - position)
+            allocations[idx] = min(sizes[idx], share)
+            remaining -= allocations[idx]
+        return allocations
@@ -6,8 +6,10 @@ from urllib.parse import urldefrag, urljoin, urlparse
 from bs4 import BeautifulSoup
 
 from scraparse.core.errors import LimitExceededError
-from scraparse.core.limits import Limits, LimitTracker
+from scraparse.core.limits import PER_HOST_LIMITS, Limits, LimitTracker
 from scraparse.core.models import FetchResult
+from scraparse.core.timing import stage
+from scraparse.core.tracing import span
 from scraparse.plugins.fetchers.base import Fetcher
 
 
@@ -34,31 +36,49 @@ class CrawlDiscovery:
             if depth > limits.max_depth:
                 continue
             if len(results) >= limits.max_pages:
-                raise LimitExceededError(
+                exc = LimitExceededError(
                     "max_pages",
                     "Max pages exceeded",
                     {"pages_fetched": len(results)},
                     limits.max_pages,
                 )
+                if tracker.stop_on_budget(exc):
+                    break
+                raise exc
             visited.add(normalized)
-            tracker.check_runtime()
-            result = fetcher.fetch(normalized, tracker)
-            results.append(result)
-            soup = BeautifulSoup(result.content_text, "html.parser")
-            for link in soup.find_all("a", href=True):
-                href = str(link["href"]).strip()
-                if not href:
-                    continue
-                next_url = self._normalize_url(urljoin(normalized, href))
-                if not next_url:
-                    continue
-                if limits.same_domain_only and urlparse(next_url).netloc != start_netloc:
-                    continue
-                if next_url in visited:
-                    continue
-                queue.append((next_url, depth + 1))
+            with span("discovery.iteration", strategy="crawl", url=normalized, depth=depth):
+                tracker.check_runtime()
+                try:
+                    result = fetcher.fetch(normalized, tracker)
+                except LimitExceededError as exc:
+                    if not tracker.stop_on_budget(exc, has_results=bool(results)):
+                        raise
+                    if exc.limit_name in PER_HOST_LIMITS:
+                        continue
+                    break
+                results.append(result)
+                with stage("parse", url=result.url):
+                    soup = BeautifulSoup(result.content_text, "html.parser")
+                for next_url in self.extract_links(soup, normalized):
+                    if limits.same_domain_only and urlparse(next_url).netloc != start_netloc:
+                        continue
+                    if next_url in visited:
+                        continue
+                    queue.append((next_url, depth + 1))
         return results
 
+    def extract_links(self, soup: BeautifulSoup, base_url: str) -> list[str]:
+        """Absolute, fragment-free targets of every ``<a href>`` on the page."""
+        links: list[str] = []
+        for link in soup.find_all("a", href=True):
+            href = str(link["href"]).strip()
+            if not href:
+                continue
+            next_url = self._normalize_url(urljoin(base_url, href))
+            if next_url:
+                links.append(next_url)
+        return links
+
     @staticmethod
     def _normalize_url(url: str) -> str:
         if not url:
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+from concurrent.futures import CancelledError as FutureCancelledError
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 from urllib.parse import urljoin, urldefrag, urlparse
 
 from bs4 import BeautifulSoup
 
 from scraparse.core.errors import LimitExceededError
-from scraparse.core.limits import Limits, LimitTracker
+from scraparse.core.limits import PER_HOST_LIMITS, Limits, LimitTracker
 from scraparse.core.models import FetchResult
+from scraparse.core.timing import stage
+from scraparse.core.tracing import span
 from scraparse.plugins.fetchers.base import Fetcher
 
 
@@ -31,28 +36,86 @@ class ListingDiscovery:
                 limits.max_pages,
             )
         start_normalized = self._normalize_url(start_url)
-        result = fetcher.fetch(start_normalized, tracker)
-        results.append(result)
-        visited.add(start_normalized)
+        with span("discovery.iteration", strategy="listing", url=start_normalized, role="listing"):
+            result = fetcher.fetch(start_normalized, tracker)
+            results.append(result)
+            visited.add(start_normalized)
 
-        soup = BeautifulSoup(result.content_text, "html.parser")
-        links = self._collect_detail_links(soup, start_normalized, limits, detail_selector)
+            with stage("parse", url=result.url):
+                soup = BeautifulSoup(result.content_text, "html.parser")
+            links = self._collect_detail_links(soup, start_normalized, limits, detail_selector)
+        targets: list[str] = []
         for link in links:
             normalized = self._normalize_url(link)
             if not normalized or normalized in visited:
                 continue
-            if len(results) >= limits.max_pages:
-                raise LimitExceededError(
-                    "max_pages",
-                    "Max pages exceeded",
-                    {"pages_fetched": len(results)},
-                    limits.max_pages,
-                )
-            fetched = fetcher.fetch(normalized, tracker)
-            results.append(fetched)
             visited.add(normalized)
+            targets.append(normalized)
+        budget = limits.max_pages - len(results)
+        results.extend(self._fetch_details(targets[:budget], fetcher, tracker, limits))
+        if len(targets) > budget:
+            exc = LimitExceededError(
+                "max_pages",
+                "Max pages exceeded",
+                {"pages_fetched": len(results)},
+                limits.max_pages,
+            )
+            if not tracker.stop_on_budget(exc):
+                raise exc
+        return results
+
+    def _fetch_details(
+        self,
+        urls: list[str],
+        fetcher: Fetcher,
+        tracker: LimitTracker,
+        limits: Limits,
+    ) -> list[FetchResult]:
+        results: list[FetchResult] = []
+        if limits.max_concurrent_fetches <= 1 or len(urls) <= 1:
+            for url in urls:
+                try:
+                    results.append(self._fetch_detail(url, fetcher, tracker))
+                except LimitExceededError as exc:
+                    if not tracker.stop_on_budget(exc):
+                        raise
+                    if exc.limit_name not in PER_HOST_LIMITS:
+                        break
+            return results
+        workers = min(limits.max_concurrent_fetches, len(urls))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scraparse-fetch") as pool:
+            # Each task runs in a copy of this context so timings and spans follow it.
+            futures = [
+                pool.submit(copy_context().run, self._fetch_detail, url, fetcher, tracker)
+                for url in urls
+            ]
+            try:
+                for future in futures:
+                    if future.cancelled():
+                        continue
+                    try:
+                        results.append(future.result())
+                    except FutureCancelledError:
+                        continue
+                    except LimitExceededError as exc:
+                        if not tracker.stop_on_budget(exc):
+                            raise
+                        if exc.limit_name in PER_HOST_LIMITS:
+                            continue
+                        # Stop scheduling; fetches already running are still collected.
+                        for pending in futures:
+                            pending.cancel()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
         return results
 
+    def _fetch_detail(self, url: str, fetcher: Fetcher, tracker: LimitTracker) -> FetchResult:
+        tracker.check_runtime()
+        with span("discovery.iteration", strategy="listing", url=url, role="detail"):
+            return fetcher.fetch(url, tracker)
+
     def _collect_detail_links(
         self,
         soup: BeautifulSoup,
@@ -7,6 +7,8 @@ from bs4 import BeautifulSoup
 from scraparse.core.errors import LimitExceededError
 from scraparse.core.limits import Limits, LimitTracker
 from scraparse.core.models import FetchResult
+from scraparse.core.timing import stage
+from scraparse.core.tracing import span
 from scraparse.plugins.fetchers.base import Fetcher
 
 
@@ -30,22 +32,33 @@ class PaginationDiscovery:
             if normalized in visited:
                 break
             if len(results) >= limits.max_pages:
-                raise LimitExceededError(
+                exc = LimitExceededError(
                     "max_pages",
                     "Max pages exceeded",
                     {"pages_fetched": len(results)},
                     limits.max_pages,
                 )
+                if tracker.stop_on_budget(exc):
+                    break
+                raise exc
             visited.add(normalized)
-            tracker.check_runtime()
-            result = fetcher.fetch(normalized, tracker)
-            results.append(result)
-            soup = BeautifulSoup(result.content_text, "html.parser")
-            next_url = self._find_next_url(soup, normalized, next_selector)
-            if next_url and limits.same_domain_only:
-                next_netloc = urlparse(next_url).netloc
-                if next_netloc != start_netloc:
-                    next_url = None
+            with span("discovery.iteration", strategy="pagination", url=normalized):
+                tracker.check_runtime()
+                try:
+                    result = fetcher.fetch(normalized, tracker)
+                except LimitExceededError as exc:
+                    # Every page shares one host, so any budget stop ends the walk.
+                    if not tracker.stop_on_budget(exc, has_results=bool(results)):
+                        raise
+                    break
+                results.append(result)
+                with stage("parse", url=result.url):
+                    soup = BeautifulSoup(result.content_text, "html.parser")
+                next_url = self._find_next_url(soup, normalized, next_selector)
+                if next_url and limits.same_domain_only:
+                    next_netloc = urlparse(next_url).netloc
+                    if next_netloc != start_netloc:
+                        next_url = None
             current_url = next_url
         return results
 
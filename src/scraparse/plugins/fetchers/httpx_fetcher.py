@@ -1,14 +1,19 @@
 from __future__ import annotations
 
 import random
+import threading
 import time
 from urllib.parse import urlparse
 
 import httpx
 
+from scraparse.core.deadline import Deadline
 from scraparse.core.errors import FetchError
-from scraparse.core.limits import Limits, LimitTracker
+from scraparse.core.events import emit
+from scraparse.core.limits import Limits, LimitTracker, PageBudget
 from scraparse.core.models import FetchResult
+from scraparse.core.timing import FetchTiming, current_timings
+from scraparse.core.tracing import span
 
 ALLOWED_CONTENT_TYPES = {"text/html", "application/xhtml+xml"}
 
@@ -25,7 +30,8 @@ class HttpxFetcher:
             follow_redirects=True,
             transport=transport,
         )
-        self._last_request_time: dict[str, float] = {}
+        self._next_slot: dict[str, float] = {}
+        self._slot_lock = threading.Lock()
 
     def close(self) -> None:
         self.client.close()
@@ -36,58 +42,156 @@ class HttpxFetcher:
     def __exit__(self, exc_type, exc, tb) -> None:  # type: ignore[no-untyped-def]
         self.close()
 
-    def _rate_limit(self, url: str) -> None:
+    def _rate_limit(self, url: str, deadline: Deadline) -> None:
         host = urlparse(url).netloc
         if not host or self.limits.rate_limit_rps <= 0:
             return
         min_interval = 1.0 / self.limits.rate_limit_rps
-        last_time = self._last_request_time.get(host)
-        if last_time is None:
-            return
-        elapsed = time.time() - last_time
-        if elapsed < min_interval:
-            time.sleep(min_interval - elapsed)
+        # Reserve the next start slot for this host so concurrent callers queue up.
+        with self._slot_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + min_interval
+        if slot > now:
+            deadline.sleep(slot - now)
 
     def fetch(self, url: str, tracker: LimitTracker) -> FetchResult:
+        deadline = tracker.deadline
         last_error: Exception | None = None
         for attempt in range(self.limits.retries + 1):
             tracker.check_runtime()
-            tracker.start_page()
-            self._rate_limit(url)
+            page = tracker.start_page(url)
+            self._rate_limit(url, deadline)
+            attempt_started = time.monotonic()
             try:
-                with self.client.stream("GET", url) as response:
-                    status = response.status_code
-                    if status >= 400:
-                        raise FetchError(f"HTTP {status} for {url}")
-                    content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
-                    if content_type not in ALLOWED_CONTENT_TYPES:
-                        raise FetchError(f"Disallowed content-type: {content_type or 'missing'}")
-                    chunks: list[bytes] = []
-                    for chunk in response.iter_bytes():
-                        if not chunk:
-                            continue
-                        tracker.add_bytes(len(chunk))
-                        chunks.append(chunk)
-                    tracker.finish_page()
-                    self._last_request_time[urlparse(url).netloc] = time.time()
-                    content_bytes = b"".join(chunks)
-                    encoding = response.encoding or "utf-8"
-                    content_text = content_bytes.decode(encoding, errors="replace")
-                    return FetchResult(
-                        url=url,
-                        content_bytes=content_bytes,
-                        content_text=content_text,
-                        status_code=status,
-                        content_type=content_type,
-                    )
+                with span("fetch.attempt", url=url, attempt=attempt + 1) as attrs:
+                    return self._attempt(url, tracker, page, attempt + 1, attrs)
             except FetchError as exc:
                 last_error = exc
-                tracker.record_failure()
+                tracker.record_failure(page)
             except httpx.RequestError as exc:
                 last_error = exc
-                tracker.record_failure()
+                tracker.record_failure(page)
             if attempt < self.limits.retries:
                 backoff = min(self.limits.backoff_base_s * (2**attempt), self.limits.backoff_max_s)
-                jitter = random.random() * self.limits.jitter_s
-                time.sleep(backoff + jitter)
+                backoff += random.random() * self.limits.jitter_s
+                # Skip a retry that could not complete before the run deadline.
+                last_duration = time.monotonic() - attempt_started
+                if not deadline.can_fit(backoff + last_duration):
+                    deadline.check()
+                    raise FetchError(
+                        f"Failed to fetch {url}: {last_error} (no time left for a retry)"
+                    )
+                emit(
+                    "fetch_retry",
+                    url=url,
+                    attempt=attempt + 1,
+                    error=str(last_error),
+                    backoff_s=round(backoff, 3),
+                )
+                deadline.sleep(backoff)
         raise FetchError(f"Failed to fetch {url}: {last_error}")
+
+    def _timeout(self, deadline: Deadline) -> httpx.Timeout:
+        return httpx.Timeout(
+            timeout=deadline.timeout(self.limits.timeout_total_s),
+            connect=deadline.timeout(self.limits.timeout_connect_s),
+            read=deadline.timeout(self.limits.timeout_read_s),
+        )
+
+    def _attempt(
+        self,
+        url: str,
+        tracker: LimitTracker,
+        page: PageBudget,
+        attempt: int,
+        attrs: dict[str, object],
+    ) -> FetchResult:
+        deadline = tracker.deadline
+        timings = current_timings()
+        timing = FetchTiming(url=url, attempt=attempt)
+        trace = _PhaseTrace()
+        started = time.perf_counter()
+        # timeout_total_s bounds the whole attempt, not just each socket operation.
+        attempt_deadline = Deadline(deadline.timeout(self.limits.timeout_total_s), parent=deadline)
+        if timings is not None:
+            timing.start_s = timings.now()
+        try:
+            with self.client.stream(
+                "GET", url, timeout=self._timeout(deadline), extensions={"trace": trace}
+            ) as response:
+                status = response.status_code
+                timing.status_code = status
+                if status >= 400:
+                    raise FetchError(f"HTTP {status} for {url}")
+                content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+                if content_type not in ALLOWED_CONTENT_TYPES:
+                    raise FetchError(f"Disallowed content-type: {content_type or 'missing'}")
+                chunks: list[bytes] = []
+                body_started = time.perf_counter()
+                for chunk in response.iter_bytes():
+                    if not chunk:
+                        continue
+                    if attempt_deadline.expired():
+                        deadline.check()
+                        raise FetchError(f"Timed out reading {url}")
+                    tracker.add_bytes(len(chunk), page)
+                    timing.bytes += len(chunk)
+                    chunks.append(chunk)
+                timing.body_s = time.perf_counter() - body_started
+                tracker.finish_page(page)
+                content_bytes = b"".join(chunks)
+                encoding = response.encoding or "utf-8"
+                content_text = content_bytes.decode(encoding, errors="replace")
+                return FetchResult(
+                    url=url,
+                    content_bytes=content_bytes,
+                    content_text=content_text,
+                    status_code=status,
+                    content_type=content_type,
+                    encoding=encoding,
+                )
+        except FetchError as exc:
+            timing.error = str(exc)
+            raise
+        except httpx.RequestError as exc:
+            timing.error = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            timing.duration_s = time.perf_counter() - started
+            trace.apply(timing, started)
+            attrs["status"] = timing.status_code
+            attrs["bytes"] = timing.bytes
+            if timings is not None:
+                timings.record_fetch(timing)
+
+
+class _PhaseTrace:
+    """Collects httpcore trace events to split a request into phases."""
+
+    def __init__(self) -> None:
+        self.events: dict[str, float] = {}
+
+    def __call__(self, event_name: str, info: dict[str, object]) -> None:
+        self.events.setdefault(event_name, time.perf_counter())
+
+    def _span(self, prefix: str) -> float | None:
+        start = self.events.get(f"{prefix}.started")
+        end = self.events.get(f"{prefix}.complete")
+        if start is None or end is None:
+            return None
+        return end - start
+
+    def apply(self, timing: FetchTiming, started: float) -> None:
+        timing.connect_s = self._span("connection.connect_tcp")
+        timing.tls_s = self._span("connection.start_tls")
+        headers_done = next(
+            (
+                value
+                for name, value in self.events.items()
+                if name.endswith("receive_response_headers.complete")
+            ),
+            None,
+        )
+        if headers_done is not None:
+            timing.ttfb_s = headers_done - started
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from typing import Callable
+
+from scraparse.core.limits import LimitTracker
+from scraparse.core.models import FetchResult
+from scraparse.plugins.fetchers.base import Fetcher
+
+
+class ObservingFetcher:
+    """Hands every successful fetch to ``on_result`` as soon as it arrives."""
+
+    def __init__(self, inner: Fetcher, on_result: Callable[[FetchResult], None]) -> None:
+        self.inner = inner
+        self.on_result = on_result
+
+    def fetch(self, url: str, tracker: LimitTracker) -> FetchResult:
+        result = self.inner.fetch(url, tracker)
+        self.on_result(result)
+        return result
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from scraparse.core.limits import LimitTracker
+from scraparse.core.models import FetchResult
+from scraparse.core.page_store import PageStore
+from scraparse.plugins.fetchers.base import Fetcher
+
+
+class StoringFetcher:
+    """Moves each fetched body into a ``PageStore`` and returns a lazy page."""
+
+    def __init__(self, inner: Fetcher, store: PageStore) -> None:
+        self.inner = inner
+        self.store = store
+
+    def fetch(self, url: str, tracker: LimitTracker) -> FetchResult:
+        return self.store.add(self.inner.fetch(url, tracker))
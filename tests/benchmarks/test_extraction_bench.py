@@ -0,0 +1,9 @@
+from pathlib import Path
+
+from scraparse.bench.extraction import measure_extraction
+
+
+def test_plan_and_script_extract_the_same_rows(tmp_path: Path) -> None:
+    results = measure_extraction(tmp_path, pages=4, rows_per_page=5)
+    assert results["plan_rows"] == results["script_rows"] == 20
+    assert results["plan_rows_per_s"] > 0
@@ -0,0 +1,10 @@
+from pathlib import Path
+
+from scraparse.bench.normalize import measure_normalize
+
+
+def test_columnar_normalization_beats_per_row_parsing(tmp_path: Path) -> None:
+    results = measure_normalize(tmp_path, rows=5_000)
+    assert results["invalid_values"] == 0
+    assert results["date_formats"] == {"published": "%d/%m/%Y"}
+    assert results["columnar_rows_per_s"] > results["per_row_rows_per_s"]
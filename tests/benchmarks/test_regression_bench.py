@@ -0,0 +1,82 @@
+import copy
+import json
+from pathlib import Path
+
+import pytest
+
+from scraparse.bench.regression import (
+    Stats,
+    Thresholds,
+    compare,
+    gate_scenarios,
+    load_baseline,
+    result_config,
+    run_benchmarks,
+    save_report,
+)
+
+
+def test_gate_runs_every_microbenchmark_with_confidence_intervals(tmp_path: Path) -> None:
+    current = run_benchmarks(
+        gate_scenarios(pages=8, page_bytes=1_000), warmup=1, repetitions=3, isolate=False
+    )
+    assert set(current["benchmarks"]) == {
+        "discovery/pagination",
+        "discovery/listing",
+        "discovery/crawl",
+        "fetch/listing",
+        "links/crawl",
+        "orchestrator/listing",
+    }
+    for result in current["benchmarks"].values():
+        stats = Stats.from_dict(result["pages_per_s"])
+        assert len(stats.samples) == 3
+        assert stats.ci_low <= stats.mean <= stats.ci_high
+        assert result["peak_rss_kb"] > 0
+
+    rows = compare(current, current, Thresholds())
+    assert {row.status for row in rows} == {"ok"}
+
+    report_dir = save_report(tmp_path, current, rows)
+    assert json.loads((report_dir / "results.json").read_text()) == current
+    assert "| links/crawl | pages_per_s |" in (report_dir / "comparison.md").read_text()
+
+
+def test_compare_fails_only_on_significant_regressions() -> None:
+    def result(samples: list[float], rss: int) -> dict[str, object]:
+        return {"pages_per_s": Stats.of(samples).to_dict(), "peak_rss_kb": rss}
+
+    baseline = {
+        "benchmarks": {
+            "steady": result([100, 101, 99], 50_000),
+            "slower": result([100, 101, 99], 50_000),
+            "jittery": result([60, 140, 100], 50_000),
+            "retired": result([10, 10, 10], 50_000),
+        }
+    }
+    current = copy.deepcopy(baseline)
+    current["benchmarks"]["slower"] = result([70, 71, 69], 80_000)
+    current["benchmarks"]["jittery"] = result([50, 110, 80], 51_000)
+    current["benchmarks"]["added"] = current["benchmarks"].pop("retired")
+
+    rows = {(row.benchmark, row.metric): row for row in compare(baseline, current, Thresholds())}
+    assert rows["steady", "pages_per_s"].status == "ok"
+    assert rows["slower", "pages_per_s"].status == "regressed"
+    assert rows["slower", "peak_rss_kb"].status == "regressed"
+    assert rows["jittery", "pages_per_s"].status == "noisy"
+    assert rows["jittery", "peak_rss_kb"].status == "ok"
+    assert rows["added", "pages_per_s"].status == "new"
+    assert rows["retired", "pages_per_s"].status == "missing"
+    loose = compare(baseline, current, Thresholds(max_throughput_drop=0.5, max_memory_growth=1))
+    assert not any(row.failed for row in loose)
+
+
+def test_load_baseline_checks_the_result_shape(tmp_path: Path) -> None:
+    path = tmp_path / "results.json"
+    good = {"suite": "regression", "config": {"pages": 8, "isolated": "yes"}, "benchmarks": {}}
+    path.write_text(json.dumps(good))
+    assert result_config(load_baseline(path)) == {"pages": 8}
+    for broken in ([], {"suite": "other"}, {**good, "config": []}, {**good, "benchmarks": None}):
+        path.write_text(json.dumps(broken))
+        with pytest.raises(ValueError):
+            load_baseline(path)
@@ -0,0 +1,21 @@
+from pathlib import Path
+
+from scraparse.bench.startup import (
+    STARTUP_BUDGETS,
+    budget_problems,
+    measure_cli_startup,
+    measure_prompt_renderer,
+)
+
+
+def test_prompt_renderer_benchmark(tmp_path: Path) -> None:
+    results = measure_prompt_renderer(tmp_path / "jinja", renders=20)
+    assert list((tmp_path / "jinja").iterdir())
+    assert results["static_render_us"] < results["uncached_render_us"]
+    assert results["cold_bytecode_us"] > 0
+
+
+def test_cli_commands_stay_within_import_budgets(tmp_path: Path) -> None:
+    results = measure_cli_startup(tmp_path, repeats=2)
+    assert set(results) == set(STARTUP_BUDGETS)
+    assert budget_problems(results) == []
@@ -0,0 +1,32 @@
+from scraparse.bench.sites import SiteConfig, SyntheticSite
+from scraparse.bench.throughput import Scenario, default_scenarios, run_suite
+
+
+def test_synthetic_sites_are_deterministic() -> None:
+    config = SiteConfig(kind="crawl", pages=30, fan_out=3, page_bytes=2_000, seed=5)
+    first, second = SyntheticSite(config), SyntheticSite(config)
+    assert first.pages == second.pages
+    assert len(first.pages) == 30
+    assert all(len(body) >= 2_000 for body in first.pages.values())
+    assert SyntheticSite(SiteConfig(kind="crawl", pages=30, seed=6)).pages != first.pages
+
+
+def test_throughput_suite_reaches_every_page() -> None:
+    scenarios = [
+        scenario
+        for scenario in default_scenarios(pages=15, page_bytes=2_000)
+        if scenario.fetcher == "httpx+page_store" or scenario.mode == "orchestrator"
+    ]
+    site = SiteConfig(kind="crawl", pages=15, page_bytes=2_000)
+    scenarios += [Scenario(f"{mode}/crawl", site, mode=mode) for mode in ("fetch", "links")]
+    scenarios.append(Scenario("slow", SiteConfig(kind="listing", pages=4, latency_s=0.01)))
+    report = run_suite(scenarios, isolate=False)
+    assert report["suite"] == "throughput"
+    results = {result["scenario"]: result for result in report["results"]}
+    for name, result in results.items():
+        expected = 4 if name == "slow" else 15
+        assert result["pages"] == expected, name
+        assert result["bytes_per_s"] > 0 and result["cpu_s"] > 0
+        assert result.get("errors", 0) == 0
+    assert results["links/crawl"]["links"] > 15
+    assert results["slow"]["wall_s"] >= 0.03
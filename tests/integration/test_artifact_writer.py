@@ -0,0 +1,25 @@
+from pathlib import Path
+
+import pytest
+
+from scraparse.core.artifact_writer import ArtifactWriter
+from scraparse.core.errors import ArtifactWriteError
+
+
+def test_artifact_writer_flushes_queued_files_on_close(tmp_path: Path) -> None:
+    writer = ArtifactWriter(max_pending=2, fsync_batch=3)
+    for idx in range(10):
+        writer.submit(tmp_path / f"{idx}.html", f"<p>{idx}</p>".encode("utf-8"))
+    writer.close()
+    assert writer.files_written == 10
+    assert (tmp_path / "9.html").read_text(encoding="utf-8") == "<p>9</p>"
+
+
+def test_artifact_writer_surfaces_write_errors(tmp_path: Path) -> None:
+    writer = ArtifactWriter()
+    writer.submit(tmp_path / "missing" / "1.html", b"<p>1</p>")
+    writer.submit(tmp_path / "2.html", b"<p>2</p>")
+    with pytest.raises(ArtifactWriteError):
+        writer.close()
+    with pytest.raises(ArtifactWriteError):
+        writer.submit(tmp_path / "3.html", b"<p>3</p>")
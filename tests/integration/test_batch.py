@@ -0,0 +1,101 @@
+import json
+from contextlib import nullcontext
+from pathlib import Path
+
+import pytest
+
+from scraparse.adapters.llm.base import LLMClient, Message
+from scraparse.core.deadline import Deadline
+from scraparse.core.errors import ConfigError
+from scraparse.core.limits import Limits, LimitTracker
+from scraparse.core.models import FetchResult
+from scraparse.core.paths import templates_dir
+from scraparse.core.workspace import WorkspaceManager
+from scraparse.engine.batch import BatchConfig, BatchRunner, load_manifest
+from scraparse.plugins.ai.prompt_renderer import PromptPack, PromptRenderer
+
+SCRIPT = """
+import csv
+import sys
+
+def main():
+    writer = csv.DictWriter(sys.stdout, fieldnames=["title"])
+    writer.writeheader()
+
+if __name__ == "__main__":
+    main()
+"""
+SCHEMA = {"fields": [{"name": "title", "type": "string", "required": True}]}
+
+
+class FakeLLM(LLMClient):
+    def __init__(self) -> None:
+        self.schema_calls = 0
+        self.models: set[str] = set()
+
+    def complete(
+        self,
+        messages: list[Message],
+        model: str = "test-model",
+        temperature: float = 0,
+        deadline: Deadline | None = None,
+    ) -> str:
+        self.models.add(model)
+        if "FieldSchema JSON" in messages[-1].content:
+            return SCRIPT
+        self.schema_calls += 1
+        return json.dumps(SCHEMA)
+
+
+class FakeFetcher:
+    def fetch(self, url: str, tracker: LimitTracker) -> FetchResult:
+        tracker.start_page()
+        tracker.add_bytes(13)
+        tracker.finish_page()
+        return FetchResult(url, b"<html></html>", "<html></html>", 200, "text/html")
+
+
+def _write_manifest(path: Path, entries: list[dict[str, object]]) -> None:
+    path.write_text("\n".join(json.dumps(entry) for entry in entries) + "\n", encoding="utf-8")
+
+
+def test_load_manifest_rejects_missing_url(tmp_path: Path) -> None:
+    manifest = tmp_path / "runs.jsonl"
+    _write_manifest(manifest, [{"prompt": "Extract title"}])
+    with pytest.raises(ConfigError):
+        load_manifest(manifest, Limits())
+
+
+def test_batch_runs_manifest_and_streams_results(tmp_path: Path) -> None:
+    manifest = tmp_path / "runs.jsonl"
+    _write_manifest(
+        manifest,
+        [
+            {"url": "https://example.com/a", "prompt": "Extract title"},
+            {"url": "https://example.com/b", "schema": SCHEMA, "limits": {"max_pages": 3}},
+            {"url": "https://example.com/c", "prompt": "Extract title"},
+        ],
+    )
+    items = load_manifest(manifest, Limits())
+    assert items[1].spec.schema is not None
+    assert items[1].spec.limits.max_pages == 3
+
+    llm = FakeLLM()
+    runner = BatchRunner(
+        BatchConfig(workers=3, max_concurrent_fetches=2, max_concurrent_llm=1),
+        llm=llm,
+        workspace=WorkspaceManager(tmp_path / "generated"),
+        renderer_factory=lambda pack: PromptRenderer(templates_dir(), PromptPack(pack)),
+        fetcher_factory=lambda limits: nullcontext(FakeFetcher()),
+    )
+    output = tmp_path / "results.jsonl"
+    summary = runner.run(items, output)
+
+    lines = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert sorted(line["line"] for line in lines) == [1, 2, 3]
+    assert all(line["ok"] for line in lines)
+    assert len({line["run_id"] for line in lines}) == 3
+    assert llm.schema_calls == 2
+    assert llm.models == {"test-model"}
+    assert summary.succeeded == 3
+    assert summary.pages == 3
@@ -0,0 +1,150 @@
+import csv
+import json
+from pathlib import Path
+
+from scraparse.core.blob_store import BlobStore
+from scraparse.engine.extract import ExtractConfig, ExtractRunner, collect_inputs, resolve_parser
+
+PARSER = """
+import csv
+import sys
+from bs4 import BeautifulSoup
+
+
+def main():
+    writer = csv.DictWriter(sys.stdout, fieldnames=["title"])
+    writer.writeheader()
+    for path in sys.argv[1:]:
+        with open(path, encoding="utf-8") as handle:
+            soup = BeautifulSoup(handle.read(), "html.parser")
+        title = soup.select_one("h1")
+        if title is None:
+            raise ValueError("no title")
+        writer.writerow({"title": title.get_text(strip=True)})
+
+
+if __name__ == "__main__":
+    main()
+"""
+
+
+def _write_pages(root: Path, count: int) -> None:
+    root.mkdir()
+    for idx in range(count):
+        body = f"<h1>Item {idx}</h1>" if idx != 3 else "<h2>broken</h2>"
+        (root / f"{idx:03d}.html").write_text(body, encoding="utf-8")
+
+
+def test_extract_runs_parser_over_files_in_order(tmp_path: Path) -> None:
+    script = tmp_path / "parser.py"
+    script.write_text(PARSER, encoding="utf-8")
+    _write_pages(tmp_path / "pages", 20)
+    failures = []
+    runner = ExtractRunner(ExtractConfig(workers=2, chunk_size=3))
+    output = tmp_path / "out.csv"
+    summary = runner.run(
+        script, collect_inputs([str(tmp_path / "pages")]), output, on_failure=failures.append
+    )
+    assert (summary.files, summary.failed, summary.rows) == (20, 1, 19)
+    assert failures[0].source.endswith("003.html")
+    assert "no title" in failures[0].error
+    with output.open(encoding="utf-8", newline="") as handle:
+        rows = list(csv.DictReader(handle))
+    assert [row["title"] for row in rows] == [f"Item {idx}" for idx in range(20) if idx != 3]
+    assert rows[0]["_source"].endswith("000.html")
+
+
+def test_extract_reads_blob_manifest_unordered_to_jsonl(tmp_path: Path) -> None:
+    script = tmp_path / "parser.py"
+    script.write_text(PARSER, encoding="utf-8")
+    store = BlobStore(tmp_path / "blobs", codec="gzip")
+    pages = []
+    for idx in range(5):
+        ref = store.put(f"<h1>Blob {idx}</h1>".encode("utf-8"))
+        pages.append({"url": f"https://example.com/{idx}", **ref.to_dict()})
+    manifest = tmp_path / "run" / "artifacts" / "manifest.json"
+    manifest.parent.mkdir(parents=True)
+    manifest.write_text(json.dumps({"store": str(store.root), "pages": pages}), encoding="utf-8")
+
+    output = tmp_path / "out.jsonl"
+    runner = ExtractRunner(
+        ExtractConfig(workers=2, chunk_size=1, ordered=False, output_format="jsonl")
+    )
+    summary = runner.run(script, collect_inputs([str(tmp_path / "run")]), output)
+    assert summary.failed == 0
+    rows = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert sorted(row["title"] for row in rows) == [f"Blob {idx}" for idx in range(5)]
+    assert {row["_source"] for row in rows} == {page["url"] for page in pages}
+
+
+def test_extract_runs_extraction_plan(tmp_path: Path) -> None:
+    plan = tmp_path / "run" / "plan.json"
+    plan.parent.mkdir()
+    plan.write_text(
+        json.dumps(
+            {
+                "version": 1,
+                "row_selector": None,
+                "fields": [{"name": "title", "selector": "h1", "normalizer": "text"}],
+            }
+        ),
+        encoding="utf-8",
+    )
+    _write_pages(tmp_path / "pages", 6)
+    output = tmp_path / "out.csv"
+    runner = ExtractRunner(ExtractConfig(workers=2, chunk_size=2))
+    summary = runner.run(
+        resolve_parser(tmp_path / "run"), collect_inputs([str(tmp_path / "pages")]), output
+    )
+    # A plan yields no row for a page without matches instead of failing it.
+    assert (summary.files, summary.failed, summary.rows) == (6, 0, 5)
+    with output.open(encoding="utf-8", newline="") as handle:
+        rows = list(csv.DictReader(handle))
+    assert [row["title"] for row in rows] == [f"Item {idx}" for idx in range(6) if idx != 3]
+
+
+def test_extract_reparses_only_changed_pages(tmp_path: Path) -> None:
+    from scraparse.core.extract_state import ExtractState
+
+    script = tmp_path / "parser.py"
+    script.write_text(PARSER, encoding="utf-8")
+    pages = tmp_path / "pages"
+    _write_pages(pages, 8)
+    state = ExtractState(tmp_path / "state.sqlite")
+    runner = ExtractRunner(ExtractConfig(workers=2, chunk_size=3))
+    output = tmp_path / "out.csv"
+
+    first = runner.run(script, collect_inputs([str(pages)]), output, state=state)
+    assert (first.reused, first.failed, first.rows) == (0, 1, 7)
+
+    (pages / "001.html").write_text("<h1>Item 1 (edited)</h1>", encoding="utf-8")
+    (pages / "007.html").unlink()
+    second = runner.run(script, collect_inputs([str(pages)]), output, state=state)
+    # 001 changed and 003 failed last time, so only those two are parsed again.
+    assert (second.files, second.reused, second.failed, second.pruned) == (7, 5, 1, 1)
+    with output.open(encoding="utf-8", newline="") as handle:
+        titles = [row["title"] for row in csv.DictReader(handle)]
+    assert titles == ["Item 0", "Item 1 (edited)", "Item 2", "Item 4", "Item 5", "Item 6"]
+
+    # A new parser version invalidates every stored row.
+    script.write_text(PARSER + "\n# v2\n", encoding="utf-8")
+    third = runner.run(script, collect_inputs([str(pages)]), output, state=state)
+    assert third.reused == 0
+    state.close()
+
+
+def test_extract_writes_typed_columns(tmp_path: Path) -> None:
+    from scraparse.core.columnar import read_json_columns
+    from scraparse.core.models import FieldSchema, FieldSpec
+
+    script = tmp_path / "parser.py"
+    script.write_text(PARSER, encoding="utf-8")
+    _write_pages(tmp_path / "pages", 4)
+    schema = FieldSchema(fields=[FieldSpec(name="title", type="number", required=True)])
+    output = tmp_path / "out.columns.jsonl"
+    runner = ExtractRunner(ExtractConfig(workers=1, output_format="columns"))
+    summary = runner.run(script, collect_inputs([str(tmp_path / "pages")]), output, schema=schema)
+    types, columns = read_json_columns(output)
+    assert types == {"_source": "string", "title": "float64"}
+    assert columns["title"] == [0.0, 1.0, 2.0]
+    assert summary.invalid == {}
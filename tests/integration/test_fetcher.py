@@ -38,3 +38,43 @@ def test_fetcher_respects_max_response_bytes() -> None:
     with pytest.raises(LimitExceededError):
         fetcher.fetch("https://example.com", tracker)
     fetcher.close()
+
+
+def test_fetcher_records_attempt_timings() -> None:
+    from scraparse.core.timing import RunTimings, activate
+
+    calls = {"count": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls["count"] += 1
+        if calls["count"] == 1:
+            return httpx.Response(503, headers={"content-type": "text/html"})
+        return httpx.Response(200, headers={"content-type": "text/html"}, content=b"<html></html>")
+
+    limits = Limits(retries=1, backoff_base_s=0, jitter_s=0, rate_limit_rps=0)
+    fetcher = HttpxFetcher(limits, transport=httpx.MockTransport(handler))
+    timings = RunTimings()
+    with activate(timings):
+        fetcher.fetch("https://example.com", LimitTracker(limits))
+    fetcher.close()
+    attempts = [fetch.to_dict() for fetch in timings.fetches]
+    assert [item["attempt"] for item in attempts] == [1, 2]
+    assert attempts[0]["error"] == "HTTP 503 for https://example.com"
+    assert attempts[1]["bytes"] == 13
+
+
+def test_fetcher_skips_retries_past_the_deadline() -> None:
+    import time
+
+    from scraparse.core.errors import FetchError
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(503, headers={"content-type": "text/html"})
+
+    limits = Limits(retries=3, backoff_base_s=5, jitter_s=0, max_runtime_s=2)
+    fetcher = HttpxFetcher(limits, transport=httpx.MockTransport(handler))
+    started = time.monotonic()
+    with pytest.raises(FetchError, match="no time left"):
+        fetcher.fetch("https://example.com", LimitTracker(limits))
+    fetcher.close()
+    assert time.monotonic() - started < 1
@@ -1,13 +1,24 @@
 from pathlib import Path
+from typing import Any
+import hashlib
+import json
 
 from scraparse.adapters.llm.base import LLMClient, Message
+from scraparse.core.blob_store import BlobStore
+from scraparse.core.deadline import Deadline
+from scraparse.core.events import read_events
 from scraparse.cli.schema_editor import SchemaEditor
+from scraparse.core.extraction_plan import load_plan
 from scraparse.core.limits import Limits
-from scraparse.core.models import FetchResult, RunSpec
+from scraparse.core.models import FetchResult, FieldSchema, FieldSpec, RunSpec
+from scraparse.core.parser_registry import ParserRegistry
 from scraparse.core.paths import templates_dir
+from scraparse.core.run_memo import RunMemo, memo_key
+from scraparse.core.sandbox import SandboxPool, SandboxResult
 from scraparse.core.workspace import WorkspaceManager
 from scraparse.core.limits import LimitTracker
-from scraparse.engine.orchestrator import Orchestrator, OrchestratorDeps
+from scraparse.engine.orchestrator import SANDBOX_MAX_PAGES, Orchestrator, OrchestratorDeps
+from scraparse.plugins.ai.plan_generator import PlanGenerator
 from scraparse.plugins.ai.prompt_renderer import PromptPack, PromptRenderer
 from scraparse.plugins.ai.schema_generator import SchemaGenerator
 from scraparse.plugins.ai.script_generator import ScriptGenerator
@@ -15,7 +26,13 @@ from scraparse.plugins.fetchers.base import Fetcher
 
 
 class FakeLLM(LLMClient):
-    def complete(self, messages: list[Message], model: str = "test-model", temperature: float = 0) -> str:
+    def complete(
+        self,
+        messages: list[Message],
+        model: str = "test-model",
+        temperature: float = 0,
+        deadline: Deadline | None = None,
+    ) -> str:
         content = messages[-1].content
         if "FieldSchema JSON" in content:
             return """
@@ -54,6 +71,40 @@ class NoopSchemaEditor(SchemaEditor):
         return schema
 
 
+def _renderer() -> PromptRenderer:
+    return PromptRenderer(templates_dir(), PromptPack("default"))
+
+
+def _deps(tmp_path: Path, llm: LLMClient | None = None, **overrides: Any) -> OrchestratorDeps:
+    llm = llm or FakeLLM()
+    renderer = _renderer()
+    fields: dict[str, Any] = {
+        "schema_generator": SchemaGenerator(llm, renderer),
+        "script_generator": ScriptGenerator(llm, renderer),
+        "fetcher": FakeFetcher(),
+        "workspace": WorkspaceManager(tmp_path),
+        "schema_editor": NoopSchemaEditor(),
+    }
+    fields.update(overrides)
+    return OrchestratorDeps(**fields)
+
+
+def _spec(**overrides: Any) -> RunSpec:
+    fields: dict[str, Any] = {
+        "url": "https://example.com",
+        "discover": False,
+        "discover_strategy": "none",
+        "prompt": "Extract product_name",
+        "context": "",
+        "promptpack": "default",
+        "save_artifacts": False,
+        "mode": "wizard",
+        "limits": Limits(),
+    }
+    fields.update(overrides)
+    return RunSpec(**fields)
+
+
 def test_orchestrator_smoke(tmp_path: Path) -> None:
     renderer = PromptRenderer(templates_dir(), PromptPack("default"))
     llm = FakeLLM()
@@ -79,3 +130,272 @@ def test_orchestrator_smoke(tmp_path: Path) -> None:
     outcome = orchestrator.run(spec)
     assert Path(outcome.parser_path).exists()
     assert Path(outcome.report_path).exists()
+
+
+def test_orchestrator_reports_stage_timings(tmp_path: Path) -> None:
+    deps = _deps(tmp_path)
+    spec = _spec()
+    outcome = Orchestrator(deps).run(spec)
+    report = json.loads(Path(outcome.report_path).read_text(encoding="utf-8"))
+    timings = report["timings"]
+    for name in ("schema_generation", "editor_wait", "fetch", "script_generation", "validation"):
+        assert name in timings["stage_totals_s"]
+    purposes = [call["purpose"] for call in timings["llm_calls"]]
+    assert purposes == ["schema_generation", "script_generation"]
+    assert all(call["completion_chars"] > 0 for call in timings["llm_calls"])
+
+
+def test_orchestrator_profile_mode_writes_stage_profiles(tmp_path: Path) -> None:
+    deps = _deps(tmp_path)
+    spec = _spec(profile=True)
+    outcome = Orchestrator(deps).run(spec)
+    profile_dir = Path(outcome.report_path).parent / "profile"
+    assert any(profile_dir.glob("*_fetch.pstats"))
+    assert any(profile_dir.glob("*_fetch_alloc.txt"))
+    assert any(line.startswith("fetch:") for line in outcome.profile_summary)
+
+
+def test_orchestrator_trace_mode_writes_chrome_trace(tmp_path: Path) -> None:
+    deps = _deps(tmp_path)
+    spec = _spec(trace=True)
+    outcome = Orchestrator(deps).run(spec)
+    trace = json.loads((Path(outcome.report_path).parent / "trace.json").read_text("utf-8"))
+    names = {event["name"] for event in trace["traceEvents"]}
+    assert {"orchestrator.run", "llm.complete", "workspace.write"} <= names
+
+
+def test_orchestrator_writes_artifacts_while_fetching(tmp_path: Path) -> None:
+    deps = _deps(tmp_path)
+    spec = _spec(save_artifacts=True)
+    outcome = Orchestrator(deps).run(spec)
+    report = json.loads(Path(outcome.report_path).read_text(encoding="utf-8"))
+    pages = [
+        event for event in read_events(Path(report["events_path"]))
+        if event["type"] == "page_fetched"
+    ]
+    assert pages[0]["url"] == "https://example.com"
+    assert Path(pages[0]["artifact"]).read_bytes() == b"<html></html>"
+    assert pages[0]["content_hash"] == hashlib.sha256(b"<html></html>").hexdigest()
+    assert "artifact_write" in report["timings"]["stage_totals_s"]
+
+
+def test_orchestrator_saves_pages_to_blob_store(tmp_path: Path) -> None:
+    store = BlobStore(tmp_path / "blobs", codec="gzip")
+    deps = _deps(tmp_path, workspace=WorkspaceManager(tmp_path / "generated", blob_store=store))
+    spec = _spec(save_artifacts=True)
+    orchestrator = Orchestrator(deps)
+    first = orchestrator.run(spec)
+    second = orchestrator.run(spec)
+    assert first.run_id != second.run_id
+    manifest_path = Path(second.report_path).parent / "artifacts" / "manifest.json"
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    digest = manifest["pages"][0]["digest"]
+    assert store.read_bytes(digest) == b"<html></html>"
+    assert not (Path(second.report_path).parent / "artifacts" / "html").exists()
+    assert len(list((tmp_path / "blobs").rglob("*.gz"))) == 1
+
+
+def test_orchestrator_streams_events_and_derives_report(tmp_path: Path) -> None:
+    deps = _deps(tmp_path)
+    spec = _spec()
+    outcome = Orchestrator(deps).run(spec)
+    report = json.loads(Path(outcome.report_path).read_text(encoding="utf-8"))
+    types = [event["type"] for event in read_events(Path(report["events_path"]))]
+    assert types[0] == "run_started"
+    assert types[-1] == "run_finished"
+    for expected in ("page_fetched", "limit_checkpoint", "llm_call", "validation"):
+        assert expected in types
+    assert report["fetched_count"] == 1
+    assert report["events"]["llm_calls"] == 2
+    assert report["events"]["validation_failures"] == 0
+    assert "bytes_per_page" not in report
+
+
+class CountingLLM(FakeLLM):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def complete(
+        self,
+        messages: list[Message],
+        model: str = "test-model",
+        temperature: float = 0,
+        deadline: Deadline | None = None,
+    ) -> str:
+        self.calls += 1
+        return super().complete(messages, model, temperature, deadline)
+
+
+def test_orchestrator_memo_reuses_schema_and_parser(tmp_path: Path) -> None:
+    llm = CountingLLM()
+    deps = _deps(tmp_path, llm, memo=RunMemo(tmp_path / "memo"))
+    spec = _spec()
+    orchestrator = Orchestrator(deps)
+    first = orchestrator.run(spec)
+    assert not first.errors
+    assert llm.calls == 2
+
+    second = orchestrator.run(spec)
+    assert not second.errors
+    assert llm.calls == 2
+    report = json.loads(Path(second.report_path).read_text(encoding="utf-8"))
+    assert report["memo"]["schema"] == "hit"
+    assert report["memo"]["parser"] == "reused"
+    assert report["memo"]["check"]["fill_rates"] == {"product_name": 1.0}
+    assert Path(second.parser_path).exists()
+
+    spec.force_regenerate = True
+    orchestrator.run(spec)
+    assert llm.calls == 4
+
+
+def test_orchestrator_memo_treats_unreadable_entry_as_miss(tmp_path: Path) -> None:
+    llm = CountingLLM()
+    memo = RunMemo(tmp_path / "memo")
+    spec = _spec()
+    bogus = {"fields": [{"name": "product_name", "type": "bogus", "required": True}]}
+    memo.save(memo_key(spec), bogus, "print('stale')", "old-run")
+    outcome = Orchestrator(_deps(tmp_path, llm, memo=memo)).run(spec)
+    assert not outcome.errors
+    assert llm.calls == 2
+    report = json.loads(Path(outcome.report_path).read_text(encoding="utf-8"))
+    assert report["memo"]["schema"] == "miss"
+
+
+def test_orchestrator_registry_reuses_parser_for_same_site(tmp_path: Path) -> None:
+    llm = CountingLLM()
+    deps = _deps(tmp_path, llm, registry=ParserRegistry(tmp_path / "registry.sqlite"))
+    spec = _spec(url="https://example.com/product/1")
+    orchestrator = Orchestrator(deps)
+    first = orchestrator.run(spec)
+    assert not first.errors
+    assert llm.calls == 2
+    report = json.loads(Path(first.report_path).read_text(encoding="utf-8"))
+    assert report["registry"]["registered"] is True
+
+    spec.url = "https://example.com/product/2"
+    second = orchestrator.run(spec)
+    assert not second.errors
+    assert llm.calls == 2
+    report = json.loads(Path(second.report_path).read_text(encoding="utf-8"))
+    assert report["registry"]["parser"] == "reused"
+    assert report["registry"]["run_id"] == first.run_id
+    assert report["schema"]["fields"][0]["name"] == "product_name"
+    assert Path(second.parser_path).exists()
+
+
+class EmptyFirstLLM(FakeLLM):
+    def __init__(self) -> None:
+        self.scripts = 0
+
+    def complete(
+        self,
+        messages: list[Message],
+        model: str = "test-model",
+        temperature: float = 0,
+        deadline: Deadline | None = None,
+    ) -> str:
+        script = super().complete(messages, model, temperature, deadline)
+        if "FieldSchema JSON" in messages[-1].content:
+            self.scripts += 1
+            if self.scripts == 1:
+                return script.replace('"Widget"', '""')
+        return script
+
+
+def test_orchestrator_sandbox_feeds_runtime_problems_back(tmp_path: Path) -> None:
+    llm = EmptyFirstLLM()
+    with SandboxPool(workers=1) as sandbox:
+        outcome = Orchestrator(_deps(tmp_path, llm, sandbox=sandbox)).run(_spec())
+    assert not outcome.errors
+    assert llm.scripts == 2
+    report = json.loads(Path(outcome.report_path).read_text(encoding="utf-8"))
+    validations = [
+        event for event in read_events(Path(report["events_path"]))
+        if event["type"] == "validation"
+    ]
+    assert "product_name" in validations[0]["errors"][0]
+    assert validations[1]["errors"] == []
+    assert validations[1]["sandbox"]["rows"] == 1
+
+
+class RecordingSandbox:
+    def __init__(self) -> None:
+        self.page_counts: list[int] = []
+
+    def run(
+        self, script: str, html_paths: list[Path], deadline: Deadline | None = None
+    ) -> SandboxResult:
+        self.page_counts.append(len(html_paths))
+        return SandboxResult(rows=[{"product_name": "Widget"} for _ in html_paths])
+
+
+def test_stored_parser_sandbox_check_is_capped(tmp_path: Path) -> None:
+    sandbox = RecordingSandbox()
+    deps = _deps(tmp_path, sandbox=sandbox)
+    parser = FakeLLM().complete([Message(role="user", content="FieldSchema JSON")])
+    schema = FieldSchema(fields=[FieldSpec(name="product_name", type="string", required=True)])
+    fetched = [
+        FakeFetcher().fetch(f"https://example.com/{n}", LimitTracker(Limits()))
+        for n in range(SANDBOX_MAX_PAGES + 5)
+    ]
+    paths = deps.workspace.create("stored", save_artifacts=False)
+    check = Orchestrator(deps)._check_stored_parser(parser, schema, fetched, paths, Deadline())
+    assert check.ok
+    assert sandbox.page_counts == [SANDBOX_MAX_PAGES]
+
+
+class PlanLLM(FakeLLM):
+    def __init__(self) -> None:
+        self.plans = 0
+
+    def complete(
+        self,
+        messages: list[Message],
+        model: str = "test-model",
+        temperature: float = 0,
+        deadline: Deadline | None = None,
+    ) -> str:
+        if "plan_generator" not in messages[0].content:
+            return super().complete(messages, model, temperature, deadline)
+        self.plans += 1
+        selector = "h1" if self.plans > 1 else "h1 >"  # first attempt does not compile
+        return (
+            '{"version": 1, "row_selector": null, "fields": '
+            f'[{{"name": "product_name", "selector": "{selector}"}}]}}'
+        )
+
+
+class TitleFetcher(Fetcher):
+    def fetch(self, url: str, tracker: LimitTracker) -> FetchResult:
+        tracker.start_page()
+        tracker.finish_page()
+        html = "<html><h1>  Widget\n Pro </h1></html>"
+        return FetchResult(
+            url=url,
+            content_bytes=html.encode("utf-8"),
+            content_text=html,
+            status_code=200,
+            content_type="text/html",
+        )
+
+
+def test_orchestrator_plan_mode_writes_validated_plan(tmp_path: Path) -> None:
+    llm = PlanLLM()
+    plan_generator = PlanGenerator(llm, _renderer())
+    deps = _deps(tmp_path, llm, fetcher=TitleFetcher(), plan_generator=plan_generator)
+    spec = _spec(output_mode="plan")
+    outcome = Orchestrator(deps).run(spec)
+    assert not outcome.errors
+    assert llm.plans == 2
+    assert Path(outcome.parser_path).name == "plan.json"
+    plan = load_plan(Path(outcome.parser_path).read_text(encoding="utf-8"))
+    assert plan.fields[0].normalizer == "text"
+    report = json.loads(Path(outcome.report_path).read_text(encoding="utf-8"))
+    validations = [
+        event for event in read_events(Path(report["events_path"]))
+        if event["type"] == "validation"
+    ]
+    assert "invalid selector" in validations[0]["errors"][0]
+    assert validations[1]["errors"] == []
+    assert report["inputs"]["output_mode"] == "plan"
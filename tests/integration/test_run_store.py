@@ -0,0 +1,94 @@
+from pathlib import Path
+
+from scraparse.core.events import EventLog
+from scraparse.core.run_store import RunStore
+from scraparse.core.workspace import WorkspaceManager
+
+
+def _report(run_id: str, url: str, started_at: str, pages: dict[str, int]) -> dict[str, object]:
+    return {
+        "run_id": run_id,
+        "started_at": started_at,
+        "ended_at": started_at,
+        "inputs": {"url": url, "mode": "flags", "discover_strategy": "listing"},
+        "fetched_count": len(pages),
+        "bytes_total": sum(pages.values()),
+        "bytes_per_page": pages,
+        "truncated": None,
+        "timings": {
+            "total_s": 1.5,
+            "stages": [{"name": "fetch", "start_s": 0.0, "duration_s": 1.0}],
+            "llm_calls": [{"purpose": "script_generation", "attempt": 1, "duration_s": 0.4}],
+        },
+        "errors": [],
+        "parser_path": f"/tmp/{run_id}/parser.py",
+    }
+
+
+def test_run_store_indexes_reports_written_by_workspace(tmp_path: Path) -> None:
+    store = RunStore(tmp_path / "runs.sqlite")
+    workspace = WorkspaceManager(tmp_path / "generated", run_store=store)
+    shared = "https://example.com/list"
+    for idx, started in enumerate(["2026-01-01T00:00:00", "2026-02-01T00:00:00"], start=1):
+        paths = workspace.create(f"run-{idx}", save_artifacts=False)
+        pages = {shared: 100 * idx, f"https://example.com/item/{idx}": 300}
+        workspace.write_report(paths.report_path, _report(f"run-{idx}", shared, started, pages))
+    workspace.write_report(
+        workspace.create("run-3", save_artifacts=False).report_path,
+        _report("run-3", "https://other.org/", "2026-03-01T00:00:00", {"https://other.org/": 50}),
+    )
+
+    assert [row["run_id"] for row in store.runs_for_url(shared)] == ["run-2", "run-1"]
+    recent = store.recent_runs(domain="example.com", since="2026-01-15")
+    assert [row["run_id"] for row in recent] == ["run-2"]
+    assert recent[0]["ok"] == 1
+    stats = {row["domain"]: row for row in store.domain_stats()}
+    assert stats["example.com"]["pages"] == 4
+    assert stats["example.com"]["avg_bytes_per_page"] == 225.0
+    assert stats["other.org"]["runs"] == 1
+    assert store.path.with_name("runs.sqlite-wal").exists()
+    store.close()
+
+
+def test_run_store_import_backfills_and_replaces_existing_rows(tmp_path: Path) -> None:
+    workspace = WorkspaceManager(tmp_path / "generated")
+    paths = workspace.create("run-1", save_artifacts=False)
+    report = _report(
+        "run-1", "https://example.com/", "2026-01-01T00:00:00", {"https://example.com/": 10}
+    )
+    workspace.write_report(paths.report_path, report)
+    for run_id, content in [("not-a-dict", "[1, 2]"), ("no-run-id", '{"errors": []}')]:
+        workspace.create(run_id, save_artifacts=False).report_path.write_text(content)
+    with RunStore(tmp_path / "runs.sqlite") as store:
+        assert store.import_reports(tmp_path / "generated") == 1
+        assert store.import_reports(tmp_path / "generated") == 1
+        assert len(store.recent_runs()) == 1
+        assert len(store.runs_for_url("https://example.com/")) == 1
+
+
+def test_run_store_reads_pages_from_event_log(tmp_path: Path) -> None:
+    log = EventLog(tmp_path / "events.jsonl")
+    log.emit("page_fetched", url="https://example.com/a", bytes=40, artifact="blob:abc")
+    log.emit("fetch_retry", url="https://example.com/b", attempt=1, error="HTTP 503")
+    log.emit("page_fetched", url="https://example.com/b", bytes=60, artifact=None)
+    log.close()
+    report = _report("run-1", "https://example.com/a", "2026-01-01T00:00:00", {})
+    report["events_path"] = str(tmp_path / "events.jsonl")
+    with RunStore(tmp_path / "runs.sqlite") as store:
+        store.record_report(report)
+        assert [row["run_id"] for row in store.runs_for_url("https://example.com/b")] == ["run-1"]
+        assert store.domain_stats()[0]["total_bytes"] == 100
+
+
+def test_run_store_finds_event_log_of_moved_workspace(tmp_path: Path) -> None:
+    workspace = WorkspaceManager(tmp_path / "copied")
+    paths = workspace.create("run-1", save_artifacts=False)
+    log = EventLog(paths.events_path)
+    log.emit("page_fetched", url="https://example.com/a", bytes=40, artifact=None)
+    log.close()
+    report = _report("run-1", "https://example.com/a", "2026-01-01T00:00:00", {})
+    report["events_path"] = str(tmp_path / "original" / "run-1" / "events.jsonl")
+    workspace.write_report(paths.report_path, report)
+    with RunStore(tmp_path / "runs.sqlite") as store:
+        assert store.import_reports(tmp_path / "copied") == 1
+        assert store.domain_stats()[0]["total_bytes"] == 40
@@ -0,0 +1,107 @@
+import time
+from pathlib import Path
+
+from scraparse.core.models import FieldSchema, FieldSpec
+from scraparse.core.sandbox import SandboxLimits, SandboxPool
+
+GOOD = """
+import csv
+import sys
+from bs4 import BeautifulSoup
+
+
+def main():
+    writer = csv.DictWriter(sys.stdout, fieldnames=["title"])
+    writer.writeheader()
+    for path in sys.argv[1:]:
+        with open(path, encoding="utf-8") as handle:
+            soup = BeautifulSoup(handle.read(), "html.parser")
+        writer.writerow({"title": soup.select_one("h1").get_text(strip=True)})
+
+
+if __name__ == "__main__":
+    main()
+"""
+
+SPIN = """
+def main():
+    while True:
+        pass
+"""
+
+PID = """
+import os
+import sys
+
+
+def main():
+    print("title")
+    print("%d %s" % (os.getpid(), "scraparse_leak" in sys.modules))
+"""
+
+LEAKY = """
+import sys
+
+sys.modules["scraparse_leak"] = sys
+sys.stdout = None
+
+
+def main():
+    print("title")
+"""
+
+BROKEN = """
+raise RuntimeError("bad module")
+"""
+
+SCHEMA = FieldSchema(fields=[FieldSpec(name="title", type="string", required=True)])
+
+
+def _pages(tmp_path: Path) -> list[Path]:
+    paths = []
+    for idx, body in enumerate(["<h1>A</h1>", "<h1>B</h1>", "<p>no title</p>"]):
+        path = tmp_path / f"{idx}.html"
+        path.write_text(body, encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def test_sandbox_reports_rows_and_per_page_errors(tmp_path: Path) -> None:
+    with SandboxPool(workers=1) as pool:
+        pages = _pages(tmp_path)
+        result = pool.run(GOOD, pages[:2])
+        assert [row["title"] for row in result.rows] == ["A", "B"]
+        assert result.check(SCHEMA).ok
+        assert result.problems(SCHEMA, slow_page_s=2.0) == []
+
+        started = time.perf_counter()
+        broken = pool.run(GOOD, pages)
+        assert time.perf_counter() - started < 2.0  # warm worker, no process start
+        assert broken.pages[2].error is not None
+        assert broken.problems(SCHEMA, slow_page_s=2.0)[0].startswith("Parser raised on sample 3")
+
+
+def test_sandbox_enforces_limits_and_replaces_worker(tmp_path: Path) -> None:
+    limits = SandboxLimits(cpu_s=1, wall_s=5.0)
+    with SandboxPool(workers=1, limits=limits) as pool:
+        pages = _pages(tmp_path)
+        result = pool.run(SPIN, pages[:1])
+        assert result.error is not None
+        assert "limit" in result.error
+        assert pool.run(GOOD, pages[:1]).rows == [{"title": "A"}]
+
+
+def test_sandbox_isolates_candidates_sharing_a_worker(tmp_path: Path) -> None:
+    with SandboxPool(workers=1) as pool:
+        pages = _pages(tmp_path)[:1]
+
+        def probe() -> tuple[str, str]:
+            pid, leaked = pool.run(PID, pages).rows[0]["title"].split()
+            return pid, leaked
+
+        first_pid, _ = probe()
+        assert pool.run(LEAKY, pages).error is None
+        assert probe() == (first_pid, "False")  # same warm worker, state restored
+
+        assert pool.run(BROKEN, pages).error is not None
+        assert probe()[0] != first_pid  # the failed candidate's worker was retired
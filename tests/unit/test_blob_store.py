@@ -0,0 +1,23 @@
+from pathlib import Path
+
+from scraparse.core.blob_store import BlobStore
+
+
+def test_blob_store_deduplicates_identical_bodies(tmp_path: Path) -> None:
+    store = BlobStore(tmp_path, codec="gzip")
+    body = b"<html>" + b"<p>row</p>" * 1000 + b"</html>"
+    first = store.put(body)
+    second = store.put(body)
+    assert first.digest == second.digest
+    assert first.stored_size < first.size
+    assert len(list(tmp_path.rglob("*.gz"))) == 1
+
+
+def test_blob_store_streams_decompressed_chunks(tmp_path: Path) -> None:
+    store = BlobStore(tmp_path, codec="gzip")
+    body = bytes(range(256)) * 1024
+    ref = store.put(body)
+    chunks = list(store.iter_chunks(ref.digest, chunk_size=4096))
+    assert len(chunks) > 1
+    assert b"".join(chunks) == body
+    assert store.read_bytes(ref.digest) == body
@@ -0,0 +1,72 @@
+from datetime import date
+from pathlib import Path
+
+from scraparse.core.columnar import (
+    ColumnNormalizer,
+    JsonColumnWriter,
+    infer_date_format,
+    read_json_columns,
+)
+from scraparse.core.models import FieldSchema, FieldSpec
+
+SCHEMA = FieldSchema(
+    fields=[
+        FieldSpec(name="price", type="money", required=True),
+        FieldSpec(name="published", type="date", required=False),
+        FieldSpec(name="link", type="url", required=False),
+        FieldSpec(name="in_stock", type="boolean", required=False),
+        FieldSpec(name="rating", type="number", required=False),
+    ]
+)
+
+
+def test_column_normalizer_converts_types_and_counts_invalid_values() -> None:
+    rows = [
+        {
+            "_source": "https://shop.example/list",
+            "price": "€1.299,50",
+            "published": "05/03/2024",
+            "link": "/p/1",
+            "in_stock": "In stock",
+            "rating": "4.5 / 5",
+        },
+        {
+            "_source": "https://shop.example/list",
+            "price": "USD 12",
+            "published": "25/03/2024",
+            "link": "javascript:void(0)",
+            "in_stock": "Sold out",
+            "rating": "n/a",
+        },
+        {"_source": "", "price": "", "published": "", "link": "", "in_stock": "", "rating": ""},
+    ]
+    normalizer = ColumnNormalizer(SCHEMA, source_key="_source")
+    typed = normalizer.normalize(rows)
+    assert typed.columns["price"] == [1299.5, 12.0, None]
+    assert typed.columns["price_currency"] == ["EUR", "USD", None]
+    # 25/03 only parses day-first, so the whole column is read that way.
+    assert typed.columns["published"] == [date(2024, 3, 5), date(2024, 3, 25), None]
+    assert normalizer.date_formats == {"published": "%d/%m/%Y"}
+    assert typed.columns["link"] == ["https://shop.example/p/1", None, None]
+    assert typed.columns["in_stock"] == [True, False, None]
+    assert typed.columns["rating"] == [4.5, None, None]
+    assert typed.invalid == {"link": 1, "rating": 1}
+
+
+def test_infer_date_format_prefers_the_format_fitting_most_values() -> None:
+    assert infer_date_format(["03/04/2024", "12/31/2024"]) == "%m/%d/%Y"
+    assert infer_date_format(["2024-03-04T10:00:00+02:00"]) == "%Y-%m-%dT%H:%M:%S"
+    assert infer_date_format(["soon"]) is None
+
+
+def test_json_columns_round_trip(tmp_path: Path) -> None:
+    normalizer = ColumnNormalizer(SCHEMA)
+    path = tmp_path / "rows.columns.jsonl"
+    writer = JsonColumnWriter(path, normalizer.types)
+    writer.write(normalizer.normalize([{"price": "$5", "published": "2024-01-02"}]))
+    writer.write(normalizer.normalize([{"price": "$7.25"}]))
+    writer.close()
+    types, columns = read_json_columns(path)
+    assert types["price"] == "float64" and types["published"] == "date"
+    assert columns["price"] == [5.0, 7.25]
+    assert columns["published"] == ["2024-01-02", None]
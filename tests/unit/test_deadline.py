@@ -0,0 +1,28 @@
+import time
+
+import pytest
+
+from scraparse.core.deadline import Deadline
+from scraparse.core.errors import CancelledError, LimitExceededError
+
+
+def test_timeout_shrinks_to_remaining_budget() -> None:
+    deadline = Deadline(0.5)
+    assert deadline.timeout(30) <= 0.5
+    assert Deadline().timeout(30) == 30
+
+
+def test_expired_deadline_raises_limit_error() -> None:
+    deadline = Deadline(0.0)
+    with pytest.raises(LimitExceededError):
+        deadline.check()
+
+
+def test_parent_cancel_interrupts_child_sleep() -> None:
+    parent = Deadline()
+    child = Deadline(60, parent=parent)
+    parent.cancel("stop")
+    started = time.monotonic()
+    with pytest.raises(CancelledError):
+        child.sleep(5)
+    assert time.monotonic() - started < 1
@@ -0,0 +1,85 @@
+from scraparse.core.extraction_plan import ExtractionPlan, FieldRule, load_plan, validate_plan
+from scraparse.core.models import FieldSchema, FieldSpec
+from scraparse.core.normalizers import normalize_boolean, normalize_date, normalize_number
+from scraparse.core.plan_engine import CompiledPlan
+
+SCHEMA = FieldSchema(
+    fields=[
+        FieldSpec(name="name", type="string", required=True),
+        FieldSpec(name="price", type="money", required=False),
+        FieldSpec(name="link", type="url", required=False),
+    ]
+)
+
+PAGE = """
+<ul>
+  <li class="item"><a href="/p/1">First
+     item</a><span class="price">$1,299.00</span><i class="tag">a</i><i class="tag">b</i></li>
+  <li class="item"><a href="/p/2">Second</a><span class="price">1.299,50 EUR</span></li>
+  <li class="item"></li>
+</ul>
+"""
+
+
+def test_validate_plan_reports_every_mismatch() -> None:
+    plan = ExtractionPlan(
+        row_selector="li.item",
+        fields=[
+            FieldRule(name="name", selector="a >"),
+            FieldRule(name="price", selector=".price", normalizer="date"),
+            FieldRule(name="extra", selector="b"),
+        ],
+    )
+    errors = validate_plan(plan, SCHEMA)
+    assert any("invalid selector 'a >'" in error for error in errors)
+    assert any("normalizer 'date' does not fit" in error for error in errors)
+    assert "Field 'extra' is not in the schema" in errors
+    assert "Schema field 'link' has no rule in the plan" in errors
+
+
+def test_load_plan_accepts_code_fence_and_rejects_non_json() -> None:
+    plan = load_plan('```json\n{"row_selector": "li", "fields": []}\n```')
+    assert plan.row_selector == "li"
+    try:
+        load_plan("row_selector: li")
+    except ValueError as exc:
+        assert "not valid JSON" in str(exc)
+    else:
+        raise AssertionError("expected ValueError")
+
+
+def test_compiled_plan_extracts_rows_with_normalizers() -> None:
+    plan = ExtractionPlan(
+        row_selector="li.item",
+        fields=[
+            FieldRule(name="name", selector="a", normalizer="text"),
+            FieldRule(name="price", selector=".price", normalizer="money"),
+            FieldRule(name="link", selector="a", attribute="href", normalizer="url"),
+            FieldRule(name="tags", selector="i.tag", multiple=True),
+        ],
+    )
+    rows = CompiledPlan(plan, features="html.parser").extract(
+        PAGE, base_url="https://shop.example/list"
+    )
+    assert rows == [
+        {
+            "name": "First item",
+            "price": "1299.00",
+            "link": "https://shop.example/p/1",
+            "tags": "a; b",
+        },
+        {"name": "Second", "price": "1299.50", "link": "https://shop.example/p/2", "tags": ""},
+    ]
+
+
+def test_normalizers() -> None:
+    assert normalize_number("1 234,5 kg") == "1234.5"
+    assert normalize_number("n/a") == ""
+    assert normalize_date("March 5, 2024") == "2024-03-05"
+    assert normalize_date("2024-03-05T10:00:00Z") == "2024-03-05"
+    assert normalize_boolean("Sold out") == "false"
+    for negative in ("Out of stock!", "Not available", "Currently unavailable"):
+        assert normalize_boolean(negative) == "false", negative
+    assert normalize_boolean("In stock - ships today") == "true"
+    assert normalize_boolean("Yes.") == "true"
+    assert normalize_boolean("Call for price") == ""
@@ -0,0 +1,52 @@
+from pathlib import Path
+
+from scraparse.core.fingerprint import PageFingerprint, dom_shape, fingerprint, url_template
+from scraparse.core.parser_registry import ParserRegistry
+
+
+def _product_page(name: str, extra: str = "") -> str:
+    return (
+        "<html><body><div class='nav'><a href='/'>Home</a></div>"
+        f"<main class='product'><h1 class='title'>{name}</h1>"
+        "<span class='price'>9.99</span><ul class='specs'><li>a</li><li>b</li></ul>"
+        f"{extra}</main></body></html>"
+    )
+
+
+def test_url_template_collapses_ids() -> None:
+    assert url_template("https://shop.test/product/123?b=2&a=1") == "/product/{n}?a=&b="
+    assert url_template("https://shop.test/p/blue-shirt-42") == "/p/{slug}"
+    assert url_template("https://shop.test/item/9f86d081884c7d65") == "/item/{id}"
+
+
+def test_dom_shape_is_close_for_pages_of_one_template() -> None:
+    first = dom_shape(_product_page("Widget"))
+    second = dom_shape(_product_page("Gadget", "<p class='note'>Sale</p>"))
+    other = dom_shape("<html><body><table><tr><td>x</td></tr></table></body></html>")
+    assert bin(first ^ second).count("1") < bin(first ^ other).count("1")
+    assert dom_shape(_product_page("Widget")) == dom_shape(_product_page("Other name"))
+
+
+def test_registry_finds_parser_for_same_template_among_many(tmp_path: Path) -> None:
+    registry = ParserRegistry(tmp_path / "registry.sqlite")
+    for idx in range(300):
+        registry.register(
+            PageFingerprint(f"site{idx}.test", "/product/{n}", idx * 0x9E3779B97F4A7C15 % 2**64),
+            "prompt",
+            {"fields": []},
+            f"# parser {idx}",
+            0.9,
+            f"run-{idx}",
+        )
+    page = fingerprint("https://shop.test/product/1", _product_page("Widget"))
+    registry.register(page, "prompt", {"fields": []}, "# shop parser", 1.0, "run-shop")
+
+    other_url = fingerprint("https://shop.test/product/2", _product_page("Gadget"))
+    found = registry.candidates(other_url, "prompt")
+    assert [entry.parser for entry in found] == ["# shop parser"]
+    assert registry.candidates(other_url, "another prompt") == []
+
+    # Different URL layout, same DOM shape: found through the LSH bands.
+    moved = PageFingerprint("shop.test", "/p/{slug}", page.shape ^ 0b101)
+    assert [entry.run_id for entry in registry.candidates(moved, "prompt")] == ["run-shop"]
+    registry.close()
@@ -1,3 +1,5 @@
+from contextvars import Context, copy_context
+
 import pytest
 
 from scraparse.core.errors import LimitExceededError
@@ -27,3 +29,66 @@ def test_max_pages_exceeded() -> None:
     tracker.finish_page()
     with pytest.raises(LimitExceededError):
         tracker.start_page()
+
+
+def test_max_pages_counts_pages_in_flight() -> None:
+    tracker = LimitTracker(Limits(max_pages=2))
+    first = tracker.start_page("https://example.com/a")
+    tracker.start_page("https://example.com/b")
+    with pytest.raises(LimitExceededError):
+        tracker.start_page("https://example.com/c")
+    tracker.record_failure(first)
+    tracker.start_page("https://example.com/c")
+
+
+def test_per_host_page_and_byte_budgets() -> None:
+    tracker = LimitTracker(Limits(max_pages_per_host=1, max_bytes_per_host=10))
+    page = tracker.start_page("https://a.example/1")
+    tracker.add_bytes(5, page)
+    tracker.finish_page(page)
+    with pytest.raises(LimitExceededError) as exc_info:
+        tracker.start_page("https://a.example/2")
+    assert exc_info.value.limit_name == "max_pages_per_host"
+    other = tracker.start_page("https://b.example/1")
+    with pytest.raises(LimitExceededError) as exc_info:
+        tracker.add_bytes(11, other)
+    assert exc_info.value.limit_name == "max_bytes_per_host"
+
+
+def test_concurrent_accounting_is_exact() -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    tracker = LimitTracker(Limits(max_pages=400, max_total_bytes=10_000_000))
+
+    def fetch_one(index: int) -> None:
+        page = tracker.start_page(f"https://example.com/{index}")
+        for _ in range(10):
+            tracker.add_bytes(7, page)
+        tracker.finish_page(page)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(fetch_one, range(400)))
+    assert tracker.pages_fetched == 400
+    assert tracker.pages_in_flight == 0
+    assert tracker.total_bytes == 400 * 70
+
+
+def test_implicit_page_is_scoped_to_the_context() -> None:
+    tracker = LimitTracker(Limits())
+    with pytest.raises(RuntimeError):
+        Context().run(tracker.add_bytes, 1)
+
+    def fetch_detail() -> int:
+        tracker.start_page()
+        tracker.add_bytes(4)
+        tracker.finish_page()
+        return tracker.current_page_bytes
+
+    def fetch_listing() -> tuple[int, int]:
+        tracker.start_page()
+        tracker.add_bytes(1)
+        detail = copy_context().run(fetch_detail)
+        return detail, tracker.current_page_bytes
+
+    assert Context().run(fetch_listing) == (4, 1)
+    assert tracker.pages_in_flight == 1
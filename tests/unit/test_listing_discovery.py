@@ -1,3 +1,6 @@
+import pytest
+
+from scraparse.core.errors import LimitExceededError
 from scraparse.core.limits import LimitTracker, Limits
 from scraparse.core.models import FetchResult
 from scraparse.plugins.discovery.listing import ListingDiscovery
@@ -47,3 +50,50 @@ def test_listing_discovery_fetches_detail_links() -> None:
     assert fetcher.calls[0].endswith("/list")
     assert fetcher.calls[1].endswith("/list/product/1")
     assert fetcher.calls[2].endswith("/list/product/2")
+
+
+def test_listing_discovery_fetches_details_concurrently_in_order() -> None:
+    limits = Limits(max_pages=3, max_concurrent_fetches=4)
+    tracker = LimitTracker(limits)
+    fetcher = FakeFetcher()
+    results = ListingDiscovery().discover(
+        start_url="https://example.com/list",
+        fetcher=fetcher,
+        tracker=tracker,
+        limits=limits,
+    )
+    assert [result.url for result in results] == [
+        "https://example.com/list",
+        "https://example.com/list/product/1",
+        "https://example.com/list/product/2",
+    ]
+    assert tracker.pages_fetched == 3
+
+
+def test_listing_discovery_returns_partial_results_when_budget_runs_out() -> None:
+    limits = Limits(max_pages=2, max_concurrent_fetches=4)
+    tracker = LimitTracker(limits)
+    results = ListingDiscovery().discover(
+        start_url="https://example.com/list",
+        fetcher=FakeFetcher(),
+        tracker=tracker,
+        limits=limits,
+    )
+    assert [result.url for result in results] == [
+        "https://example.com/list",
+        "https://example.com/list/product/1",
+    ]
+    assert tracker.truncation is not None
+    assert tracker.truncation.limit_name == "max_pages"
+
+
+def test_listing_discovery_raises_when_budget_stop_disabled() -> None:
+    limits = Limits(max_pages=2, budget_stop=False)
+    tracker = LimitTracker(limits)
+    with pytest.raises(LimitExceededError):
+        ListingDiscovery().discover(
+            start_url="https://example.com/list",
+            fetcher=FakeFetcher(),
+            tracker=tracker,
+            limits=limits,
+        )
@@ -0,0 +1,35 @@
+from scraparse.core.models import FetchResult
+from scraparse.core.page_store import PageStore
+from scraparse.plugins.ai.token_budget import PromptPacker, TokenEstimator
+
+
+def _result(url: str, text: str) -> FetchResult:
+    return FetchResult(
+        url=url,
+        content_bytes=text.encode("utf-8"),
+        content_text=text,
+        status_code=200,
+        content_type="text/html",
+    )
+
+
+def test_page_store_spills_past_ram_threshold() -> None:
+    with PageStore(ram_limit_bytes=100) as store:
+        pages = [store.add(_result(f"https://example.com/{idx}", "é" * 40)) for idx in range(5)]
+        stats = store.stats()
+        assert stats["ram_bytes"] == 80
+        assert stats["spilled_pages"] == 4
+        assert all(page.content_text == "é" * 40 for page in pages)
+        assert pages[3].size == 80
+        assert pages[3].read_text(5) == "é" * 5
+
+
+def test_packer_reads_only_the_allocated_prefix_of_stored_pages() -> None:
+    with PageStore(ram_limit_bytes=0) as store:
+        pages = [store.add(_result(f"https://example.com/{idx}", "x" * 40_000)) for idx in range(3)]
+        estimator = TokenEstimator()
+        packer = PromptPacker(estimator, max_prompt_tokens=9_000, reserve_output_tokens=1_000)
+        packed = packer.pack_sources(500, pages)
+        assert [budget.status for budget in packed.sample_budgets] == ["truncated"] * 3
+        assert all(0 < len(sample) < 40_000 for sample in packed.samples)
+        assert packed.prompt_tokens <= packer.budget_tokens()
@@ -0,0 +1,51 @@
+from pathlib import Path
+
+from scraparse.core.models import FetchResult, FieldSchema, FieldSpec
+from scraparse.core.parser_runner import check_parser
+
+PARSER = """
+import csv
+import sys
+from bs4 import BeautifulSoup
+
+
+def main():
+    writer = csv.DictWriter(sys.stdout, fieldnames=["title", "price"])
+    writer.writeheader()
+    for path in sys.argv[1:]:
+        with open(path, encoding="utf-8") as handle:
+            soup = BeautifulSoup(handle.read(), "html.parser")
+        title = soup.select_one("h1")
+        writer.writerow({"title": title.get_text(strip=True) if title else "", "price": ""})
+
+
+if __name__ == "__main__":
+    main()
+"""
+
+
+def _page(html: str) -> FetchResult:
+    return FetchResult(
+        url="https://example.com",
+        content_bytes=html.encode("utf-8"),
+        content_text=html,
+        status_code=200,
+        content_type="text/html",
+    )
+
+
+def test_check_parser_reports_fill_rate_of_required_fields(tmp_path: Path) -> None:
+    script = tmp_path / "parser.py"
+    script.write_text(PARSER, encoding="utf-8")
+    schema = FieldSchema(
+        fields=[
+            FieldSpec(name="title", type="string", required=True),
+            FieldSpec(name="price", type="money", required=False),
+        ]
+    )
+    pages = [_page("<h1>A</h1>"), _page("<h1>B</h1>")]
+    assert check_parser(script, pages, schema).ok
+
+    stale = check_parser(script, pages + [_page("<h2>moved</h2>")] * 2, schema)
+    assert not stale.ok
+    assert stale.fill_rates["title"] == 0.5
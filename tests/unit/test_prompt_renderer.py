@@ -0,0 +1,24 @@
+from pathlib import Path
+
+from scraparse.core.paths import templates_dir
+from scraparse.plugins.ai.prompt_renderer import PromptPack, PromptRenderer
+
+
+def test_renderers_share_environment_and_static_prompts(tmp_path: Path) -> None:
+    first = PromptRenderer(templates_dir(), PromptPack("default"), bytecode_cache_dir=tmp_path)
+    second = PromptRenderer(templates_dir(), PromptPack("default"), bytecode_cache_dir=tmp_path)
+    assert first.env is second.env
+    prompt = first.render_static("schema_generator_system_prompt.jinja")
+    assert second.render_static("schema_generator_system_prompt.jinja") is prompt
+
+
+def test_script_prompt_lists_validation_feedback() -> None:
+    renderer = PromptRenderer(templates_dir(), PromptPack("default"))
+    context = {"schema_json": "{}", "html_samples": ["<html></html>"]}
+    first = renderer.render("script_generator_user_prompt.jinja", {**context})
+    retry = renderer.render(
+        "script_generator_user_prompt.jinja",
+        {**context, "validation_errors": ["Forbidden import: os"]},
+    )
+    assert "rejected" not in first
+    assert retry.endswith("- Forbidden import: os\n")
@@ -1,4 +1,4 @@
-from scraparse.core.script_validation import validate_script
+from scraparse.core.script_validation import check_script, validate_script
 
 
 def test_valid_script_passes() -> None:
@@ -32,3 +32,76 @@ def main():
 """
     errors = validate_script(script)
     assert any("Forbidden call" in err for err in errors)
+
+
+def test_reparsing_and_document_scans_per_element_are_errors() -> None:
+    script = """
+import sys
+from bs4 import BeautifulSoup
+
+def main():
+    for path in sys.argv[1:]:
+        soup = BeautifulSoup(open(path).read(), "html.parser")
+        for card in soup.select(".card"):
+            inner = BeautifulSoup(str(card), "html.parser")
+            prices = soup.find_all("span", class_="price")
+"""
+    errors = validate_script(script)
+    assert any("BeautifulSoup() is called inside a loop" in err for err in errors)
+    assert any("soup.find_all() searches the whole document" in err for err in errors)
+    assert validate_script(script, performance=False) == []
+
+
+def test_per_file_parsing_and_element_searches_pass() -> None:
+    script = """
+import re
+import sys
+from bs4 import BeautifulSoup
+
+PRICE = re.compile(r"[0-9.]+")
+
+def main():
+    for path in sys.argv[1:]:
+        soup = BeautifulSoup(open(path).read(), "html.parser")
+        rows = [card.select_one(".title") for card in soup.select(".card")]
+        for card in soup.find_all("div"):
+            match = PRICE.search(card.get_text())
+"""
+    report = check_script(script)
+    assert report.errors == []
+    assert report.warnings == []
+
+
+def test_regex_and_string_building_in_loops_are_warnings() -> None:
+    script = """
+import re
+
+def main():
+    text = ""
+    with open("x") as handle:
+        for line in handle:
+            text += line
+            pattern = re.compile(r"a+")
+"""
+    report = check_script(script)
+    assert report.errors == []
+    assert any("string 'text'" in warning for warning in report.warnings)
+    assert any("re.compile() inside a loop" in warning for warning in report.warnings)
+    assert any("file read line by line (line 7)" in warning for warning in report.warnings)
+
+
+def test_iterating_file_handles_is_a_warning() -> None:
+    script = """
+import sys
+
+def main():
+    handle = open(sys.argv[1])
+    lines = [line for line in open(sys.argv[2])]
+    for line in handle:
+        pass
+"""
+    warnings = check_script(script).warnings
+    assert [warning.split(";")[0] for warning in warnings] == [
+        "Performance: file read line by line (line 6)",
+        "Performance: file read line by line (line 7)",
+    ]
@@ -0,0 +1,63 @@
+import pytest
+
+from scraparse.core.errors import LimitExceededError
+from scraparse.plugins.ai.token_budget import PromptPacker, TokenEstimator
+
+
+def test_estimator_picks_model_family() -> None:
+    assert TokenEstimator.for_model("gpt-4o-mini").family.name == "gpt-4o"
+    assert TokenEstimator.for_model("gpt-4-0613").family.name == "gpt-4"
+    assert TokenEstimator.for_model("unknown-model").family.name == "generic"
+
+
+def test_packer_keeps_samples_that_fit() -> None:
+    packer = PromptPacker(TokenEstimator(), max_prompt_tokens=10_000, reserve_output_tokens=1_000)
+    packed = packer.pack(100, ["a" * 350, "b" * 700])
+    assert packed.samples == ["a" * 350, "b" * 700]
+    assert [budget.status for budget in packed.sample_budgets] == ["kept", "kept"]
+    assert packed.prompt_tokens <= packer.budget_tokens()
+
+
+def test_packer_truncates_largest_sample_first() -> None:
+    estimator = TokenEstimator()
+    packer = PromptPacker(
+        estimator, max_prompt_tokens=2_000, reserve_output_tokens=500, min_sample_tokens=100
+    )
+    packed = packer.pack(100, ["a" * 700, "b" * 35_000])
+    statuses = [budget.status for budget in packed.sample_budgets]
+    assert statuses == ["kept", "truncated"]
+    assert packed.samples[0] == "a" * 700
+    assert packed.prompt_tokens <= packer.budget_tokens()
+
+
+def test_packer_drops_trailing_samples_deterministically() -> None:
+    packer = PromptPacker(
+        TokenEstimator(), max_prompt_tokens=1_500, reserve_output_tokens=500, min_sample_tokens=300
+    )
+    samples = ["x" * 10_000 for _ in range(5)]
+    first = packer.pack(0, samples)
+    second = packer.pack(0, samples)
+    assert [b.status for b in first.sample_budgets] == ["truncated"] * 3 + ["dropped"] * 2
+    assert first.samples == second.samples
+
+
+def test_packer_fails_when_overhead_exceeds_budget() -> None:
+    packer = PromptPacker(TokenEstimator(), max_prompt_tokens=1_000, reserve_output_tokens=500)
+    with pytest.raises(LimitExceededError):
+        packer.pack(600, ["<html></html>"])
+
+
+def test_packer_keeps_many_small_samples_that_fit() -> None:
+    packer = PromptPacker(TokenEstimator(), max_prompt_tokens=12_000, reserve_output_tokens=1_000)
+    packed = packer.pack(0, ["<p>tiny</p>" * 3 for _ in range(100)])
+    assert [budget.status for budget in packed.sample_budgets] == ["kept"] * 100
+    assert packed.prompt_tokens <= packer.budget_tokens()
+
+
+def test_packer_drops_only_large_samples_that_cannot_get_a_share() -> None:
+    packer = PromptPacker(
+        TokenEstimator(), max_prompt_tokens=1_500, reserve_output_tokens=500, min_sample_tokens=300
+    )
+    samples = ["w" * 10_000, "small", "x" * 10_000, "y" * 10_000, "z" * 10_000, "small"]
+    statuses = [budget.status for budget in packer.pack(0, samples).sample_budgets]
+    assert statuses == ["truncated", "kept", "truncated", "truncated", "dropped", "kept"]
@@ -0,0 +1,38 @@
+import threading
+
+from scraparse.core.tracing import Tracer, activate, span
+
+
+def test_spans_nest_and_export_chrome_events() -> None:
+    tracer = Tracer()
+    with activate(tracer):
+        with span("outer", url="https://example.com"):
+            with span("inner", attempt=1) as attrs:
+                attrs["status"] = 200
+    trace = tracer.to_chrome_trace()
+    events = {event["name"]: event for event in trace["traceEvents"] if event["ph"] == "X"}
+    assert events["inner"]["args"]["parent_id"] == events["outer"]["args"]["span_id"]
+    assert events["inner"]["args"]["status"] == 200
+    assert events["outer"]["dur"] >= events["inner"]["dur"]
+
+
+def test_spans_from_threads_get_their_own_track() -> None:
+    tracer = Tracer()
+
+    def work() -> None:
+        with activate(tracer), span("worker"):
+            pass
+
+    # One after the other, so the second thread may reuse the first one's OS ident.
+    for idx in range(2):
+        thread = threading.Thread(target=work, name=f"worker-{idx}")
+        thread.start()
+        thread.join()
+    events = tracer.to_chrome_trace()["traceEvents"]
+    names = [event["args"]["name"] for event in events if event["ph"] == "M"]
+    assert sorted(names) == ["worker-0", "worker-1"]
+
+
+def test_span_without_tracer_is_noop() -> None:
+    with span("ignored", url="x") as attrs:
+        attrs["bytes"] = 1